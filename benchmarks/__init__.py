@@ -0,0 +1,10 @@
+"""
+Benchmarks de DynamoFlow.
+
+- generator: generador reproducible de registros sintéticos order_event y product_update.
+- run: suite de rendimiento (registros/s, latencia p50/p99 por registro y memoria máxima) con líneas base en JSON.
+
+Uso:
+    python -m benchmarks.run --records 1000000 --save baseline.json
+    python -m benchmarks.run --records 1000000 --compare baseline.json --threshold 0.10
+"""
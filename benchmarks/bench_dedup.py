@@ -0,0 +1,105 @@
+"""
+Detección de registros repetidos por order_id y product_sku: validar todos los registros y descartar los repetidos
+después con un set (como se hacía aguas abajo) comparado con enable_deduplication en modo exacto (conjunto LRU) y
+aproximado (filtros de huellas), que descartan los repetidos antes de aplicar las operaciones.
+
+Informa registros por segundo, memoria máxima asignada (tracemalloc) y repetidos detectados; en el modo aproximado
+también los registros nuevos marcados como repetidos por error (falsos positivos).
+
+Uso:
+    python benchmarks/bench_dedup.py --records 500000 --duplicate-rate 0.3 --error-rate 0.001
+"""
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager
+
+KEYS = {"order_event": "order_id", "product_update": "product_sku"}
+
+
+def with_duplicates(count: int, duplicate_rate: float, seed: int) -> list[dict[str, any]]:
+    """Registros donde una proporción duplicate_rate repite un registro reciente (como un reintento)."""
+    rng = random.Random(seed)
+    records = list()
+    for record in generate_records(count, seed=seed, invalid_rate=0.1):
+        if records and rng.random() < duplicate_rate:
+            record = dict(records[-rng.randint(1, min(len(records), 10_000))])
+        records.append(record)
+    return records
+
+
+def downstream(record_manager: RecordContextManager, records) -> int:
+    """Referencia: valida todos los registros y descarta después los repetidos con un set."""
+    seen = set()
+    unique = 0
+    for record, logs in record_manager.process_stream(records):
+        key = (record.get('__type__'), record.get(KEYS.get(record.get('__type__'), '')))
+        if key[1] is None or key not in seen:
+            seen.add(key)
+            unique += 1
+    return unique
+
+
+def deduplicated(record_manager: RecordContextManager, records) -> int:
+    return sum(1 for _ in record_manager.process_stream(records))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=500_000)
+    parser.add_argument('--duplicate-rate', type=float, default=0.3)
+    parser.add_argument('--maxsize', type=int, default=1_000_000, help="Claves recordadas (por filtro en el modo approximate).")
+    parser.add_argument('--error-rate', type=float, default=0.001)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    source = with_duplicates(args.records, args.duplicate_rate, args.seed)
+    cases = {
+        "validar todo y descartar después (set)": (None, downstream),
+        "enable_deduplication exacto (conjunto LRU)": ('exact', deduplicated),
+        "enable_deduplication aproximado (filtro de huellas)": ('approximate', deduplicated),
+    }
+    unique = dict()
+    for name, (mode, case) in cases.items():
+        record_manager = RecordContextManager()
+        if mode is not None:
+            record_manager.enable_deduplication(KEYS, mode=mode, maxsize=args.maxsize, error_rate=args.error_rate, action='drop')
+        # process_stream modifica los registros: cada caso procesa su propia copia
+        records = copy.deepcopy(source)
+        start = time.perf_counter()
+        unique[name] = case(record_manager, records)
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {args.records / elapsed:,.0f} registros/s ({elapsed:.2f} s), {args.records - unique[name]:,} repetidos")
+        if mode is not None:
+            info = record_manager.deduplication_info()
+            print(f"  tasa de repetidos {info['duplicate_rate']:.1%}, claves recordadas {info['size']:,}"
+                  + (f", filtros {info['bytes'] / 2 ** 20:,.1f} MiB" if info['bytes'] else ""))
+
+    # La memoria se mide aparte: tracemalloc hace más lento el código que crea objetos
+    for name, (mode, case) in cases.items():
+        record_manager = RecordContextManager()
+        if mode is not None:
+            record_manager.enable_deduplication(KEYS, mode=mode, maxsize=args.maxsize, error_rate=args.error_rate, action='drop')
+        records = copy.deepcopy(source)
+        tracemalloc.start()
+        case(record_manager, records)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name}: memoria máxima {peak / 2 ** 20:,.1f} MiB")
+
+    exact, approximate = list(unique.values())[1:]
+    if list(unique.values())[0] != exact:
+        raise SystemExit("El modo exacto no detecta los mismos repetidos que el set")
+    print(f"falsos positivos del modo aproximado: {exact - approximate:,} ({(exact - approximate) / exact:.3%} de los registros nuevos)")
+
+
+if __name__ == '__main__':
+    main()
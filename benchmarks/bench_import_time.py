@@ -0,0 +1,168 @@
+"""
+Costo de inicio en frío (importaciones) de dynamo_flow y su crecimiento con la cantidad de plugins.
+
+Cada caso se ejecuta en un proceso nuevo con python -X importtime y se reporta la mediana de --repeat ejecuciones:
+el tiempo total del caso (medido dentro del proceso) y el tiempo de las importaciones que hizo el caso (sumado de la
+salida de -X importtime, incluidas las de la biblioteca estándar). -X importtime no registra los módulos importados
+con importlib.import_module (como hacen los __init__ perezosos y el registro), solo sus dependencias, por lo que el
+tiempo total es la medida de referencia.
+
+Los plugins son operaciones sintéticas generadas en un directorio temporal, cada una en su propio módulo, y se
+declaran de tres formas:
+    - eager: se importan todos los módulos y se registran las clases (como al importarlos desde un __init__).
+    - registry: se registran por nombre en registry.operations con referencias 'modulo:atributo', sin importarlos.
+    - entry_points: se declaran como entry points de un paquete instalado (un .dist-info en sys.path).
+En los tres casos se usa una sola operación, por lo que solo se importa un plugin en los casos perezosos.
+
+Uso:
+    python benchmarks/bench_import_time.py --plugins 0,10,100,500 --repeat 5
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Código de cada caso. Se mide desde el inicio del script, después del arranque del intérprete.
+COLD_START_CASES = {
+    "import dynamo_flow": "import dynamo_flow",
+    "from dynamo_flow import RecordContextManager": "from dynamo_flow import RecordContextManager",
+    # Las operaciones por defecto no buscan los entry points
+    "primer registro (operaciones por defecto)": (
+        "from dynamo_flow import RecordContextManager\n"
+        "list(RecordContextManager().process_stream([{'__type__': 'order_event', 'order_id': 'ORD1', 'amount': '1,5'}]))"
+    ),
+    # Con los tipos de registro de los entry points (importa importlib.metadata y recorre los paquetes instalados)
+    "primer registro (operaciones por defecto, con entry points)": (
+        "from dynamo_flow import RecordContextManager, registry\n"
+        "registry.record_types.load_entry_points()\n"
+        "list(RecordContextManager().process_stream([{'__type__': 'order_event', 'order_id': 'ORD1', 'amount': '1,5'}]))"
+    ),
+}
+
+PLUGIN_CASES = {
+    "eager": (
+        "from dynamo_flow import registry\n"
+        "import importlib\n"
+        "for index in range({plugins}):\n"
+        "    module = importlib.import_module(f'bench_plugins.plugin_{{index}}')\n"
+        "    registry.operations.register(f'Plugin{{index}}', module.PluginOperation)\n"
+        "{use}"
+    ),
+    "registry": (
+        "from dynamo_flow import registry\n"
+        "for index in range({plugins}):\n"
+        "    registry.operations.register(f'Plugin{{index}}', f'bench_plugins.plugin_{{index}}:PluginOperation')\n"
+        "{use}"
+    ),
+    "entry_points": (
+        "from dynamo_flow import registry\n"
+        "{use}"
+    ),
+}
+
+# Uso de una operación: se crea, se compila y se aplica a un registro
+USE_ONE = (
+    "if {plugins}:\n"
+    "    registry.operations.create('Plugin0', field_name='amount').execute({{'amount': '1'}})\n"
+)
+
+PLUGIN_MODULE = '''from dynamo_flow.operations.operation import Operation
+
+
+class PluginOperation(Operation):
+    """Operación sintética {index} del benchmark de importación."""
+
+    def __init__(self, field_name: str):
+        super().__init__(field_name=field_name)
+
+    def execute(self, record: dict) -> tuple[dict, list]:
+        return record, list()
+'''
+
+WRAPPER = '''import sys, time
+sys.stderr.write("start\\n")
+_start = time.perf_counter()
+{code}
+print("elapsed", time.perf_counter() - _start)
+'''
+
+
+def write_plugins(directory: str, plugins: int):
+    """Genera el paquete bench_plugins con un módulo por plugin y su .dist-info con los entry points."""
+    package = os.path.join(directory, "bench_plugins")
+    os.makedirs(package)
+    open(os.path.join(package, "__init__.py"), "w").close()
+    for index in range(plugins):
+        with open(os.path.join(package, f"plugin_{index}.py"), "w") as file:
+            file.write(PLUGIN_MODULE.format(index=index))
+    dist_info = os.path.join(directory, "bench_plugins-1.0.dist-info")
+    os.makedirs(dist_info)
+    with open(os.path.join(dist_info, "METADATA"), "w") as file:
+        file.write("Metadata-Version: 2.1\nName: bench-plugins\nVersion: 1.0\n")
+    with open(os.path.join(dist_info, "entry_points.txt"), "w") as file:
+        file.write("[dynamo_flow.operations]\n")
+        for index in range(plugins):
+            file.write(f"Plugin{index} = bench_plugins.plugin_{index}:PluginOperation\n")
+
+
+def run_case(code: str, path: list[str]) -> tuple[float, float]:
+    """
+    Ejecuta el código en un proceso nuevo con -X importtime.
+
+    Returns:
+        tuple[float, float]: Tiempo total del caso y tiempo de sus importaciones, en segundos.
+    """
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(path))
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", WRAPPER.format(code=code)],
+        capture_output=True, text=True, env=env, check=True,
+    )
+    elapsed = float(result.stdout.split()[-1])
+    # Solo las importaciones posteriores a la marca, para no contar el arranque del intérprete
+    lines = result.stderr.splitlines()
+    imports = 0
+    for line in lines[lines.index("start") + 1:]:
+        # Formato: "import time: self [us] | cumulative | imported package", con sangría según la profundidad
+        if not line.startswith("import time:") or line.count("|") != 2:
+            continue
+        _, cumulative, name = line.split("|")
+        # Solo los módulos del nivel superior, para no contar dos veces los anidados
+        if not name.startswith("  ") and cumulative.strip().isdigit():
+            imports += int(cumulative) / 1e6
+    return elapsed, imports
+
+
+def measure(code: str, path: list[str], repeat: int) -> tuple[float, float]:
+    """Mediana de repeat ejecuciones de run_case (la primera, con el caché de bytecode frío, se descarta)."""
+    run_case(code, path)
+    results = [run_case(code, path) for _ in range(repeat)]
+    return statistics.median(r[0] for r in results), statistics.median(r[1] for r in results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--plugins', type=str, default="0,10,100,500", help="Cantidades de plugins separadas por comas.")
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    print("Inicio en frío de dynamo_flow:")
+    for name, code in COLD_START_CASES.items():
+        elapsed, imports = measure(code, [ROOT], args.repeat)
+        print(f"  {name}: {elapsed * 1000:.1f} ms (importaciones: {imports * 1000:.1f} ms)")
+
+    print("Inicio en frío según la cantidad de plugins (se usa uno):")
+    for plugins in (int(value) for value in args.plugins.split(",")):
+        with tempfile.TemporaryDirectory() as directory:
+            write_plugins(directory, plugins)
+            for name, template in PLUGIN_CASES.items():
+                code = template.format(plugins=plugins, use=USE_ONE.format(plugins=plugins))
+                elapsed, imports = measure(code, [ROOT, directory], args.repeat)
+                print(f"  {plugins} plugins, {name}: {elapsed * 1000:.1f} ms (importaciones: {imports * 1000:.1f} ms)")
+
+
+if __name__ == '__main__':
+    main()
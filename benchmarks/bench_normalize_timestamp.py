@@ -0,0 +1,131 @@
+"""
+Conversión de fechas y horas ISO 8601 con NormalizeTimestampOperation comparada con datetime.fromisoformat y
+datetime.strptime.
+
+Las fechas y horas se concentran en --days días distintos (como los registros de un flujo), con una proporción
+--other-rate en otros formatos (fracciones de segundo, desplazamientos) que no usan la ruta rápida.
+
+Uso:
+    python benchmarks/bench_normalize_timestamp.py --values 500000 --days 3 --other-rate 0.05
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timezone
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dynamo_flow.operations import NormalizeTimestampOperation
+from dynamo_flow.operations.normalize_amount_operation import _numpy
+
+
+def generate_timestamps(count: int, days: int, other_rate: float, seed: int) -> list[str]:
+    """Genera fechas y horas en days días consecutivos, con una proporción other_rate en otros formatos."""
+    rng = random.Random(seed)
+    start = int(datetime(2024, 3, 1, tzinfo=timezone.utc).timestamp())
+    timestamps = list()
+    for _ in range(count):
+        value = datetime.fromtimestamp(start + rng.randrange(days * 86400), timezone.utc)
+        if rng.random() < other_rate:
+            timestamps.append(value.isoformat(timespec='milliseconds'))
+        else:
+            timestamps.append(value.strftime('%Y-%m-%dT%H:%M:%SZ'))
+    return timestamps
+
+
+def from_isoformat(values: list[str]) -> list[int]:
+    """Referencia: datetime.fromisoformat y conversión a segundos desde 1970."""
+    fromisoformat = datetime.fromisoformat
+    return [int(fromisoformat(value).timestamp()) for value in values]
+
+
+def from_strptime(values: list[str]) -> list[int]:
+    """Referencia: datetime.strptime (solo admite la forma 'YYYY-MM-DDTHH:MM:SSZ'; los demás formatos se omiten)."""
+    strptime = datetime.strptime
+    utc = timezone.utc
+    result = list()
+    for value in values:
+        if value.endswith('Z'):
+            result.append(int(strptime(value, '%Y-%m-%dT%H:%M:%SZ').replace(tzinfo=utc).timestamp()))
+    return result
+
+
+def converter(**kwargs) -> callable:
+    """Función de conversión compilada de NormalizeTimestampOperation."""
+    convert = NormalizeTimestampOperation("timestamp", **kwargs)._compile_converter()
+    return lambda values: [convert(value) for value in values]
+
+
+def operation_steps(**kwargs) -> callable:
+    """Operación compilada registro a registro (como en process_stream)."""
+    step = NormalizeTimestampOperation("timestamp", **kwargs).compile()
+    return lambda records: [step(record, list()) for record in records]
+
+
+def operation_batches(batch_size: int, **kwargs) -> callable:
+    """Operación compilada por lotes (como en process_stream_batched)."""
+    batch_step = NormalizeTimestampOperation("timestamp", **kwargs).compile_batch()
+    return lambda records: [
+        batch_step(records[start:start + batch_size], [None] * len(records[start:start + batch_size]))
+        for start in range(0, len(records), batch_size)
+    ]
+
+
+def measure(function, values: list[str]) -> float:
+    start = time.perf_counter()
+    function(values)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--values', type=int, default=500_000)
+    parser.add_argument('--days', type=int, default=3, help="Cantidad de días distintos.")
+    parser.add_argument('--other-rate', type=float, default=0.05, help="Proporción de valores en otros formatos.")
+    parser.add_argument('--batch-size', type=int, default=8192)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    values = generate_timestamps(args.values, args.days, args.other_rate, args.seed)
+    cases = {
+        "datetime.fromisoformat": from_isoformat,
+        "datetime.strptime (solo 'Z')": from_strptime,
+        "NormalizeTimestampOperation (epoch)": converter(),
+        "NormalizeTimestampOperation (datetime)": converter(output='datetime'),
+    }
+    if _numpy() is not None:
+        timestamp_to_epoch_many = NormalizeTimestampOperation.timestamp_to_epoch_many
+        date_cache = dict()
+        cases[f"timestamp_to_epoch_many (lotes de {args.batch_size})"] = lambda batch: [
+            timestamp_to_epoch_many(batch[start:start + args.batch_size], date_cache) for start in range(0, len(batch), args.batch_size)
+        ]
+
+    baseline = None
+    for name, function in cases.items():
+        elapsed = measure(function, values)
+        baseline = baseline or elapsed
+        print(f"{name}: {args.values / elapsed:,.0f} valores/s ({baseline / elapsed:.2f}x)")
+
+    # La operación completa sobre registros (incluye leer y escribir el campo y los logs)
+    record_cases = {
+        "NormalizeTimestampOperation.compile (por registro)": operation_steps(),
+        f"NormalizeTimestampOperation.compile_batch (lotes de {args.batch_size})": operation_batches(args.batch_size),
+    }
+    for name, function in record_cases.items():
+        # Los registros se modifican al procesarlos: se crean antes de medir para no contar el tiempo de crearlos
+        records = [{"timestamp": value} for value in values]
+        elapsed = measure(function, records)
+        print(f"{name}: {args.values / elapsed:,.0f} registros/s")
+
+    # Verifica que la operación devuelve lo mismo que datetime.fromisoformat
+    expected = from_isoformat(values)
+    if converter()(values) != expected:
+        raise SystemExit("NormalizeTimestampOperation no coincide con datetime.fromisoformat")
+    if _numpy() is not None and NormalizeTimestampOperation.timestamp_to_epoch_many(values).values.tolist() != expected:
+        raise SystemExit("timestamp_to_epoch_many no coincide con datetime.fromisoformat")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,50 @@
+"""
+Escalamiento de RecordContextManager.process_stream_parallel de 1 a N procesos, comparado con process_stream.
+
+Uso:
+    python benchmarks/bench_process_stream_parallel.py --records 400000 --max-workers 8 --chunk-size 2000
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager
+
+
+def measure(function) -> float:
+    start = time.perf_counter()
+    for _ in function():
+        pass
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=400_000)
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--chunk-size', type=int, default=2000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    records = list(generate_records(args.records, seed=args.seed))
+    record_manager = RecordContextManager()
+
+    # process_stream modifica los registros, se procesa una copia para no alterar la entrada de los demás casos
+    records_copy = copy.deepcopy(records)
+    sequential = measure(lambda: record_manager.process_stream(records_copy))
+    print(f"process_stream: {args.records / sequential:,.0f} registros/s")
+
+    workers = 1
+    while workers <= args.max_workers:
+        elapsed = measure(lambda: record_manager.process_stream_parallel(records, workers=workers, chunk_size=args.chunk_size))
+        print(f"process_stream_parallel workers={workers}: {args.records / elapsed:,.0f} registros/s ({sequential / elapsed:.2f}x)")
+        workers *= 2
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""
+Validación contra un catálogo SQLite: una consulta por registro (condición con lambda) comparada con
+ReferenceLookupOperation con process_stream (precarga las claves por ventanas de registros) y con
+process_stream_batched (resuelve las claves de cada lote), ambos con consultas IN (...).
+
+Los valores de order_id y product_sku del generador son únicos por registro, por lo que la caché no ayuda y la
+comparación mide el costo de las consultas.
+
+Uso:
+    python benchmarks/bench_reference_lookup.py --records 200000 --batch-size 8192 --missing-rate 0.1
+"""
+import argparse
+import copy
+import os
+import sqlite3
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager, ReferenceCatalog
+from dynamo_flow.operations import ContextualFieldValidation, ReferenceLookupOperation
+
+
+def build_catalog(path: str, records: list[dict[str, any]], missing_rate: float):
+    """Crea las tablas del catálogo con los valores de los registros, omitiendo una proporción missing_rate."""
+    step = round(1 / missing_rate) if missing_rate > 0 else 0
+    orders, products = list(), list()
+    for index, record in enumerate(records):
+        if step and index % step == 0:
+            continue
+        if record.get("order_id"):
+            orders.append((record["order_id"],))
+        if record.get("product_sku"):
+            products.append((record["product_sku"],))
+    with sqlite3.connect(path) as connection:
+        connection.execute("CREATE TABLE orders (order_id TEXT PRIMARY KEY)")
+        connection.execute("CREATE TABLE products (sku TEXT PRIMARY KEY)")
+        connection.executemany("INSERT OR IGNORE INTO orders VALUES (?)", orders)
+        connection.executemany("INSERT OR IGNORE INTO products VALUES (?)", products)
+
+
+def per_record_manager(path: str) -> RecordContextManager:
+    """Condiciones con lambda que consultan la base de datos una vez por registro."""
+    connection = sqlite3.connect(path)
+
+    def exists(table: str, column: str):
+        sql = f"SELECT 1 FROM {table} WHERE {column} = ?"
+        return lambda value: connection.execute(sql, (value,)).fetchone() is not None
+
+    return RecordContextManager({
+        "order_event": [ContextualFieldValidation(field_name="order_id", condition=exists("orders", "order_id"))],
+        "product_update": [ContextualFieldValidation(field_name="product_sku", condition=exists("products", "sku"))],
+    })
+
+
+def lookup_manager(path: str, cache_size: int) -> tuple[RecordContextManager, list[ReferenceCatalog]]:
+    """ReferenceLookupOperation con un catálogo por tabla."""
+    orders = ReferenceCatalog(path, "orders", "order_id", cache_size=cache_size)
+    products = ReferenceCatalog(path, "products", "sku", cache_size=cache_size)
+    record_manager = RecordContextManager({
+        "order_event": [ReferenceLookupOperation(field_name="order_id", catalog=orders)],
+        "product_update": [ReferenceLookupOperation(field_name="product_sku", catalog=products)],
+    })
+    return record_manager, [orders, products]
+
+
+def measure(function, records: list[dict[str, any]]) -> tuple[float, int]:
+    # Los registros se modifican al procesarlos: se copian antes de medir para no contar el tiempo de la copia
+    records = copy.deepcopy(records)
+    start = time.perf_counter()
+    invalid = sum(1 for _, logs in function(records) if logs)
+    return time.perf_counter() - start, invalid
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200_000)
+    parser.add_argument('--batch-size', type=int, default=8192)
+    parser.add_argument('--missing-rate', type=float, default=0.1, help="Proporción de valores que no están en el catálogo.")
+    parser.add_argument('--cache-size', type=int, default=100_000)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    records = list(generate_records(args.records, seed=args.seed, invalid_rate=0.0))
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "catalog.db")
+        build_catalog(path, records, args.missing_rate)
+
+        record_manager = per_record_manager(path)
+        elapsed, invalid = measure(lambda batch: record_manager.process_stream(batch, default=False), records)
+        print(f"una consulta por registro (lambda): {args.records / elapsed:,.0f} registros/s, inválidos: {invalid}")
+        baseline = elapsed
+
+        cases = (
+            ("ReferenceLookupOperation process_stream", lambda manager, batch: manager.process_stream(batch, default=False)),
+            (f"ReferenceLookupOperation process_stream_batched (batch_size={args.batch_size})",
+             lambda manager, batch: manager.process_stream_batched(batch, batch_size=args.batch_size, default=False)),
+        )
+        for name, run in cases:
+            record_manager, catalogs = lookup_manager(path, args.cache_size)
+            elapsed, invalid = measure(lambda batch: run(record_manager, batch), records)
+            queries = sum(catalog.info()["queries"] for catalog in catalogs)
+            print(f"{name}: {args.records / elapsed:,.0f} registros/s ({baseline / elapsed:.2f}x), inválidos: {invalid}, consultas: {queries:,}")
+            for catalog in catalogs:
+                catalog.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Registros con esquema (RecordSchema, con __slots__) comparados con diccionarios: memoria de un lote de registros
+acumulados y registros por segundo de process_stream (diccionarios) frente a process_schema_stream (registros con
+esquema), además del costo de convertir desde y hacia diccionarios en los extremos.
+
+La memoria se mide con tracemalloc solo para los contenedores: los valores de los campos (textos) se comparten
+entre los dos casos, por lo que la diferencia es la de guardar los campos en un diccionario o en slots.
+
+Uso:
+    python benchmarks/bench_schema_records.py --records 300000 --invalid-rate 0.2
+"""
+import argparse
+import copy
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager
+from dynamo_flow.records import OrderEventRecord, ProductoUpdateRecord, SchemaRecord, from_dicts
+
+SCHEMAS = (OrderEventRecord.schema, ProductoUpdateRecord.schema)
+
+
+def measure(build) -> tuple[any, int]:
+    """Devuelve el resultado de build y la memoria que quedó asignada al construirlo."""
+    tracemalloc.start()
+    value = build()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return value, current
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=300_000)
+    parser.add_argument('--invalid-rate', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    source = list(generate_records(args.records, seed=args.seed, invalid_rate=args.invalid_rate))
+
+    # Memoria de un lote acumulado: copias superficiales (mismos valores) como diccionarios y como registros con esquema
+    dicts, dict_bytes = measure(lambda: [dict(record) for record in source])
+    rows, row_bytes = measure(lambda: list(from_dicts(source, SCHEMAS)))
+    print(f"diccionarios: {dict_bytes / len(source):,.0f} bytes por registro")
+    print(f"registros con esquema: {row_bytes / len(source):,.0f} bytes por registro ({dict_bytes / row_bytes:.1f}x menos)")
+    del dicts, rows
+
+    record_manager = RecordContextManager()
+    # process_stream modifica los registros: cada caso procesa su propia copia
+    records = copy.deepcopy(source)
+    start = time.perf_counter()
+    expected = [(record, logs) for record, logs in record_manager.process_stream(records)]
+    elapsed = time.perf_counter() - start
+    print(f"process_stream (diccionarios): {args.records / elapsed:,.0f} registros/s ({elapsed:.2f} s)")
+
+    records = copy.deepcopy(source)
+    start = time.perf_counter()
+    rows = list(from_dicts(records, SCHEMAS))
+    converted = time.perf_counter()
+    results = [(row, logs) for row, logs in record_manager.process_schema_stream(rows)]
+    processed = time.perf_counter()
+    output = [row.to_dict() if isinstance(row, SchemaRecord) else row for row, _ in results]
+    end = time.perf_counter()
+    print(f"process_schema_stream (registros con esquema): {args.records / (processed - converted):,.0f} registros/s ({processed - converted:.2f} s)")
+    print(f"  conversión desde diccionarios: {converted - start:.2f} s, hacia diccionarios: {end - processed:.2f} s")
+
+    # Verifica que los dos caminos producen los mismos registros y logs
+    for (record, logs), row, (_, row_logs) in zip(expected, output, results):
+        if record != row or [log.code for log in logs] != [log.code for log in row_logs]:
+            raise SystemExit("process_schema_stream no produce lo mismo que process_stream")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,106 @@
+"""
+Escritura de los resultados de process_stream: un ciclo que escribe cada registro con write_jsonl (como hacía la
+línea de comandos) comparado con RoutingSink y JsonlSink en el mismo hilo (background=False) y con hilo escritor.
+
+Con --latency se simula un disco lento: cada escritura al sistema operativo (una por búfer lleno) espera esa
+cantidad de segundos, como una escritura a un disco de red o una llamada a fsync.
+
+Uso:
+    python benchmarks/bench_sinks.py --records 200000 --invalid-rate 0.2 --latency 0.05
+"""
+import argparse
+import copy
+import io
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager, JsonlSink, RoutingSink
+from dynamo_flow.streams import write_jsonl
+from dynamo_flow.streams.jsonl import BUFFER_SIZE
+
+
+class SlowFile(io.RawIOBase):
+    """Archivo que espera latency segundos en cada escritura al sistema operativo."""
+
+    def __init__(self, path: str, latency: float):
+        self._file = open(path, 'wb', buffering=0)
+        self._latency = latency
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data: bytes) -> int:
+        if self._latency:
+            time.sleep(self._latency)
+        return self._file.write(data)
+
+    def close(self):
+        self._file.close()
+        super().close()
+
+
+def open_binary(path: str, latency: float) -> io.BufferedWriter:
+    return io.BufferedWriter(SlowFile(path, latency), buffer_size=BUFFER_SIZE)
+
+
+def write_loop(results, directory: str, latency: float):
+    """Referencia: un registro a la vez con write_jsonl, en el mismo hilo."""
+    with io.TextIOWrapper(open_binary(os.path.join(directory, "loop_valid.jsonl"), latency), encoding='utf-8') as valid, \
+            io.TextIOWrapper(open_binary(os.path.join(directory, "loop_invalid.jsonl"), latency), encoding='utf-8') as invalid:
+        for record, logs in results:
+            if logs:
+                write_jsonl(invalid, {"record": record, "logs": logs})
+            else:
+                write_jsonl(valid, record)
+
+
+def write_sinks(results, directory: str, latency: float, background: bool):
+    """RoutingSink con dos JsonlSink."""
+    name = "background" if background else "foreground"
+    with open_binary(os.path.join(directory, f"{name}_valid.jsonl"), latency) as valid, \
+            open_binary(os.path.join(directory, f"{name}_invalid.jsonl"), latency) as invalid:
+        with RoutingSink(JsonlSink(valid, background=background), JsonlSink(invalid, background=background)) as sink:
+            sink.write_many(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200_000)
+    parser.add_argument('--invalid-rate', type=float, default=0.2)
+    parser.add_argument('--latency', type=float, default=0.0, help="Segundos de espera por cada escritura al sistema operativo.")
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    source = list(generate_records(args.records, seed=args.seed, invalid_rate=args.invalid_rate))
+    record_manager = RecordContextManager()
+    cases = {
+        "ciclo con write_jsonl": lambda results, directory: write_loop(results, directory, args.latency),
+        "RoutingSink + JsonlSink (mismo hilo)": lambda results, directory: write_sinks(results, directory, args.latency, False),
+        "RoutingSink + JsonlSink (hilo escritor)": lambda results, directory: write_sinks(results, directory, args.latency, True),
+    }
+    with tempfile.TemporaryDirectory() as directory:
+        for name, case in cases.items():
+            # process_stream modifica los registros: cada caso procesa su propia copia
+            records = copy.deepcopy(source)
+            start = time.perf_counter()
+            case(record_manager.process_stream(records), directory)
+            elapsed = time.perf_counter() - start
+            print(f"{name}: {args.records / elapsed:,.0f} registros/s ({elapsed:.2f} s)")
+
+        # Verifica que todos los casos escriben lo mismo
+        contents = set()
+        for prefix in ("loop", "foreground", "background"):
+            with open(os.path.join(directory, f"{prefix}_valid.jsonl"), 'rb') as valid, \
+                    open(os.path.join(directory, f"{prefix}_invalid.jsonl"), 'rb') as invalid:
+                contents.add((valid.read(), invalid.read()))
+        if len(contents) != 1:
+            raise SystemExit("Los destinos no escriben lo mismo que el ciclo con write_jsonl")
+
+
+if __name__ == '__main__':
+    main()
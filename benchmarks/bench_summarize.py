@@ -0,0 +1,79 @@
+"""
+Resumen de un flujo de registros: un ciclo sobre process_stream que cuenta registros y logs (como haría quien solo
+necesita el informe) comparado con summarize_stream, que no crea una lista de logs ni una tupla de resultado por
+registro. Informa registros por segundo y la memoria máxima asignada (tracemalloc) durante el procesamiento.
+
+Uso:
+    python benchmarks/bench_summarize.py --records 500000 --invalid-rate 0.2
+"""
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.generator import generate_records
+from dynamo_flow import RecordContextManager
+
+
+def count_loop(record_manager: RecordContextManager, records) -> dict:
+    """Referencia: cuenta registros por tipo y logs por código con process_stream."""
+    types, codes = dict(), dict()
+    for record, logs in record_manager.process_stream(records):
+        record_type = record.get('__type__')
+        counts = types.setdefault(record_type, [0, 0])
+        counts[0] += 1
+        if logs:
+            counts[1] += 1
+            for log in logs:
+                codes[log.code] = codes.get(log.code, 0) + 1
+    return {"types": types, "codes": codes}
+
+
+def summarize(record_manager: RecordContextManager, records) -> dict:
+    summary = record_manager.summarize_stream(records)
+    types = {record_type: [counts["records"], counts["invalid"]] for record_type, counts in summary.to_dict()["types"].items()}
+    codes = dict()
+    for log in summary.to_dict()["logs"]:
+        codes[log["code"]] = codes.get(log["code"], 0) + log["count"]
+    return {"types": types, "codes": codes}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=500_000)
+    parser.add_argument('--invalid-rate', type=float, default=0.2)
+    parser.add_argument('--seed', type=int, default=1)
+    args = parser.parse_args()
+
+    record_manager = RecordContextManager()
+    cases = {
+        "ciclo sobre process_stream": count_loop,
+        "summarize_stream": summarize,
+    }
+    reports = list()
+    for name, case in cases.items():
+        # Los registros se generan durante el procesamiento, para que la memoria medida sea la del procesamiento
+        records = generate_records(args.records, seed=args.seed, invalid_rate=args.invalid_rate)
+        start = time.perf_counter()
+        reports.append(case(record_manager, records))
+        elapsed = time.perf_counter() - start
+        print(f"{name}: {args.records / elapsed:,.0f} registros/s ({elapsed:.2f} s)")
+
+    for name, case in cases.items():
+        records = generate_records(min(args.records, 100_000), seed=args.seed, invalid_rate=args.invalid_rate)
+        tracemalloc.start()
+        case(record_manager, records)
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        print(f"{name}: memoria máxima {peak / 1024:,.0f} KiB")
+
+    # Verifica que los dos casos cuentan lo mismo
+    if reports[0] != reports[1]:
+        raise SystemExit("summarize_stream no cuenta lo mismo que el ciclo sobre process_stream")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,154 @@
+"""
+Prueba de equivalencia (fuzzing) entre el escáner de una sola pasada de NormalizeAmountOperation.number_to_float
+y la implementación anterior basada en expresiones regulares, con el rendimiento de ambas.
+
+Uso:
+    python benchmarks/fuzz_number_to_float.py --cases 200000 --seed 7
+"""
+import argparse
+import math
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from dynamo_flow.operations import NormalizeAmountOperation
+
+
+def reference_number_to_float(number: str) -> float:
+    """Implementación anterior de number_to_float (expresiones regulares y varias pasadas), usada como referencia."""
+    number = str(number)
+    scientific_notation = r'^[+-]?\d+[\.,]?\d*[eE][+-]?\d+$'
+    if re.match(scientific_notation, number):
+        return float(number.replace(',', '.'))
+    number = re.sub(r'[^\d,.-]', '', number)
+    if not number:
+        return None
+    if number.endswith('-'):
+        number = '-' + number[:-1]
+    dot_count = number.count('.')
+    comma_count = number.count(',')
+    if dot_count == 0 and comma_count == 0:
+        return float(number)
+    if dot_count == 1 and comma_count == 0:
+        return float(number)
+    if comma_count == 1 and dot_count == 0:
+        return float(number.replace(',', '.'))
+    last_dot = number.rfind('.')
+    last_comma = number.rfind(',')
+    if last_dot > last_comma:
+        return float(number.replace(',', ''))
+    else:
+        return float(number.replace('.', '').replace(',', '.'))
+
+
+CURRENCIES = ['$', '€', '£', '¥', '₹', 'R$', 'CHF', 'kr', '₽', '₪', '฿', 'USD', 'EUR', 'GBP', 'MXN$', 'JPY', 'Cr', 'Dr']
+DIGITS = '0123456789'
+UNICODE_DIGITS = '٠١٢٣٤٥٦٧٨٩０１２３४५'
+NOISE = " \t\n'()⟨⟩+-.,eExa_ "
+# Formatos frecuentes en los feeds reales, para medir el rendimiento fuera de la mezcla aleatoria
+COMMON_AMOUNTS = ["25,12 EUR", "99.99 EUR", "123,45 EUR", "$1,234.56", "€1.234,56", "1.234,56-", "12345", "1.234e+6"]
+
+
+def random_digits(rng: random.Random, size: int) -> str:
+    alphabet = UNICODE_DIGITS if rng.random() < 0.05 else DIGITS
+    return ''.join(rng.choice(alphabet) for _ in range(size))
+
+
+def random_amount(rng: random.Random) -> str:
+    """Genera un monto con formato de moneda aleatorio, incluyendo formatos inválidos y ruido."""
+    style = rng.random()
+    if style < 0.15:
+        # Notación científica, a veces con coma decimal o salto de línea final
+        text = random_digits(rng, rng.randint(1, 4))
+        if rng.random() < 0.7:
+            text += rng.choice('.,') + random_digits(rng, rng.randint(0, 4))
+        text += rng.choice('eE') + rng.choice(['', '+', '-']) + random_digits(rng, rng.randint(1, 3))
+        if rng.random() < 0.3:
+            text = rng.choice('+-') + text
+        if rng.random() < 0.1:
+            text += '\n'
+        return text
+    if style < 0.25:
+        # Ruido puro
+        return ''.join(rng.choice(NOISE + DIGITS) for _ in range(rng.randint(0, 12)))
+    # Monto con separadores de miles y decimal
+    thousands, decimal = rng.choice([(',', '.'), ('.', ','), (' ', ','), ("'", '.'), ('', '.'), ('', ','), (',', ','), ('.', '.')])
+    groups = [random_digits(rng, rng.randint(1, 3))] + [random_digits(rng, rng.choice([2, 3, 3, 3])) for _ in range(rng.randint(0, 3))]
+    text = thousands.join(groups)
+    if rng.random() < 0.7:
+        text += decimal + random_digits(rng, rng.randint(0, 3))
+    currency = rng.choice(CURRENCIES) if rng.random() < 0.6 else ''
+    space = rng.choice(['', ' '])
+    text = currency + space + text if rng.random() < 0.5 else text + space + currency
+    sign = rng.random()
+    if sign < 0.1:
+        text = '-' + text
+    elif sign < 0.2:
+        text = text + '-'
+    elif sign < 0.25:
+        text = '(' + text + ')'
+    elif sign < 0.3:
+        text = '+' + text
+    if rng.random() < 0.05:
+        position = rng.randint(0, len(text))
+        text = text[:position] + rng.choice(NOISE) + text[position:]
+    return text
+
+
+def outcome(function, value) -> tuple:
+    """Resultado comparable: el float (incluido su signo), None, o el tipo y mensaje de la excepción."""
+    try:
+        result = function(value)
+    except Exception as e:
+        return ('error', type(e).__name__, str(e))
+    if result is None:
+        return ('none',)
+    return ('float', repr(result) if not math.isnan(result) else 'nan')
+
+
+def throughput(function, values: list) -> float:
+    """Conversiones por segundo de function sobre values."""
+    start = time.perf_counter()
+    for value in values:
+        try:
+            function(value)
+        except Exception:
+            pass
+    return len(values) / (time.perf_counter() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--cases', type=int, default=200_000, help='Cantidad de montos aleatorios a comparar.')
+    parser.add_argument('--seed', type=int, default=7, help='Semilla del generador aleatorio.')
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    values = [random_amount(rng) for _ in range(args.cases)]
+    values += [None, 0, 25, -1.5, 1e20, True, '', '-', '0', '1e5\n', '12\n']
+
+    mismatches = 0
+    for value in values:
+        expected = outcome(reference_number_to_float, value)
+        actual = outcome(NormalizeAmountOperation.number_to_float, value)
+        if expected != actual:
+            mismatches += 1
+            if mismatches <= 20:
+                print(f"DIFERENCIA {value!r}: referencia={expected} escáner={actual}")
+
+    print(f"Casos comparados: {len(values)}  Diferencias: {mismatches}")
+    common = [rng.choice(COMMON_AMOUNTS) for _ in range(args.cases)]
+    for label, workload in (("mezcla aleatoria", values), ("formatos frecuentes", common)):
+        reference_rate = throughput(reference_number_to_float, workload)
+        scanner_rate = throughput(NormalizeAmountOperation.number_to_float, workload)
+        print(f"[{label}] Referencia (regex): {reference_rate:,.0f} conversiones/s")
+        print(f"[{label}] Escáner (una pasada): {scanner_rate:,.0f} conversiones/s ({scanner_rate / reference_rate:.2f}x)")
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main()
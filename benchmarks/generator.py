@@ -0,0 +1,117 @@
+"""
+Generador reproducible de registros sintéticos order_event y product_update.
+
+Los registros se generan de forma perezosa, por lo que se pueden producir decenas de millones sin guardarlos en memoria.
+"""
+import random
+from typing import Generator
+
+# Formatos de monto disponibles y un ejemplo de cómo se genera cada uno
+AMOUNT_FORMATS = {
+    "plain": lambda rng: f"{rng.uniform(0, 10_000):.2f}",
+    "comma_decimal": lambda rng: f"{rng.uniform(0, 1_000):.2f}".replace('.', ',') + " EUR",
+    "us_thousands": lambda rng: "$" + f"{rng.uniform(1_000, 1_000_000):,.2f}",
+    "eu_thousands": lambda rng: "€" + f"{rng.uniform(1_000, 1_000_000):,.2f}".replace(',', '_').replace('.', ',').replace('_', '.'),
+    "scientific": lambda rng: f"{rng.uniform(1, 10):.3f}e+{rng.randint(0, 6)}",
+    "trailing_minus": lambda rng: f"{rng.uniform(1_000, 100_000):,.2f}".replace(',', '_').replace('.', ',').replace('_', '.') + "-",
+}
+
+# Mezcla de formatos por defecto (pesos relativos)
+DEFAULT_FORMAT_MIX = {
+    "plain": 3,
+    "comma_decimal": 4,
+    "us_thousands": 1,
+    "eu_thousands": 1,
+    "scientific": 0.5,
+    "trailing_minus": 0.5,
+}
+
+# Formas en que un registro puede ser inválido, por tipo de registro
+INVALID_KINDS = {
+    "order_event": ("bad_amount", "missing_amount", "bad_order_id", "missing_customer", "empty"),
+    "product_update": ("bad_amount", "missing_amount", "bad_is_active", "missing_sku", "empty"),
+}
+
+
+def parse_format_mix(text: str) -> dict[str, float]:
+    """
+    Convierte una mezcla de formatos escrita como 'plain=3,eu_thousands=1' en un diccionario de pesos.
+
+    Args:
+        text (str): Mezcla de formatos.
+
+    Returns:
+        dict[str, float]: Peso de cada formato.
+    """
+    mix = dict()
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in AMOUNT_FORMATS:
+            raise Exception(f"Formato de monto desconocido: {name}. Formatos disponibles: {', '.join(AMOUNT_FORMATS)}.")
+        mix[name] = float(weight or 1)
+    return mix
+
+
+def generate_records(count: int, seed: int = 0, invalid_rate: float = 0.1, format_mix: dict[str, float] | None = None, type_mix: dict[str, float] | None = None) -> Generator[dict[str, any], None, None]:
+    """
+    Genera registros sintéticos de forma reproducible.
+
+    Args:
+        count (int): Cantidad de registros a generar.
+        seed (int): Semilla del generador aleatorio. La misma semilla produce los mismos registros.
+        invalid_rate (float): Proporción de registros inválidos (entre 0 y 1).
+        format_mix (dict[str, float] | None): Peso de cada formato de monto. Por defecto DEFAULT_FORMAT_MIX.
+        type_mix (dict[str, float] | None): Peso de cada tipo de registro. Por defecto 50% order_event y 50% product_update.
+
+    Returns:
+        Generator: Generador de registros.
+    """
+    rng = random.Random(seed)
+    format_mix = format_mix or DEFAULT_FORMAT_MIX
+    type_mix = type_mix or {"order_event": 1, "product_update": 1}
+    format_names = list(format_mix)
+    format_weights = list(format_mix.values())
+    type_names = list(type_mix)
+    type_weights = list(type_mix.values())
+    for index in range(count):
+        record_type = rng.choices(type_names, type_weights)[0]
+        amount = AMOUNT_FORMATS[rng.choices(format_names, format_weights)[0]](rng)
+        if record_type == "order_event":
+            record = {
+                "__type__": "order_event",
+                "order_id": f"ORD{index}",
+                "customer_name": "Cliente " + str(rng.randint(1, 50_000)),
+                "amount": amount,
+                "timestamp": f"2024-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}T{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}:00Z",
+            }
+        else:
+            record = {
+                "__type__": "product_update",
+                "product_sku": f"SKU_P{index}",
+                "price": amount,
+                "is_active": rng.choice(("True", "False", "true", "false")),
+            }
+        if rng.random() < invalid_rate:
+            record = _make_invalid(record, rng.choice(INVALID_KINDS[record_type]))
+        yield record
+
+
+def _make_invalid(record: dict[str, any], kind: str) -> dict[str, any]:
+    """Vuelve inválido un registro de la forma indicada."""
+    if kind == "empty":
+        return {}
+    amount_field = "amount" if record["__type__"] == "order_event" else "price"
+    if kind == "bad_amount":
+        record[amount_field] = "no_es_un_numero"
+    elif kind == "missing_amount":
+        del record[amount_field]
+    elif kind == "bad_order_id":
+        record["order_id"] = record["order_id"] + "T"
+    elif kind == "missing_customer":
+        del record["customer_name"]
+    elif kind == "bad_is_active":
+        record["is_active"] = "Trues"
+    elif kind == "missing_sku":
+        record["product_sku"] = None
+    return record
@@ -0,0 +1,254 @@
+"""
+Suite de rendimiento de DynamoFlow.
+
+Mide para cada caso los registros por segundo, la latencia por registro (p50/p99) y la memoria máxima (RSS).
+La latencia no se mide en los casos que procesan los registros por lotes (BATCHED_CASES).
+Cada caso se ejecuta en un proceso aparte para que la memoria máxima de un caso no afecte a los demás.
+Los resultados se pueden guardar como línea base en JSON y comparar en una ejecución posterior.
+
+Uso:
+    python -m benchmarks.run --records 1000000 --save baseline.json
+    python -m benchmarks.run --records 1000000 --compare baseline.json --threshold 0.10
+    python -m benchmarks.run --cases process_stream_default,number_to_float --invalid-rate 0.3 --formats plain=1,eu_thousands=1
+"""
+import argparse
+import json
+import os
+import platform
+import re
+import subprocess
+import sys
+import time
+from collections import deque
+from itertools import islice
+from typing import Callable, Iterable, Iterator
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from benchmarks.generator import generate_records, parse_format_mix
+from dynamo_flow import RecordContextManager
+from dynamo_flow.operations import NormalizeAmountOperation, ContextualFieldValidation
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+
+def _registered_manager() -> RecordContextManager:
+    record_manager = RecordContextManager(dict())
+    record_manager.register_context("order_event", [
+        NormalizeAmountOperation(field_name="amount"),
+        ContextualFieldValidation(field_name="order_id", required=True, condition=lambda x: re.match(r'^ORD\d+$', x)),
+        ContextualFieldValidation(field_name="customer_name", required=True),
+    ])
+    record_manager.register_context("product_update", [
+        NormalizeAmountOperation(field_name="price"),
+        ContextualFieldValidation(field_name="product_sku", required=True, condition=lambda x: re.match(r'^SKU_P\d+$', x)),
+        ContextualFieldValidation(field_name="is_active", required=True, condition=lambda x: x.lower() in ('true', 'false')),
+    ])
+    return record_manager
+
+
+def _number_to_float(record: dict[str, any]) -> any:
+    try:
+        return NormalizeAmountOperation.number_to_float(record.get("amount") or record.get("price"))
+    except Exception:
+        return None
+
+
+def _per_record(function: Callable[[dict[str, any]], any]) -> Callable[[Iterable[dict[str, any]]], Iterator]:
+    return lambda records: map(function, records)
+
+
+# Casos de la suite: cada uno recibe un iterable de registros y devuelve un iterador con un resultado por registro
+CASES = {
+    "process_stream_default": lambda: RecordContextManager().process_stream,
+    "process_stream_registered": lambda: (lambda records, manager=_registered_manager(): manager.process_stream(records, default=False)),
+    "process_stream_batched": lambda: RecordContextManager().process_stream_batched,
+    "number_to_float": lambda: _per_record(_number_to_float),
+    "NormalizeAmountOperation": lambda: _per_record(NormalizeAmountOperation(field_name="amount").execute),
+    "ContextualFieldValidation": lambda: _per_record(
+        ContextualFieldValidation(field_name="order_id", required=True, condition=lambda x: re.match(r'^ORD\d+$', x)).execute
+    ),
+}
+
+
+# Casos que procesan los registros por lotes: el primer resultado de cada lote paga el lote completo y los demás ya
+# están calculados, por lo que la latencia registro a registro no tiene sentido y no se mide (ni se compara)
+BATCHED_CASES = frozenset(("process_stream_batched",))
+
+
+def _consume(iterator: Iterable):
+    deque(iterator, maxlen=0)
+
+
+def _peak_rss_kb() -> int | None:
+    """Memoria máxima del proceso en KiB, o None si no se puede medir en esta plataforma."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # En macOS ru_maxrss está en bytes, en Linux en KiB
+    return peak // 1024 if sys.platform == 'darwin' else peak
+
+
+def _timed(process: Callable[[Iterable[dict[str, any]]], Iterator], args: argparse.Namespace) -> float:
+    """
+    Tiempo que tarda process en consumir args.records registros.
+
+    Los registros se generan por bloques de args.chunk_size antes de medir cada bloque, de modo que solo se mide el
+    procesamiento y la memoria no depende de la cantidad total de registros.
+    """
+    source = generate_records(args.records, seed=args.seed, invalid_rate=args.invalid_rate, format_mix=args.format_mix)
+    elapsed = 0.0
+    while chunk := list(islice(source, args.chunk_size)):
+        start = time.perf_counter()
+        _consume(process(chunk))
+        elapsed += time.perf_counter() - start
+    return elapsed
+
+
+def run_case(name: str, args: argparse.Namespace) -> dict[str, any]:
+    """
+    Ejecuta un caso en el proceso actual y devuelve sus métricas.
+
+    Los registros se generan por bloques fuera de la medición (ver _timed).
+    La latencia se mide registro a registro sobre una muestra generada de antemano, salvo en BATCHED_CASES.
+    """
+    process = CASES[name]()
+
+    # Se conserva la mejor de las repeticiones para reducir el ruido de la máquina
+    elapsed = min(_timed(process, args) for _ in range(max(args.repeat, 1)))
+    if elapsed <= 0:
+        raise Exception(f"El caso {name} no tardó un tiempo medible: aumente --records.")
+
+    latencies = list()
+    if name not in BATCHED_CASES:
+        sample = list(generate_records(min(args.latency_samples, args.records), seed=args.seed + 1, invalid_rate=args.invalid_rate, format_mix=args.format_mix))
+        iterator = iter(process(iter(sample)))
+        for _ in range(len(sample)):
+            begin = time.perf_counter_ns()
+            next(iterator)
+            latencies.append(time.perf_counter_ns() - begin)
+        latencies.sort()
+
+    return {
+        "records": args.records,
+        "records_per_sec": args.records / elapsed,
+        "p50_us": latencies[len(latencies) // 2] / 1000 if latencies else None,
+        "p99_us": latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))] / 1000 if latencies else None,
+        "peak_rss_kb": _peak_rss_kb(),
+    }
+
+
+def run_isolated(name: str, argv: list[str]) -> dict[str, any]:
+    """Ejecuta un caso en un proceso nuevo para medir su memoria máxima por separado."""
+    command = [sys.executable, '-m', 'benchmarks.run', '--case', name] + argv
+    completed = subprocess.run(command, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(completed.stdout)
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> list[str]:
+    """
+    Compara los resultados con una línea base y devuelve las regresiones mayores al umbral.
+
+    Se considera regresión una caída de registros/s, o un aumento de la latencia p99 o de la memoria máxima,
+    mayor que threshold (proporción, por ejemplo 0.10 = 10%). Las métricas sin valor (la latencia de BATCHED_CASES)
+    no se comparan.
+    """
+    regressions = list()
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous:
+            continue
+        checks = (
+            ("records_per_sec", -1),
+            ("p99_us", 1),
+            ("peak_rss_kb", 1),
+        )
+        for metric, direction in checks:
+            before, after = previous.get(metric), current.get(metric)
+            if not before or after is None:
+                continue
+            change = (after - before) / before
+            if change * direction > threshold:
+                regressions.append(f"{name}.{metric}: {before:,.1f} -> {after:,.1f} ({change:+.1%})")
+    return regressions
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m benchmarks.run', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--records', type=int, default=200_000, help='Registros por caso (admite decenas de millones).')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--invalid-rate', type=float, default=0.1, help='Proporción de registros inválidos.')
+    parser.add_argument('--formats', default=None, help="Mezcla de formatos de monto, por ejemplo 'plain=3,eu_thousands=1'.")
+    parser.add_argument('--chunk-size', type=int, default=50_000, help='Registros generados antes de medir cada bloque.')
+    parser.add_argument('--repeat', type=int, default=3, help='Repeticiones de la medición de registros/s; se conserva la mejor.')
+    parser.add_argument('--latency-samples', type=int, default=50_000, help='Registros medidos uno a uno para la latencia.')
+    parser.add_argument('--cases', default=None, help=f"Casos separados por comas. Disponibles: {', '.join(CASES)}.")
+    parser.add_argument('--save', help='Guarda los resultados como línea base en este archivo JSON.')
+    parser.add_argument('--compare', help='Compara los resultados con la línea base de este archivo JSON.')
+    parser.add_argument('--threshold', type=float, default=0.10, help='Umbral de regresión (proporción). Por defecto 0.10.')
+    parser.add_argument('--case', help=argparse.SUPPRESS)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    args = build_parser().parse_args(argv)
+    args.format_mix = parse_format_mix(args.formats) if args.formats else None
+
+    # Proceso hijo: ejecuta un solo caso y escribe sus métricas en JSON
+    if args.case:
+        print(json.dumps(run_case(args.case, args)))
+        return 0
+
+    names = args.cases.split(',') if args.cases else list(CASES)
+    unknown = [name for name in names if name not in CASES]
+    if unknown:
+        raise Exception(f"Casos desconocidos: {', '.join(unknown)}.")
+    # Los procesos hijos reciben los mismos parámetros, salvo los de la ejecución principal
+    child_argv = [
+        '--records', str(args.records), '--seed', str(args.seed), '--invalid-rate', str(args.invalid_rate),
+        '--latency-samples', str(args.latency_samples), '--repeat', str(args.repeat),
+        '--chunk-size', str(args.chunk_size),
+    ] + (['--formats', args.formats] if args.formats else [])
+
+    results = dict()
+    print(f"{'caso':<28} {'registros/s':>14} {'p50 (us)':>10} {'p99 (us)':>10} {'RSS máx (MiB)':>14}")
+    for name in names:
+        metrics = run_isolated(name, child_argv)
+        results[name] = metrics
+        rss = f"{metrics['peak_rss_kb'] / 1024:,.1f}" if metrics['peak_rss_kb'] else '-'
+        p50, p99 = (f"{metrics[key]:.2f}" if metrics[key] is not None else '-' for key in ('p50_us', 'p99_us'))
+        print(f"{name:<28} {metrics['records_per_sec']:>14,.0f} {p50:>10} {p99:>10} {rss:>14}")
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as file:
+            json.dump({
+                "meta": {
+                    "python": platform.python_version(),
+                    "platform": platform.platform(),
+                    "args": child_argv,
+                    "date": time.strftime('%Y-%m-%dT%H:%M:%S'),
+                },
+                "results": results,
+            }, file, indent=2)
+        print(f"Línea base guardada en {args.save}")
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        if regressions:
+            print(f"Regresiones mayores al {args.threshold:.0%}:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print(f"Sin regresiones mayores al {args.threshold:.0%} respecto de {args.compare}")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
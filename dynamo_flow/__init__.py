@@ -1,4 +1,60 @@
-from .record_context_manager import RecordContextManager
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Módulo de cada clase o función exportada. Se importa la primera vez que se usa el nombre (PEP 562), por lo que
+# importar dynamo_flow no importa los módulos (ni sus dependencias) que el proceso no use.
+_EXPORTS = {
+    'RecordContextManager': '.record_context_manager',
+    'LogEntry': '.logs',
+    'EMPTY_LOGS': '.logs',
+    'as_dict_logs': '.logs',
+    'Metrics': '.metrics',
+    'MetricsExporter': '.metrics',
+    'PrometheusFileExporter': '.metrics',
+    'ErrorBudget': '.budget',
+    'ErrorBudgetExceeded': '.budget',
+    'ConfigSnapshot': '.config_snapshot',
+    'ReferenceCatalog': '.lookup',
+    'ConnectionPool': '.lookup',
+    'Checkpoint': '.checkpoint',
+    'StreamSummary': '.summary',
+    'RecordSchema': '.records',
+    'Deduplicator': '.dedup',
+    'AdaptiveOrdering': '.ordering',
+    'Sink': '.sinks',
+    'JsonlSink': '.sinks',
+    'CsvSink': '.sinks',
+    'RoutingSink': '.sinks',
+}
+
+if TYPE_CHECKING:
+    from .record_context_manager import RecordContextManager
+    from .logs import LogEntry, EMPTY_LOGS, as_dict_logs
+    from .metrics import Metrics, MetricsExporter, PrometheusFileExporter
+    from .budget import ErrorBudget, ErrorBudgetExceeded
+    from .config_snapshot import ConfigSnapshot
+    from .lookup import ReferenceCatalog, ConnectionPool
+    from .checkpoint import Checkpoint
+    from .summary import StreamSummary
+    from .records import RecordSchema
+    from .dedup import Deduplicator
+    from .ordering import AdaptiveOrdering
+    from .sinks import Sink, JsonlSink, CsvSink, RoutingSink
+
+
+def __getattr__(name: str) -> any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Se guarda en el módulo para que los siguientes accesos no pasen por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 # Para poder importar las clases facilmente desde fuera del paquete dynamo_flow
-__all__ = ['RecordContextManager']
\ No newline at end of file
+__all__ = ['RecordContextManager', 'LogEntry', 'EMPTY_LOGS', 'as_dict_logs', 'Metrics', 'MetricsExporter', 'PrometheusFileExporter', 'ErrorBudget', 'ErrorBudgetExceeded', 'ConfigSnapshot', 'ReferenceCatalog', 'ConnectionPool', 'Checkpoint', 'StreamSummary', 'RecordSchema', 'Deduplicator', 'AdaptiveOrdering', 'Sink', 'JsonlSink', 'CsvSink', 'RoutingSink']
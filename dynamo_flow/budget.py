@@ -0,0 +1,108 @@
+from collections import deque
+
+
+class ErrorBudgetExceeded(Exception):
+    """
+    Excepción lanzada por process_stream cuando se supera el presupuesto de errores con la acción 'abort'.
+    """
+    pass
+
+
+class ErrorBudget:
+    """
+    Presupuesto de errores de un flujo: proporción máxima de registros inválidos en una ventana de registros recientes.
+
+    Cuando la proporción de registros con logs en los últimos window registros supera max_invalid_ratio
+    (y ya se observaron al menos min_records), el presupuesto queda superado hasta reiniciarlo con reset:
+        - 'abort': process_stream lanza ErrorBudgetExceeded al pedir el registro siguiente.
+        - 'sample': process_stream solo valida uno de cada round(1 / sample_rate) registros; el resto se entrega sin
+          procesar con la advertencia NOT_VALIDATED, para no gastar CPU en una fuente que envía registros basura.
+
+    Attributes:
+        max_invalid_ratio (float): Proporción máxima de registros inválidos, entre 0 y 1.
+        window (int): Cantidad de registros recientes sobre la que se calcula la proporción.
+        min_records (int): Cantidad mínima de registros observados antes de evaluar el presupuesto.
+        action (str): Acción al superar el presupuesto: 'abort' o 'sample'.
+        sample_rate (float): Proporción de registros que se siguen validando con la acción 'sample'.
+        records (int): Registros validados.
+        invalid (int): Registros validados con logs.
+        skipped (int): Registros entregados sin validar por la acción 'sample'.
+        exceeded (bool): Si el presupuesto está superado.
+    """
+
+    ACTIONS = ('abort', 'sample')
+
+    def __init__(self, max_invalid_ratio: float, window: int = 1000, min_records: int | None = None, action: str = 'abort', sample_rate: float = 0.01):
+        """Inicializa el presupuesto sin registros observados"""
+        if not 0 <= max_invalid_ratio <= 1:
+            raise Exception("La proporción máxima de registros inválidos debe estar entre 0 y 1.")
+        if window <= 0:
+            raise Exception("La ventana debe ser mayor que cero.")
+        if action not in ErrorBudget.ACTIONS:
+            raise Exception(f"La acción debe ser una de {ErrorBudget.ACTIONS}.")
+        if not 0 < sample_rate <= 1:
+            raise Exception("La tasa de muestreo debe estar entre 0 (excluido) y 1.")
+        self.max_invalid_ratio = max_invalid_ratio
+        self.window = window
+        self.min_records = window if min_records is None else min_records
+        self.action = action
+        self.sample_rate = sample_rate
+        self._interval = max(1, round(1 / sample_rate))
+        self.reset()
+
+    def reset(self):
+        """Reinicia los contadores y vuelve a habilitar la validación completa."""
+        self.records = 0
+        self.invalid = 0
+        self.skipped = 0
+        self.exceeded = False
+        self._recent = deque(maxlen=self.window)
+        self._recent_invalid = 0
+        self._countdown = self._interval
+
+    def observe(self, invalid: bool):
+        """
+        Registra el resultado de un registro validado y evalúa el presupuesto.
+
+        Args:
+            invalid (bool): Si el registro tiene logs.
+        """
+        self.records += 1
+        recent = self._recent
+        if len(recent) == self.window:
+            self._recent_invalid -= recent[0]
+        recent.append(invalid)
+        if invalid:
+            self.invalid += 1
+            self._recent_invalid += 1
+            if not self.exceeded and self.records >= self.min_records and self._recent_invalid > self.max_invalid_ratio * len(recent):
+                self.exceeded = True
+
+    def sample(self) -> bool:
+        """
+        Indica si el registro siguiente se valida cuando el presupuesto está superado con la acción 'sample'.
+
+        Returns:
+            bool: True si el registro se valida, False si se entrega sin validar.
+        """
+        self._countdown -= 1
+        if self._countdown:
+            self.skipped += 1
+            return False
+        self._countdown = self._interval
+        return True
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve el estado del presupuesto.
+
+        Returns:
+            dict[str, any]: Registros validados, inválidos y sin validar, proporción reciente de inválidos y si está superado.
+        """
+        return {
+            "records": self.records,
+            "invalid": self.invalid,
+            "skipped": self.skipped,
+            "recent_invalid_ratio": self._recent_invalid / len(self._recent) if self._recent else 0.0,
+            "exceeded": self.exceeded,
+        }
@@ -0,0 +1,175 @@
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Hashable, Iterable
+
+class LRUCache:
+    """
+    Caché acotada y segura entre hilos, con contadores de aciertos, fallos y desalojos.
+
+    Attributes:
+        maxsize (int): Cantidad máxima de entradas.
+        policy (str): Política de desalojo: 'lru' (la usada hace más tiempo) o 'fifo' (la insertada hace más tiempo).
+        ttl (float | None): Segundos que vive cada entrada desde que se guarda, o None si no vencen.
+        hits (int): Cantidad de búsquedas encontradas en la caché.
+        misses (int): Cantidad de búsquedas no encontradas en la caché (incluidas las vencidas).
+        evictions (int): Cantidad de entradas desalojadas por falta de espacio.
+        expirations (int): Cantidad de entradas descartadas por vencidas.
+    """
+
+    POLICIES = ('lru', 'fifo')
+
+    def __init__(self, maxsize: int, policy: str = 'lru', ttl: float | None = None):
+        """Inicializa la caché vacía"""
+        if maxsize <= 0:
+            raise Exception("El tamaño máximo de la caché debe ser mayor que cero.")
+        if policy not in LRUCache.POLICIES:
+            raise Exception(f"La política de desalojo debe ser una de {LRUCache.POLICIES}.")
+        if ttl is not None and ttl <= 0:
+            raise Exception("El tiempo de vida de las entradas debe ser mayor que cero.")
+        self.maxsize = maxsize
+        self.policy = policy
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+        self._data = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, key: Hashable, default: any = None) -> any:
+        """
+        Busca una entrada en la caché.
+
+        Args:
+            key (Hashable): Clave de la entrada.
+            default (any): Valor devuelto si la clave no está en la caché. Por defecto es None.
+
+        Returns:
+            any: El valor guardado o default.
+        """
+        with self._lock:
+            try:
+                value = self._data[key]
+            except KeyError:
+                self.misses += 1
+                return default
+            # Con tiempo de vida, cada entrada guarda el valor junto con el instante en que vence
+            if self.ttl is not None:
+                value, expires = value
+                if expires <= time.monotonic():
+                    del self._data[key]
+                    self.expirations += 1
+                    self.misses += 1
+                    return default
+            self.hits += 1
+            # Con LRU la entrada pasa a ser la usada más recientemente
+            if self.policy == 'lru':
+                self._data.move_to_end(key)
+            return value
+
+    def put(self, key: Hashable, value: any):
+        """
+        Guarda una entrada en la caché, desalojando la más antigua según la política si no hay espacio.
+
+        Args:
+            key (Hashable): Clave de la entrada.
+            value (any): Valor a guardar.
+        """
+        if self.ttl is not None:
+            value = (value, time.monotonic() + self.ttl)
+        with self._lock:
+            if key in self._data:
+                self._data[key] = value
+                if self.policy == 'lru':
+                    self._data.move_to_end(key)
+                return
+            if len(self._data) >= self.maxsize:
+                self._data.popitem(last=False)
+                self.evictions += 1
+            self._data[key] = value
+
+    def get_many(self, keys: Iterable[Hashable]) -> dict[Hashable, any]:
+        """
+        Busca varias entradas en la caché con un solo bloqueo, por ejemplo las claves de un lote de registros.
+
+        Args:
+            keys (Iterable[Hashable]): Claves de las entradas, sin repetir.
+
+        Returns:
+            dict[Hashable, any]: Valor guardado de cada clave encontrada (las no encontradas no aparecen).
+        """
+        found = dict()
+        data = self._data
+        now = time.monotonic() if self.ttl is not None else None
+        with self._lock:
+            for key in keys:
+                try:
+                    value = data[key]
+                except KeyError:
+                    self.misses += 1
+                    continue
+                if now is not None:
+                    value, expires = value
+                    if expires <= now:
+                        del data[key]
+                        self.expirations += 1
+                        self.misses += 1
+                        continue
+                self.hits += 1
+                if self.policy == 'lru':
+                    data.move_to_end(key)
+                found[key] = value
+        return found
+
+    def put_many(self, items: Iterable[tuple[Hashable, any]]):
+        """
+        Guarda varias entradas en la caché con un solo bloqueo, desalojando las más antiguas según la política.
+
+        Args:
+            items (Iterable[tuple[Hashable, any]]): Pares (clave, valor) a guardar.
+        """
+        data = self._data
+        expires = time.monotonic() + self.ttl if self.ttl is not None else None
+        with self._lock:
+            for key, value in items:
+                if expires is not None:
+                    value = (value, expires)
+                if key in data:
+                    data[key] = value
+                    if self.policy == 'lru':
+                        data.move_to_end(key)
+                    continue
+                if len(data) >= self.maxsize:
+                    data.popitem(last=False)
+                    self.evictions += 1
+                data[key] = value
+
+    def clear(self):
+        """Elimina todas las entradas de la caché, conservando los contadores."""
+        with self._lock:
+            self._data.clear()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve las estadísticas de la caché para dimensionarla.
+
+        Returns:
+            dict[str, any]: Aciertos, fallos, desalojos, tamaño actual, tamaño máximo, política y tasa de aciertos.
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "expirations": self.expirations,
+                "size": len(self._data),
+                "maxsize": self.maxsize,
+                "policy": self.policy,
+                "ttl": self.ttl,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
@@ -0,0 +1,156 @@
+import json
+import os
+import time
+from collections.abc import Mapping
+from hashlib import blake2b
+from types import CodeType
+
+# Versión del formato del archivo de estado
+STATE_VERSION = 1
+
+
+class Checkpoint:
+    """
+    Archivo de estado de un procesamiento reanudable (ver RecordContextManager.process_jsonl).
+
+    Guarda cada every registros o cada interval segundos (lo que ocurra primero) la posición en bytes del archivo de
+    entrada hasta la que se procesaron los registros, el número de línea, los contadores, la huella de la configuración
+    de operaciones (ver config_fingerprint) y la posición confirmada de los destinos (ver Sink.commit).
+
+    El archivo se reemplaza de forma atómica: se escribe un archivo temporal en el mismo directorio, se graba en el disco
+    (os.fsync) y se renombra sobre el anterior con os.replace, por lo que una interrupción en cualquier momento deja el
+    estado anterior o el nuevo completos, nunca uno a medias.
+
+    Attributes:
+        path (str): Ruta del archivo de estado.
+        every (int): Cantidad de registros entre puntos de control. Por defecto es 10000.
+        interval (float): Segundos máximos entre puntos de control. Por defecto es 60.
+        saves (int): Cantidad de puntos de control guardados por esta instancia.
+    """
+
+    def __init__(self, path: str, every: int = 10_000, interval: float = 60.0):
+        """Inicializa el punto de control sin leer ni escribir el archivo"""
+        if every <= 0 or interval <= 0:
+            raise Exception("La cantidad de registros y el intervalo entre puntos de control deben ser mayores que cero.")
+        self.path = path
+        self.every = every
+        self.interval = interval
+        self.saves = 0
+
+    def load(self) -> dict[str, any] | None:
+        """
+        Lee el último estado guardado.
+
+        Returns:
+            dict[str, any] | None: El estado, o None si el archivo no existe.
+        """
+        try:
+            with open(self.path, 'r', encoding='utf-8') as file:
+                state = json.load(file)
+        except FileNotFoundError:
+            return None
+        if not isinstance(state, dict) or state.get("version") != STATE_VERSION:
+            raise Exception(f"El archivo de estado {self.path} no tiene un formato válido.")
+        return state
+
+    def save(self, state: dict[str, any]):
+        """
+        Guarda un estado de forma atómica.
+
+        Args:
+            state (dict[str, any]): Estado serializable a JSON.
+        """
+        state = dict(state, version=STATE_VERSION, saved_at=time.time())
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            json.dump(state, file, ensure_ascii=False, separators=(',', ':'))
+            file.flush()
+            os.fsync(file.fileno())
+        os.replace(temporary, self.path)
+        _fsync_directory(os.path.dirname(os.path.abspath(self.path)))
+        self.saves += 1
+
+    def clear(self):
+        """Elimina el archivo de estado, para que el siguiente procesamiento empiece desde el comienzo."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def config_fingerprint(operations: Mapping[str, list], stop_on: str | None = None) -> str:
+    """
+    Calcula la huella de la configuración de operaciones de todos los tipos de registro, estable entre procesos.
+
+    A diferencia de chain_fingerprint (que solo es válida dentro del proceso), las funciones se identifican por su
+    módulo, su nombre y un hash de su código, y los objetos por los argumentos con los que se reconstruyen (__reduce__),
+    por lo que la huella es la misma al volver a ejecutar el mismo programa y cambia si cambian los tipos de registro,
+    las operaciones, su orden, sus parámetros o el código de sus condiciones.
+
+    Args:
+        operations (Mapping[str, list[Operation]]): Operaciones por tipo de registro (por ejemplo, ConfigSnapshot.operations).
+        stop_on (str | None): Nivel de log que detiene las cadenas, ya que también cambia el resultado.
+
+    Returns:
+        str: Huella hexadecimal de la configuración.
+    """
+    description = _stable_repr((stop_on, {record_type: list(chain) for record_type, chain in operations.items()}))
+    return blake2b(description.encode('utf-8', errors='surrogatepass'), digest_size=16).hexdigest()
+
+
+def _stable_repr(value: any) -> str:
+    """Representación de un valor que no depende de direcciones de memoria ni del orden de los conjuntos."""
+    if value is None or isinstance(value, (str, bytes, bool, int, float)):
+        return repr(value)
+    if isinstance(value, (list, tuple)):
+        return f"{type(value).__name__}[{','.join(map(_stable_repr, value))}]"
+    if isinstance(value, (set, frozenset)):
+        return f"{type(value).__name__}[{','.join(sorted(map(_stable_repr, value)))}]"
+    if isinstance(value, Mapping):
+        items = sorted((_stable_repr(key), _stable_repr(item)) for key, item in value.items())
+        return f"{{{','.join(f'{key}:{item}' for key, item in items)}}}"
+    if isinstance(value, type):
+        return f"{value.__module__}.{value.__qualname__}"
+    if isinstance(value, CodeType):
+        return _code_digest(value)
+    code = getattr(value, '__code__', None)
+    if isinstance(code, CodeType):
+        # Funciones y lambdas: nombre, código y valores de las variables capturadas y por defecto
+        closure = [cell.cell_contents for cell in value.__closure__ or ()]
+        return f"{value.__module__}.{value.__qualname__}<{_code_digest(code)}>{_stable_repr((closure, value.__defaults__))}"
+    name = f"{type(value).__module__}.{type(value).__qualname__}"
+    parameters = getattr(value, 'parameters', None)
+    if isinstance(parameters, Mapping):
+        # Operaciones: clase y parámetros
+        return f"{name}{_stable_repr(parameters)}"
+    try:
+        reduced = value.__reduce_ex__(2)
+    except Exception:
+        reduced = None
+    if isinstance(reduced, str):
+        # Funciones de C y otros objetos globales se serializan por su nombre
+        return f"{getattr(value, '__module__', None)}.{reduced}"
+    if isinstance(reduced, tuple):
+        return f"{name}{_stable_repr(reduced[1:3])}"
+    return f"{name}{_stable_repr({key: item for key, item in vars(value).items() if not key.startswith('_')})}"
+
+
+def _code_digest(code: CodeType) -> str:
+    """Hash del código de una función, incluido el de las funciones anidadas."""
+    consts = [_code_digest(const) if isinstance(const, CodeType) else repr(const) for const in code.co_consts]
+    description = repr((code.co_code, code.co_names, consts))
+    return blake2b(description.encode('utf-8', errors='surrogatepass'), digest_size=8).hexdigest()
+
+
+def _fsync_directory(directory: str):
+    """Graba en el disco la entrada del directorio (el renombrado), donde el sistema operativo lo permite."""
+    try:
+        descriptor = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(descriptor)
+    except OSError:
+        pass
+    finally:
+        os.close(descriptor)
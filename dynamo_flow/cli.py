@@ -0,0 +1,136 @@
+import argparse
+import importlib
+import sys
+from contextlib import ExitStack
+from typing import TextIO
+from .budget import ErrorBudget, ErrorBudgetExceeded
+from . import registry
+from .checkpoint import Checkpoint
+from .record_context_manager import RecordContextManager
+from .sinks import FileSink, JsonlSink, CsvSink, RoutingSink
+from .streams.jsonl import BUFFER_SIZE
+
+
+def load_manager(config: str | None) -> RecordContextManager:
+    """
+    Crea el RecordContextManager a usar a partir de una referencia 'paquete.modulo:objeto'.
+
+    El objeto puede ser un RecordContextManager, un diccionario de operaciones por tipo de registro,
+    o una función sin argumentos que devuelva cualquiera de los dos.
+
+    Args:
+        config (str | None): Referencia al objeto de configuración. Si es None se usa un RecordContextManager vacío.
+
+    Returns:
+        RecordContextManager: Gestor de registros configurado.
+    """
+    if config is None:
+        return RecordContextManager()
+    module_name, _, attribute = config.partition(':')
+    if not attribute:
+        raise Exception("La configuración debe tener el formato 'paquete.modulo:objeto'.")
+    value = getattr(importlib.import_module(module_name), attribute)
+    if callable(value) and not isinstance(value, RecordContextManager):
+        value = value()
+    if isinstance(value, RecordContextManager):
+        return value
+    if isinstance(value, dict):
+        return RecordContextManager(value)
+    raise Exception("La configuración debe ser un RecordContextManager o un diccionario de operaciones por tipo de registro.")
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Procesa un archivo JSON Lines (o la entrada estándar) con RecordContextManager.process_jsonl.
+
+    Los registros válidos se escriben en la salida y los inválidos, junto con sus logs y la línea de origen,
+    en el flujo de errores (ver sinks.RoutingSink). La lectura es línea a línea con un búfer grande y la escritura
+    es por lotes desde hilos en segundo plano con colas acotadas, por lo que la memoria usada no depende del tamaño
+    del archivo. Con --checkpoint se guardan puntos de control y, si el archivo de estado existe, se continúa desde
+    el último.
+    """
+    record_manager = load_manager(args.config)
+    if args.mode == 'default':
+        # Las operaciones por defecto incluyen los tipos de registro de los paquetes instalados (entry points)
+        registry.record_types.load_entry_points()
+    error_budget = None
+    if args.max_invalid_ratio is not None:
+        error_budget = ErrorBudget(args.max_invalid_ratio, window=args.budget_window, action=args.budget_action)
+    if args.format == 'csv' and not args.fields:
+        # Sin columnas fijas, los registros con campos distintos de los del primero (por ejemplo, de otro tipo de
+        # registro) no cabrían en el archivo
+        raise Exception("Con --format csv se deben indicar las columnas con --fields.")
+    checkpoint = None
+    if args.checkpoint is not None:
+        if args.input == '-' or args.output in (None, '-') or args.errors in (None, '-'):
+            raise Exception("Con --checkpoint la entrada, --output y --errors deben ser archivos.")
+        checkpoint = Checkpoint(args.checkpoint, every=args.checkpoint_every, interval=args.checkpoint_interval)
+    status = 0
+    with ExitStack() as stack:
+        if args.input == '-':
+            source = stack.enter_context(open(sys.stdin.fileno(), 'rb', buffering=BUFFER_SIZE, closefd=False))
+        else:
+            source = args.input
+        fields = args.fields.split(',') if args.fields else None
+        # Los destinos escriben desde un hilo en segundo plano, por lo que la escritura no detiene el procesamiento
+        output_sink = _open_sink(stack, args.output, sys.stdout, args.format, fields, args.max_bytes)
+        errors_sink = _open_sink(stack, args.errors, sys.stderr, 'jsonl', None, args.max_bytes)
+        sink = RoutingSink(output_sink, errors_sink)
+        try:
+            record_manager.process_jsonl(
+                source, sink, checkpoint=checkpoint, default=args.mode == 'default', stop_on=args.stop_on, error_budget=error_budget,
+            )
+        except ErrorBudgetExceeded as e:
+            print(e, file=sys.stderr)
+            status = 1
+
+    print(
+        f"Registros válidos: {sink.valid_count}, inválidos: {sink.invalid_count}, líneas ilegibles: {sink.rejected_count}",
+        file=sys.stderr,
+    )
+    return status
+
+
+def _open_sink(stack: ExitStack, path: str | None, default: TextIO, output_format: str, fields: list[str] | None, max_bytes: int | None) -> FileSink:
+    """Crea el destino de un archivo, o del flujo estándar indicado si path es None o '-', y lo agrega a stack para cerrarlo al terminar."""
+    sink_class = CsvSink if output_format == 'csv' else JsonlSink
+    options = {"fields": fields} if output_format == 'csv' else dict()
+    if path is None or path == '-':
+        target = stack.enter_context(open(default.fileno(), 'wb', buffering=BUFFER_SIZE, closefd=False))
+    else:
+        target = path
+        options["max_bytes"] = max_bytes
+    return stack.enter_context(sink_class(target, **options))
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m dynamo_flow', description='Procesamiento de registros con DynamoFlow.')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', help='Procesa un archivo JSON Lines.')
+    run_parser.add_argument('input', help="Archivo JSON Lines de entrada, o '-' para la entrada estándar.")
+    run_parser.add_argument('-o', '--output', help='Archivo donde se escriben los registros válidos. Por defecto la salida estándar.')
+    run_parser.add_argument('-e', '--errors', help='Archivo donde se escriben los registros inválidos y sus logs. Por defecto la salida de errores.')
+    run_parser.add_argument('--format', choices=('jsonl', 'csv'), default='jsonl', help='Formato de los registros válidos. Los inválidos siempre se escriben como JSON Lines.')
+    run_parser.add_argument('--fields', help='Columnas de la salida CSV separadas por comas (obligatorio con --format csv).')
+    run_parser.add_argument('--max-bytes', type=int, help='Tamaño máximo de cada archivo de salida: al superarlo se continúa en un archivo numerado nuevo.')
+    run_parser.add_argument('--mode', choices=('default', 'registered'), default='default',
+                            help="'default' aplica las operaciones por defecto; 'registered' las registradas en --config.")
+    run_parser.add_argument('--config', help="Configuración de operaciones con el formato 'paquete.modulo:objeto'.")
+    run_parser.add_argument('--stop-on', choices=('ERROR', 'WARNING'),
+                            help='Detiene las operaciones de cada registro en el primer log de ese nivel (o superior).')
+    run_parser.add_argument('--max-invalid-ratio', type=float,
+                            help='Presupuesto de errores: proporción máxima de registros inválidos en la ventana.')
+    run_parser.add_argument('--budget-window', type=int, default=1000, help='Registros recientes sobre los que se evalúa el presupuesto.')
+    run_parser.add_argument('--budget-action', choices=ErrorBudget.ACTIONS, default='abort',
+                            help="Al superar el presupuesto: 'abort' detiene el proceso; 'sample' solo valida una muestra de los registros.")
+    run_parser.add_argument('--checkpoint', help='Archivo de estado para reanudar el procesamiento si se interrumpe (requiere --output y --errors).')
+    run_parser.add_argument('--checkpoint-every', type=int, default=10_000, help='Registros entre puntos de control.')
+    run_parser.add_argument('--checkpoint-interval', type=float, default=60.0, help='Segundos máximos entre puntos de control.')
+    run_parser.set_defaults(handler=run)
+    return parser
+
+
+def main(argv: list[str] | None = None) -> int:
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
@@ -0,0 +1,144 @@
+from types import MappingProxyType
+from typing import Iterable, Mapping
+from .operations import compile_pipeline
+from .operations import compile_async_pipeline
+from .operations import compile_batch_pipeline
+from .operations import compile_prefetch_pipeline
+from .operations.operation import Operation
+from .operations.pipeline import STOP_LEVELS
+
+class CompiledChain:
+    """
+    Lista de operaciones de un tipo de registro junto con todas sus cadenas compiladas.
+
+    Expone los mismos atributos que las clases de records con operaciones por defecto (OrderEventRecord, ...),
+    por lo que ConfigSnapshot trata de la misma forma a ambas.
+
+    Attributes:
+        pipeline (Callable[[dict[str, any]], tuple[dict[str, any], list]]): Operaciones compiladas en una única función.
+        async_pipeline (Callable | None): Operaciones compiladas en una corrutina, o None si todas son síncronas.
+        fail_fast_pipelines (dict[str, Callable]): Cadenas que se cortan en el primer log, por nivel de stop_on.
+        batch_pipeline (Callable[[list[dict[str, any]]], list[tuple[dict[str, any], list]]]): Operaciones compiladas para lotes.
+        prefetch_pipeline (Callable[[list[dict[str, any]]], None] | None): Precarga de las operaciones por ventana de
+            registros, o None si ninguna operación precarga.
+    """
+
+    __slots__ = ('_operations', 'pipeline', 'async_pipeline', 'fail_fast_pipelines', 'batch_pipeline', 'prefetch_pipeline')
+
+    def __init__(self, operations: Iterable[Operation]):
+        """Compila las operaciones una sola vez"""
+        self._operations = tuple(operations)
+        self.pipeline = compile_pipeline(self._operations)
+        self.async_pipeline = compile_async_pipeline(self._operations)
+        self.fail_fast_pipelines = {level: compile_pipeline(self._operations, stop_on=level) for level in STOP_LEVELS}
+        self.batch_pipeline = compile_batch_pipeline(self._operations)
+        self.prefetch_pipeline = compile_prefetch_pipeline(self._operations)
+
+    def get_operations(self) -> list[Operation]:
+        """
+        Devuelve una copia de la lista de operaciones.
+
+        Returns:
+            list[Operation]: Lista de operaciones.
+        """
+        return list(self._operations)
+
+
+class ConfigSnapshot:
+    """
+    Instantánea inmutable de la configuración de operaciones por tipo de registro, con sus cadenas ya compiladas.
+
+    Cada flujo toma la instantánea vigente al iniciarse y la usa hasta terminar sin ningún bloqueo. Los cambios de
+    configuración no modifican una instantánea: construyen una nueva (with_chain, without) que reemplaza a la anterior
+    con una sola asignación, por lo que los flujos en curso en otros hilos nunca ven una configuración a medio
+    actualizar (copia en escritura).
+
+    Attributes:
+        operations (Mapping[str, tuple[Operation, ...]]): Operaciones por tipo de registro.
+        pipelines (Mapping[str, Callable]): Tabla de despacho de las cadenas compiladas por tipo de registro.
+        async_pipelines (Mapping[str, Callable | None]): Tabla de despacho de las cadenas asíncronas (None si son síncronas).
+        batch_pipelines (Mapping[str, Callable]): Tabla de despacho de las cadenas compiladas para lotes.
+        prefetch_pipelines (Mapping[str, Callable]): Precarga por ventana de registros de los tipos de registro que
+            tienen alguna operación que precarga (los demás no aparecen).
+        fail_fast_pipelines (Mapping[str, Mapping[str, Callable]]): Por nivel de stop_on, tabla de despacho de las
+            cadenas que se cortan en el primer log de ese nivel.
+    """
+
+    __slots__ = ('_chains', 'operations', 'pipelines', 'async_pipelines', 'batch_pipelines', 'prefetch_pipelines', 'fail_fast_pipelines')
+
+    def __init__(self, chains: Mapping[str, CompiledChain] | None = None):
+        """
+        Arma las tablas de despacho a partir de las cadenas compiladas de cada tipo de registro.
+
+        Args:
+            chains (Mapping[str, CompiledChain] | None): Cadenas compiladas (o records con operaciones por defecto)
+                por tipo de registro. Las cadenas no deben modificarse después de crear la instantánea.
+        """
+        self._chains = dict(chains or dict())
+        items = self._chains.items()
+        self.operations = MappingProxyType({record_type: tuple(chain.get_operations()) for record_type, chain in items})
+        self.pipelines = MappingProxyType({record_type: chain.pipeline for record_type, chain in items})
+        self.async_pipelines = MappingProxyType({record_type: chain.async_pipeline for record_type, chain in items})
+        self.batch_pipelines = MappingProxyType({record_type: chain.batch_pipeline for record_type, chain in items})
+        self.prefetch_pipelines = MappingProxyType({
+            record_type: chain.prefetch_pipeline for record_type, chain in items if chain.prefetch_pipeline is not None
+        })
+        self.fail_fast_pipelines = MappingProxyType({
+            level: MappingProxyType({record_type: chain.fail_fast_pipelines[level] for record_type, chain in items})
+            for level in STOP_LEVELS
+        })
+
+    @classmethod
+    def compile(cls, record_config: Mapping[str, Iterable[Operation]]) -> 'ConfigSnapshot':
+        """
+        Compila una configuración de operaciones por tipo de registro.
+
+        Args:
+            record_config (Mapping[str, Iterable[Operation]]): Operaciones por tipo de registro.
+
+        Returns:
+            ConfigSnapshot: Instantánea con las cadenas compiladas.
+        """
+        return cls({record_type: CompiledChain(operations) for record_type, operations in record_config.items()})
+
+    def with_chain(self, record_type: str, chain: CompiledChain) -> 'ConfigSnapshot':
+        """
+        Devuelve una instantánea nueva con la cadena de un tipo de registro agregada o reemplazada.
+
+        Args:
+            record_type (str): Tipo de registro.
+            chain (CompiledChain): Cadena compilada (o record con operaciones por defecto).
+
+        Returns:
+            ConfigSnapshot: Instantánea nueva; la actual no cambia.
+        """
+        return type(self)({**self._chains, record_type: chain})
+
+    def without(self, record_type: str) -> 'ConfigSnapshot':
+        """
+        Devuelve una instantánea nueva sin el tipo de registro.
+
+        Args:
+            record_type (str): Tipo de registro.
+
+        Returns:
+            ConfigSnapshot: Instantánea nueva; la actual no cambia.
+        """
+        chains = dict(self._chains)
+        del chains[record_type]
+        return type(self)(chains)
+
+    def chain(self, record_type: str) -> CompiledChain | None:
+        """
+        Devuelve la cadena compilada de un tipo de registro.
+
+        Args:
+            record_type (str): Tipo de registro.
+
+        Returns:
+            CompiledChain | None: Cadena compilada (o record con operaciones por defecto), o None si el tipo no existe.
+        """
+        return self._chains.get(record_type)
+
+    def __contains__(self, record_type: str) -> bool:
+        return record_type in self._chains
@@ -0,0 +1,372 @@
+import math
+import time
+from array import array
+from collections import OrderedDict
+from threading import Lock
+from typing import Callable, Generator, Hashable, Iterable, Mapping
+from .logs import LogEntry, WARNING, DUPLICATE_RECORD
+
+# Constantes del mezclador de splitmix64, que reparte cada bit de hash() en los 64 bits del resultado (hash de un
+# entero es el mismo entero: sin mezclar, las claves múltiplos de una potencia de 2 comparten sus bits bajos)
+_MIX_1 = 0xBF58476D1CE4E5B9
+_MIX_2 = 0x94D049BB133111EB
+_MASK_64 = (1 << 64) - 1
+
+
+class FingerprintFilter:
+    """
+    Conjunto aproximado de claves de tamaño fijo, sin falsos negativos.
+
+    Guarda una huella (fingerprint) de pocos bits de cada clave en una tabla con sondeo lineal, como un filtro
+    cuckoo pero buscando el siguiente lugar libre en lugar de reubicar huellas: revisar y agregar una clave cuesta un
+    hash() mezclado con splitmix64 y, en promedio, menos de dos comparaciones, también con claves enteras que
+    comparten sus bits bajos (por ejemplo, múltiplos de 1024). La tabla tiene al menos 2 * capacity lugares y el tamaño de la
+    huella se elige según error_rate (8, 16 o 32 bits), por lo que mientras tenga hasta capacity claves una clave
+    nueva parece estar en el filtro con probabilidad de a lo sumo error_rate. Por ejemplo, un millón de claves con
+    error_rate=0.001 ocupan 4 MB.
+
+    Las huellas se calculan con hash(), que para los textos cambia entre procesos: el filtro solo es válido dentro
+    del proceso.
+
+    Attributes:
+        capacity (int): Cantidad de claves distintas para la que se dimensiona el filtro.
+        error_rate (float): Probabilidad máxima de falsos positivos con capacity claves.
+        count (int): Cantidad de claves agregadas que no estaban en el filtro.
+    """
+
+    __slots__ = ('capacity', 'error_rate', 'count', '_table', '_mask', '_shift')
+
+    def __init__(self, capacity: int, error_rate: float = 0.001):
+        """Inicializa el filtro vacío"""
+        if capacity <= 0:
+            raise Exception("La capacidad del filtro debe ser mayor que cero.")
+        if not 2 ** -31 <= error_rate < 1:
+            raise Exception("La probabilidad de falsos positivos debe estar entre 2**-31 y 1.")
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.count = 0
+        # Con la tabla llena hasta la mitad, buscar una clave nueva compara su huella con menos de 2 huellas en promedio
+        bits = math.ceil(math.log2(2 / error_rate))
+        typecode = next(code for code in 'BHI' if array(code).itemsize * 8 >= bits)
+        slots = 1 << max(3, (2 * capacity - 1).bit_length())
+        self._table = array(typecode, bytes(slots * array(typecode).itemsize))
+        self._mask = slots - 1
+        self._shift = 64 - array(typecode).itemsize * 8
+
+    def add(self, key: Hashable) -> bool:
+        """
+        Agrega una clave al filtro.
+
+        Args:
+            key (Hashable): Clave a agregar.
+
+        Returns:
+            bool: True si la clave ya estaba (o es un falso positivo), False si es nueva.
+        """
+        if self.count >= self._mask:
+            raise Exception("El filtro de huellas está lleno.")
+        mixed = hash(key) & _MASK_64
+        mixed = (mixed ^ mixed >> 30) * _MIX_1 & _MASK_64
+        mixed = (mixed ^ mixed >> 27) * _MIX_2 & _MASK_64
+        mixed ^= mixed >> 31
+        # La huella sale de los bits altos y la posición de los bajos; 0 marca un lugar vacío
+        fingerprint = mixed >> self._shift or 1
+        table = self._table
+        mask = self._mask
+        index = mixed & mask
+        while True:
+            slot = table[index]
+            if slot == fingerprint:
+                return True
+            if not slot:
+                table[index] = fingerprint
+                self.count += 1
+                return False
+            index = (index + 1) & mask
+
+    def __contains__(self, key: Hashable) -> bool:
+        mixed = hash(key) & _MASK_64
+        mixed = (mixed ^ mixed >> 30) * _MIX_1 & _MASK_64
+        mixed = (mixed ^ mixed >> 27) * _MIX_2 & _MASK_64
+        mixed ^= mixed >> 31
+        fingerprint = mixed >> self._shift or 1
+        table = self._table
+        mask = self._mask
+        index = mixed & mask
+        while True:
+            slot = table[index]
+            if slot == fingerprint:
+                return True
+            if not slot:
+                return False
+            index = (index + 1) & mask
+
+    def clear(self):
+        """Elimina todas las claves del filtro."""
+        self._table = array(self._table.typecode, bytes(len(self._table) * self._table.itemsize))
+        self.count = 0
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria usada por la tabla del filtro, en bytes."""
+        return len(self._table) * self._table.itemsize
+
+
+class _TypeKeys:
+    """Claves vistas y contadores de un tipo de registro de Deduplicator."""
+
+    __slots__ = ('fields', 'checked', 'duplicates', 'seen', 'current', 'previous', 'rotated')
+
+    def __init__(self, fields: tuple[str, ...]):
+        self.fields = fields
+        self.checked = 0
+        self.duplicates = 0
+        # Modo 'exact': clave -> instante en que vence (o None sin ttl), de la usada hace más tiempo a la más reciente
+        self.seen = OrderedDict()
+        # Modo 'approximate': filtro actual y anterior, e instante de la última rotación
+        self.current = None
+        self.previous = None
+        self.rotated = time.monotonic()
+
+
+class Deduplicator:
+    """
+    Detecta los registros repetidos de un flujo por los valores de sus campos clave (por ejemplo, order_id), por tipo
+    de registro, con memoria acotada (ver RecordContextManager.enable_deduplication).
+
+    Un registro es repetido si ya se vio otro del mismo tipo con los mismos valores en sus campos clave. Los
+    registros de tipos sin campos clave, o con algún campo clave sin valor (o con un valor que no es hashable), nunca
+    son repetidos.
+
+    Modos:
+        'exact': guarda las claves vistas de cada tipo de registro en un conjunto LRU de a lo sumo maxsize claves
+            (las vistas hace más tiempo se olvidan) y, con ttl, cada clave se olvida ttl segundos después de verse
+            por primera vez. No tiene falsos positivos.
+        'approximate': guarda las claves de cada tipo de registro en dos filtros de huellas (ver FingerprintFilter)
+            de maxsize claves cada uno, con memoria fija en flujos sin fin: cuando el filtro actual se llena (o, con
+            ttl, pasan ttl segundos) el anterior se descarta y se empieza uno nuevo, por lo que se recuerdan al menos
+            las últimas maxsize claves distintas (o los últimos ttl segundos). Un registro nuevo puede marcarse como
+            repetido con probabilidad de hasta 2 * error_rate.
+
+    Acciones:
+        'flag': el registro repetido se entrega sin aplicar sus operaciones, con el log DUPLICATE_RECORD.
+        'drop': el registro repetido no se entrega.
+
+    Attributes:
+        keys (dict[str, tuple[str, ...]]): Campos clave por tipo de registro.
+        mode (str): 'exact' o 'approximate'.
+        action (str): 'flag' o 'drop'.
+        maxsize (int): Cantidad de claves recordadas por tipo de registro (por filtro en el modo 'approximate').
+        ttl (float | None): Segundos que se recuerda una clave, o None sin límite de tiempo.
+        error_rate (float): Probabilidad de falsos positivos de cada filtro en el modo 'approximate'.
+    """
+
+    MODES = ('exact', 'approximate')
+    ACTIONS = ('flag', 'drop')
+
+    def __init__(self, keys: Mapping[str, str | Iterable[str]], mode: str = 'exact', maxsize: int = 1_000_000, ttl: float | None = None, error_rate: float = 0.001, action: str = 'flag'):
+        """Inicializa el detector sin claves vistas"""
+        if mode not in Deduplicator.MODES:
+            raise Exception(f"El modo debe ser uno de {Deduplicator.MODES}.")
+        if action not in Deduplicator.ACTIONS:
+            raise Exception(f"La acción debe ser una de {Deduplicator.ACTIONS}.")
+        if maxsize <= 0:
+            raise Exception("La cantidad de claves recordadas debe ser mayor que cero.")
+        if ttl is not None and ttl <= 0:
+            raise Exception("El tiempo que se recuerda una clave debe ser mayor que cero.")
+        self.keys = {
+            record_type: (fields,) if isinstance(fields, str) else tuple(fields)
+            for record_type, fields in keys.items()
+        }
+        if not all(self.keys.values()):
+            raise Exception("Cada tipo de registro debe tener al menos un campo clave.")
+        self.mode = mode
+        self.action = action
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.error_rate = error_rate
+        self._types = {record_type: _TypeKeys(fields) for record_type, fields in self.keys.items()}
+        if mode == 'approximate':
+            for state in self._types.values():
+                state.current = FingerprintFilter(maxsize, error_rate)
+        # Revisar y agregar una clave es una sola operación: dos hilos no pueden ver la misma clave como nueva
+        self._lock = Lock()
+
+    def is_duplicate(self, record: Mapping[str, any]) -> bool:
+        """
+        Indica si un registro repite los campos clave de uno ya visto, y lo recuerda.
+
+        Args:
+            record (Mapping[str, any]): Registro sin procesar.
+
+        Returns:
+            bool: True si el registro es repetido.
+        """
+        state = self._types.get(record.get('__type__'))
+        if state is None:
+            return False
+        key = _record_key(record, state.fields)
+        return key is not None and self._check(state, key)
+
+    def wrap(self, record_type: str, pipeline: Callable[[dict[str, any]], tuple[dict[str, any], list]]) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+        """
+        Envuelve la cadena compilada de un tipo de registro para que los registros repetidos se entreguen con el log
+        DUPLICATE_RECORD sin ejecutar las operaciones.
+
+        Args:
+            record_type (str): Tipo de registro de la cadena.
+            pipeline (Callable[[dict[str, any]], tuple[dict[str, any], list]]): Cadena compilada.
+
+        Returns:
+            Callable[[dict[str, any]], tuple[dict[str, any], list]]: Cadena con el mismo contrato, o pipeline si el tipo
+            no tiene campos clave.
+        """
+        state = self._types.get(record_type)
+        if state is None:
+            return pipeline
+        check = self._check
+        fields = state.fields
+        # Los logs son de solo lectura: todos los registros repetidos del tipo comparten la misma entrada
+        entry = LogEntry(WARNING, DUPLICATE_RECORD, type(self).__name__, None, ', '.join(fields))
+
+        if len(fields) == 1:
+            # Con un solo campo clave la clave es su valor, sin crear una tupla por registro
+            field = fields[0]
+
+            def pipeline_with_deduplication(record: dict[str, any]) -> tuple[dict[str, any], list]:
+                key = record.get(field)
+                if key is not None and check(state, key):
+                    return record, [entry]
+                return pipeline(record)
+        else:
+            def pipeline_with_deduplication(record: dict[str, any]) -> tuple[dict[str, any], list]:
+                key = _record_key(record, fields)
+                if key is not None and check(state, key):
+                    return record, [entry]
+                return pipeline(record)
+
+        return pipeline_with_deduplication
+
+    @staticmethod
+    def drop_duplicates(results: Iterable[tuple[dict[str, any], list]]) -> Generator[tuple[dict[str, any], list], None, None]:
+        """
+        Descarta de los resultados de process_stream los registros marcados como repetidos.
+
+        Args:
+            results (Iterable[tuple[dict[str, any], list]]): Registros procesados con sus logs.
+
+        Returns:
+            Generator[tuple[dict[str, any], list], None, None]: Los resultados sin los registros repetidos.
+        """
+        for result in results:
+            logs = result[1]
+            if not logs or logs[0].code != DUPLICATE_RECORD:
+                yield result
+
+    def clear(self):
+        """Olvida las claves vistas, conservando los contadores."""
+        with self._lock:
+            for state in self._types.values():
+                state.seen.clear()
+                if state.current is not None:
+                    state.current.clear()
+                state.previous = None
+                state.rotated = time.monotonic()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve los contadores de registros repetidos.
+
+        Returns:
+            dict[str, any]: Modo, acción, registros revisados, repetidos y tasa de repetidos (en total y por tipo de
+            registro), claves recordadas y, en el modo 'approximate', memoria de los filtros en bytes.
+        """
+        with self._lock:
+            by_type = dict()
+            size = nbytes = 0
+            for record_type, state in self._types.items():
+                by_type[record_type] = {
+                    "checked": state.checked,
+                    "duplicates": state.duplicates,
+                    "duplicate_rate": state.duplicates / state.checked if state.checked else 0.0,
+                }
+                size += len(state.seen)
+                for fingerprints in (state.current, state.previous):
+                    if fingerprints is not None:
+                        size += fingerprints.count
+                        nbytes += fingerprints.nbytes
+        checked = sum(counts["checked"] for counts in by_type.values())
+        duplicates = sum(counts["duplicates"] for counts in by_type.values())
+        return {
+            "mode": self.mode,
+            "action": self.action,
+            "checked": checked,
+            "duplicates": duplicates,
+            "duplicate_rate": duplicates / checked if checked else 0.0,
+            "size": size,
+            "maxsize": self.maxsize,
+            "bytes": nbytes if self.mode == 'approximate' else None,
+            "by_type": by_type,
+        }
+
+    def _check(self, state: _TypeKeys, key: Hashable) -> bool:
+        """Revisa y recuerda la clave de un registro de un tipo con campos clave."""
+        with self._lock:
+            try:
+                if self.mode == 'exact':
+                    duplicate = self._check_exact(state.seen, key)
+                else:
+                    duplicate = self._check_approximate(state, key)
+            except TypeError:
+                # Un valor que no es hashable (por ejemplo, una lista) no identifica al registro
+                return False
+            state.checked += 1
+            if duplicate:
+                state.duplicates += 1
+            return duplicate
+
+    def _check_exact(self, seen: OrderedDict, key: Hashable) -> bool:
+        """Conjunto LRU de claves, con vencimiento opcional."""
+        ttl = self.ttl
+        if ttl is None:
+            if key in seen:
+                seen.move_to_end(key)
+                return True
+            seen[key] = None
+        else:
+            now = time.monotonic()
+            expires = seen.get(key)
+            if expires is not None and expires > now:
+                seen.move_to_end(key)
+                return True
+            seen[key] = now + ttl
+            seen.move_to_end(key)
+        if len(seen) > self.maxsize:
+            seen.popitem(last=False)
+        return False
+
+    def _check_approximate(self, state: _TypeKeys, key: Hashable) -> bool:
+        """Dos filtros de huellas que rotan cuando el actual se llena o vence."""
+        current = state.current
+        if current.count >= self.maxsize or (self.ttl is not None and time.monotonic() - state.rotated >= self.ttl):
+            # Se reutiliza la memoria del filtro descartado
+            previous = state.previous
+            if previous is None:
+                previous = FingerprintFilter(self.maxsize, self.error_rate)
+            else:
+                previous.clear()
+            state.previous, state.current = current, previous
+            current = previous
+            state.rotated = time.monotonic()
+        # La clave se agrega al filtro actual aunque esté en el anterior, para que no se olvide al rotar
+        if current.add(key):
+            return True
+        return state.previous is not None and key in state.previous
+
+
+def _record_key(record: Mapping[str, any], fields: tuple[str, ...]) -> Hashable | None:
+    """Clave de un registro: el valor de su campo clave, o la tupla de sus valores; None si falta alguno."""
+    if len(fields) == 1:
+        return record.get(fields[0])
+    values = tuple(record.get(field) for field in fields)
+    return None if None in values else values
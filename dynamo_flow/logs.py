@@ -0,0 +1,148 @@
+from collections.abc import Mapping
+from sys import intern
+from typing import Generator, Iterable, Iterator
+
+# Niveles de los logs
+WARNING = intern('WARNING')
+ERROR = intern('ERROR')
+
+# Códigos de los logs. Identifican la causa sin tener que comparar mensajes.
+INVALID_RECORD = intern('INVALID_RECORD')
+NO_OPERATIONS = intern('NO_OPERATIONS')
+FIELD_MISSING = intern('FIELD_MISSING')
+NOT_A_NUMBER = intern('NOT_A_NUMBER')
+CONVERSION_ERROR = intern('CONVERSION_ERROR')
+FIELD_REQUIRED = intern('FIELD_REQUIRED')
+CONDITION_FAILED = intern('CONDITION_FAILED')
+CONDITION_ERROR = intern('CONDITION_ERROR')
+INVALID_JSON = intern('INVALID_JSON')
+NOT_VALIDATED = intern('NOT_VALIDATED')
+REFERENCE_NOT_FOUND = intern('REFERENCE_NOT_FOUND')
+LOOKUP_ERROR = intern('LOOKUP_ERROR')
+INVALID_TIMESTAMP = intern('INVALID_TIMESTAMP')
+DUPLICATE_RECORD = intern('DUPLICATE_RECORD')
+
+# Plantilla del mensaje de cada código. {detail} es el detalle del log (por ejemplo, la excepción).
+MESSAGES = {
+    INVALID_RECORD: "El registro esta vacío o no tiene un formato valido.",
+    NO_OPERATIONS: "El registro no tiene operaciones asignadas.",
+    FIELD_MISSING: "El campo no existe.",
+    NOT_A_NUMBER: "El campo no es un número.",
+    CONVERSION_ERROR: "Error en la conversión: {detail}",
+    FIELD_REQUIRED: "El campo no está presente o es None.",
+    CONDITION_FAILED: "El campo no cumple la condición.",
+    CONDITION_ERROR: "Error al ejecutar la condición: {detail}",
+    INVALID_JSON: "La línea no es un registro JSON válido: {detail}",
+    NOT_VALIDATED: "El registro no se validó: se superó el presupuesto de errores del flujo.",
+    REFERENCE_NOT_FOUND: "El valor no existe en el catálogo de referencia.",
+    LOOKUP_ERROR: "Error al consultar el catálogo de referencia: {detail}",
+    INVALID_TIMESTAMP: "El campo no es una fecha y hora ISO 8601 válida.",
+    DUPLICATE_RECORD: "El registro está repetido: ya se recibió otro con los mismos valores de {detail}.",
+}
+
+
+class LogEntry(Mapping):
+    """
+    Advertencia o error producido al procesar un registro.
+
+    Es un objeto compacto (con __slots__) cuyo mensaje solo se genera cuando se lee. Se comporta como un diccionario
+    de solo lectura con las claves "type", "operation", "field" y "message" (operation y field solo si existen),
+    por lo que el código que usaba los logs como diccionarios sigue funcionando.
+
+    Attributes:
+        type (str): Nivel del log: 'WARNING' o 'ERROR'.
+        code (str): Código de la causa (ver las constantes de este módulo).
+        operation (str | None): Nombre de la operación que produjo el log.
+        field (str | None): Campo del registro al que se refiere el log.
+        detail (any): Detalle del mensaje, por ejemplo la excepción capturada.
+    """
+
+    __slots__ = ('type', 'code', 'operation', 'field', 'detail')
+
+    def __init__(self, type: str, code: str, operation: str | None = None, field: str | None = None, detail: any = None):
+        self.type = type
+        self.code = code
+        self.operation = operation
+        self.field = field
+        self.detail = detail
+
+    @property
+    def message(self) -> str:
+        """Mensaje legible del log, generado a partir del código y el detalle."""
+        return MESSAGES.get(self.code, "{detail}").format(detail=self.detail)
+
+    def to_dict(self) -> dict[str, any]:
+        """
+        Devuelve el log como diccionario, con la misma forma que los logs anteriores.
+
+        Returns:
+            dict[str, any]: Diccionario con las claves type, operation, field y message.
+        """
+        return dict(self.items())
+
+    def __getitem__(self, key: str) -> any:
+        if key == 'message':
+            return self.message
+        if key == 'type':
+            return self.type
+        if key == 'operation' and self.operation is not None:
+            return self.operation
+        if key == 'field' and self.field is not None:
+            return self.field
+        raise KeyError(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield 'type'
+        if self.operation is not None:
+            yield 'operation'
+        if self.field is not None:
+            yield 'field'
+        yield 'message'
+
+    def __len__(self) -> int:
+        return 2 + (self.operation is not None) + (self.field is not None)
+
+    def __repr__(self) -> str:
+        return repr(self.to_dict())
+
+    def __reduce__(self):
+        # La excepción del detalle puede no ser serializable: se envía su texto
+        detail = self.detail if self.detail is None or isinstance(self.detail, (str, int, float)) else str(self.detail)
+        return (LogEntry, (self.type, self.code, self.operation, self.field, detail))
+
+
+class _EmptyLogs(list):
+    """Lista de logs vacía y de solo lectura, compartida por todos los registros válidos."""
+
+    __slots__ = ()
+
+    def _read_only(self, *args, **kwargs):
+        raise TypeError("La lista de logs vacía compartida no se puede modificar.")
+
+    append = extend = insert = remove = pop = clear = sort = reverse = _read_only
+    __setitem__ = __delitem__ = __iadd__ = __imul__ = _read_only
+
+    def __reduce__(self):
+        return (_empty_logs, ())
+
+
+def _empty_logs() -> list:
+    return EMPTY_LOGS
+
+
+# Lista de logs de los registros sin advertencias ni errores
+EMPTY_LOGS = _EmptyLogs()
+
+
+def as_dict_logs(results: Iterable[tuple[dict[str, any], list]]) -> Generator[tuple[dict[str, any], list[dict[str, any]]], None, None]:
+    """
+    Vista de compatibilidad: convierte los logs de cada resultado de process_stream en diccionarios.
+
+    Args:
+        results (Iterable[tuple[dict[str, any], list]]): Resultados de process_stream (o de sus variantes).
+
+    Returns:
+        Generator: Generador con el registro y la lista de logs como diccionarios.
+    """
+    for record, logs in results:
+        yield record, [dict(entry) for entry in logs]
@@ -0,0 +1,303 @@
+import os
+import re
+from contextlib import contextmanager
+from queue import LifoQueue, Empty
+from threading import Lock
+from typing import Callable, Generator, Hashable, Iterable
+from .cache import LRUCache
+
+# Nombres de tabla y columna admitidos en las consultas (se interpolan en el SQL, no se pueden parametrizar)
+_IDENTIFIER = re.compile(r'^[A-Za-z_][A-Za-z0-9_]*(\.[A-Za-z_][A-Za-z0-9_]*)?$')
+
+# Estilos de parámetros de DB-API (PEP 249) admitidos
+PARAMSTYLES = ('qmark', 'numeric', 'named', 'format', 'pyformat')
+# Estilos cuyos parámetros se pasan como tupla (los demás, como diccionario)
+_POSITIONAL = frozenset(('qmark', 'numeric', 'format'))
+
+
+class ConnectionPool:
+    """
+    Pool pequeño y seguro entre hilos de conexiones DB-API (PEP 249).
+
+    Las conexiones se abren a medida que se necesitan, hasta size; si todas están en uso, acquire espera a que se
+    devuelva alguna. Las conexiones heredadas de otro proceso (por ejemplo, tras un fork de process_stream_parallel)
+    no se reutilizan: cada proceso abre las suyas.
+
+    Attributes:
+        connect (Callable[[], any]): Función que abre una conexión nueva.
+        size (int): Cantidad máxima de conexiones abiertas.
+    """
+
+    def __init__(self, connect: Callable[[], any], size: int = 4):
+        """Inicializa el pool sin conexiones abiertas"""
+        if size <= 0:
+            raise Exception("El tamaño del pool debe ser mayor que cero.")
+        self.connect = connect
+        self.size = size
+        self._lock = Lock()
+        self._reset()
+
+    def _reset(self):
+        """Descarta las conexiones (sin cerrarlas: pueden pertenecer a otro proceso)."""
+        self._pid = os.getpid()
+        self._idle = LifoQueue()
+        self._opened = 0
+
+    def get_connection(self) -> any:
+        """
+        Toma una conexión libre del pool, abriendo una nueva si hay lugar o esperando a que se libere alguna.
+        Debe devolverse con release.
+
+        Returns:
+            any: Conexión DB-API.
+        """
+        with self._lock:
+            if self._pid != os.getpid():
+                self._reset()
+            idle = self._idle
+            try:
+                return idle.get_nowait()
+            except Empty:
+                opening = self._opened < self.size
+                if opening:
+                    self._opened += 1
+        if not opening:
+            return idle.get()
+        try:
+            return self.connect()
+        except BaseException:
+            with self._lock:
+                self._opened -= 1
+            raise
+
+    def release(self, connection: any):
+        """
+        Devuelve al pool una conexión tomada con get_connection.
+
+        Args:
+            connection (any): Conexión DB-API.
+        """
+        self._idle.put(connection)
+
+    @contextmanager
+    def acquire(self) -> Generator[any, None, None]:
+        """
+        Toma una conexión del pool y la devuelve al terminar.
+
+        Returns:
+            Generator: Administrador de contexto que entrega la conexión.
+        """
+        connection = self.get_connection()
+        try:
+            yield connection
+        finally:
+            self.release(connection)
+
+    def close(self):
+        """Cierra las conexiones libres del pool."""
+        with self._lock:
+            if self._pid == os.getpid():
+                while True:
+                    try:
+                        self._idle.get_nowait().close()
+                    except Empty:
+                        break
+            self._reset()
+
+
+class ReferenceCatalog:
+    """
+    Catálogo de referencia en una tabla de una base de datos (SQLite o cualquier DB-API), para validar que un valor existe.
+
+    Las claves se resuelven de a muchas con consultas SELECT ... WHERE column IN (...), de a lo sumo
+    max_keys_per_query claves por consulta, a través de un pool de conexiones. Los resultados se guardan en dos cachés
+    acotadas: una de claves encontradas y otra de claves no encontradas, para que una ráfaga de valores inválidos no
+    desaloje a las claves válidas. La caché negativa puede tener un tiempo de vida, para aceptar las claves que se
+    agreguen al catálogo después.
+
+    Se puede serializar con pickle (por ejemplo, para process_stream_parallel con 'spawn' o 'forkserver') si database es una ruta o una
+    función de módulo: el catálogo se reconstruye con cachés vacías y sin conexiones.
+
+    Attributes:
+        database (str | Callable[[], any]): Ruta de una base SQLite, o función que abre una conexión DB-API.
+        table (str): Tabla del catálogo.
+        column (str): Columna con las claves.
+        paramstyle (str): Estilo de parámetros del módulo DB-API ('qmark' para sqlite3, 'format' o 'pyformat' para
+            psycopg y otros). Por defecto es 'qmark'.
+        max_keys_per_query (int): Cantidad máxima de claves por consulta. Por defecto es 500 (SQLite admite al menos 999
+            parámetros por consulta).
+        queries (int): Cantidad de consultas realizadas.
+        keys_queried (int): Cantidad de claves consultadas a la base de datos.
+    """
+
+    def __init__(
+            self,
+            database: str | Callable[[], any],
+            table: str,
+            column: str,
+            paramstyle: str = 'qmark',
+            pool_size: int = 4,
+            max_keys_per_query: int = 500,
+            cache_size: int = 100_000,
+            negative_cache_size: int | None = None,
+            negative_ttl: float | None = None,
+        ):
+        """Inicializa el catálogo sin conexiones abiertas y con las cachés vacías"""
+        if not _IDENTIFIER.match(table) or not _IDENTIFIER.match(column):
+            raise Exception("La tabla y la columna deben ser identificadores SQL simples.")
+        if paramstyle not in PARAMSTYLES:
+            raise Exception(f"El estilo de parámetros debe ser uno de {PARAMSTYLES}.")
+        if max_keys_per_query <= 0:
+            raise Exception("La cantidad de claves por consulta debe ser mayor que cero.")
+        self._args = (database, table, column, paramstyle, pool_size, max_keys_per_query, cache_size, negative_cache_size, negative_ttl)
+        self.database = database
+        self.table = table
+        self.column = column
+        self.paramstyle = paramstyle
+        self.max_keys_per_query = max_keys_per_query
+        self.queries = 0
+        self.keys_queried = 0
+        connect = _sqlite_connect(database) if isinstance(database, str) else database
+        self._pool = ConnectionPool(connect, pool_size)
+        self._found = LRUCache(cache_size)
+        self._missing = LRUCache(negative_cache_size or cache_size, ttl=negative_ttl)
+        self._stats_lock = Lock()
+        # Consultas ya armadas por cantidad de claves
+        self._sql = dict()
+
+    def contains(self, key: Hashable) -> bool:
+        """
+        Indica si una clave existe en el catálogo, consultando primero las cachés.
+
+        Args:
+            key (Hashable): Clave a buscar.
+
+        Returns:
+            bool: Si la clave existe.
+        """
+        if self._found.get(key, False):
+            return True
+        if self._missing.get(key, False):
+            return False
+        return key in self._query([key])
+
+    def resolve(self, keys: Iterable[any]) -> dict[Hashable, bool]:
+        """
+        Indica para cada clave si existe en el catálogo, consultando a la base de datos solo las que no están en caché.
+
+        Las claves repetidas se consultan una sola vez y las que no son hashables se ignoran (no aparecen en el resultado).
+
+        Args:
+            keys (Iterable[any]): Claves a buscar, por ejemplo los valores de un campo en un lote de registros.
+
+        Returns:
+            dict[Hashable, bool]: Si existe cada clave.
+        """
+        keys = list(keys)
+        try:
+            unique = list(dict.fromkeys(keys))
+        except TypeError:
+            unique = list(dict.fromkeys(key for key in keys if _is_hashable(key)))
+        resolved = dict.fromkeys(self._found.get_many(unique), True)
+        if len(resolved) < len(unique):
+            unknown = [key for key in unique if key not in resolved]
+            missing = self._missing.get_many(unknown)
+            resolved.update(dict.fromkeys(missing, False))
+            pending = [key for key in unknown if key not in missing]
+            for start in range(0, len(pending), self.max_keys_per_query):
+                chunk = pending[start:start + self.max_keys_per_query]
+                found = self._query(chunk)
+                for key in chunk:
+                    resolved[key] = key in found
+        return resolved
+
+    def _query(self, keys: list[Hashable]) -> set:
+        """Consulta un grupo de claves a la base de datos, guarda el resultado en las cachés y devuelve las encontradas."""
+        count = len(keys)
+        sql = self._sql.get(count) or self._build_sql(count)
+        params = tuple(keys) if self.paramstyle in _POSITIONAL else {f'k{index}': key for index, key in enumerate(keys)}
+        pool = self._pool
+        connection = pool.get_connection()
+        try:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(sql, params)
+                found = {row[0] for row in cursor.fetchall()}
+            finally:
+                cursor.close()
+        finally:
+            pool.release(connection)
+        with self._stats_lock:
+            self.queries += 1
+            self.keys_queried += count
+        if count == 1:
+            (self._found if found else self._missing).put(keys[0], True)
+        else:
+            self._found.put_many((key, True) for key in keys if key in found)
+            self._missing.put_many((key, True) for key in keys if key not in found)
+        return found
+
+    def _build_sql(self, count: int) -> str:
+        """Arma (y guarda para reutilizarla) la consulta IN con count parámetros en el estilo del módulo DB-API."""
+        style = self.paramstyle
+        if style == 'qmark':
+            placeholders = ', '.join('?' * count)
+        elif style == 'format':
+            placeholders = ', '.join(['%s'] * count)
+        elif style == 'numeric':
+            placeholders = ', '.join(f':{index}' for index in range(1, count + 1))
+        elif style == 'named':
+            placeholders = ', '.join(f':k{index}' for index in range(count))
+        else:
+            placeholders = ', '.join(f'%(k{index})s' for index in range(count))
+        sql = self._sql[count] = f"SELECT {self.column} FROM {self.table} WHERE {self.column} IN ({placeholders})"
+        return sql
+
+    def clear_cache(self):
+        """Vacía las cachés, por ejemplo después de actualizar el catálogo."""
+        self._found.clear()
+        self._missing.clear()
+
+    def close(self):
+        """Cierra las conexiones libres del pool."""
+        self._pool.close()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve las estadísticas del catálogo para dimensionar las cachés.
+
+        Returns:
+            dict[str, any]: Consultas realizadas, claves consultadas y estadísticas de las cachés positiva y negativa.
+        """
+        return {
+            "queries": self.queries,
+            "keys_queried": self.keys_queried,
+            "found_cache": self._found.info(),
+            "missing_cache": self._missing.info(),
+        }
+
+    def __reduce__(self) -> tuple:
+        return (type(self), self._args)
+
+    def __repr__(self) -> str:
+        return f"ReferenceCatalog({self.database!r}, {self.table!r}, {self.column!r})"
+
+
+def _sqlite_connect(path: str) -> Callable[[], any]:
+    """Devuelve la función que abre una conexión SQLite que se puede usar desde cualquier hilo del pool."""
+    # sqlite3 se importa solo si el catálogo es una base SQLite (con otras bases DB-API no se usa)
+    import sqlite3
+
+    def connect() -> sqlite3.Connection:
+        return sqlite3.connect(path, check_same_thread=False)
+
+    return connect
+
+
+def _is_hashable(key: any) -> bool:
+    """Indica si una clave se puede buscar en las cachés."""
+    try:
+        hash(key)
+    except TypeError:
+        return False
+    return True
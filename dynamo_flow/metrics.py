@@ -0,0 +1,352 @@
+import os
+import time
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from typing import Callable
+from .logs import EMPTY_LOGS
+from .operations.pipeline import check_stop_on
+
+# Límites superiores (en segundos) de los intervalos de los histogramas de tiempo
+DEFAULT_BUCKETS = (1e-6, 2.5e-6, 5e-6, 1e-5, 2.5e-5, 5e-5, 1e-4, 2.5e-4, 1e-3, 1e-2, 1e-1, 1.0)
+
+
+class _Histogram:
+    """Histograma de tiempos en nanosegundos con la cantidad de observaciones y el tiempo acumulado."""
+
+    __slots__ = ('bounds', 'buckets', 'count', 'total_ns')
+
+    def __init__(self, bounds: tuple[int, ...]):
+        self.bounds = bounds
+        # Un intervalo por límite, más el de los valores mayores al último límite
+        self.buckets = [0] * (len(bounds) + 1)
+        self.count = 0
+        self.total_ns = 0
+
+    def observe(self, elapsed_ns: int):
+        self.buckets[bisect_left(self.bounds, elapsed_ns)] += 1
+        self.count += 1
+        self.total_ns += elapsed_ns
+
+    def to_dict(self, buckets: tuple[float, ...]) -> dict[str, any]:
+        cumulative = 0
+        counts = list()
+        for bound, count in zip(buckets, self.buckets):
+            cumulative += count
+            counts.append((bound, cumulative))
+        return {"count": self.count, "time_ns": self.total_ns, "buckets": counts}
+
+
+class _OperationStats:
+    """
+    Estadísticas de una operación (clase y field_name) dentro de un tipo de registro: llamadas y logs de todos los
+    registros, e histograma de tiempos de los registros muestreados.
+    """
+
+    __slots__ = ('operation', 'field', 'calls', 'histogram', 'logs')
+
+    def __init__(self, operation: str, field: str | None, bounds: tuple[int, ...]):
+        self.operation = operation
+        self.field = field
+        self.calls = 0
+        self.histogram = _Histogram(bounds)
+        self.logs = dict()
+
+
+class Metrics:
+    """
+    Métricas de process_stream por tipo de registro y por operación.
+
+    Por cada tipo de registro cuenta los registros procesados y los logs por nivel y código, y por cada operación
+    (clase y field_name) las llamadas y los logs que produjo. Sobre los registros muestreados mide además el tiempo
+    total del registro y el tiempo acumulado y el histograma de tiempos de cada operación.
+    El muestreo es sistemático: con sample_rate=0.1 se mide uno de cada 10 registros. En los registros no muestreados
+    solo se cuentan las llamadas y los logs, sin medir tiempos.
+
+    Los contadores no usan bloqueos: una instancia se actualiza desde el hilo que consume process_stream.
+
+    Attributes:
+        sample_rate (float): Proporción de registros cuyos tiempos se miden, entre 0 (excluido) y 1.
+        buckets (tuple[float, ...]): Límites superiores en segundos de los intervalos de los histogramas.
+    """
+
+    def __init__(self, sample_rate: float = 1.0, buckets: tuple[float, ...] = DEFAULT_BUCKETS):
+        """Inicializa las métricas vacías"""
+        if not 0 < sample_rate <= 1:
+            raise Exception("La tasa de muestreo debe estar entre 0 (excluido) y 1.")
+        if list(buckets) != sorted(buckets) or not buckets:
+            raise Exception("Los límites de los histogramas deben estar ordenados de menor a mayor.")
+        self.sample_rate = sample_rate
+        self.buckets = tuple(buckets)
+        self._bounds = tuple(int(bound * 1e9) for bound in self.buckets)
+        self._interval = max(1, round(1 / sample_rate))
+        # Registros que faltan para el siguiente registro muestreado (compartido por todos los tipos)
+        self._countdown = [1]
+        self.reset()
+
+    def reset(self):
+        """Reinicia todos los contadores."""
+        self._records = dict()
+        self._record_histograms = dict()
+        self._record_logs = dict()
+        self._operations = dict()
+
+    def instrument(self, record_type: str, operations: list, stop_on: str | None = None) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+        """
+        Compila una lista de operaciones igual que compile_pipeline, pero registrando sus métricas.
+
+        Args:
+            record_type (str): Tipo de registro al que se aplica la cadena.
+            operations (list[Operation]): Lista de operaciones en el orden en que se deben ejecutar.
+            stop_on (str | None): Nivel de log que detiene la cadena ('ERROR' o 'WARNING'), igual que en compile_pipeline.
+
+        Returns:
+            Callable[[dict[str, any]], tuple[dict[str, any], list]]: Función que recibe un registro y devuelve
+            el registro procesado y la lista de errores o advertencias.
+        """
+        levels = check_stop_on(stop_on) if stop_on is not None else frozenset()
+        steps = tuple(
+            (operation.compile(), self._operation_stats(record_type, operation)) for operation in operations
+        )
+        record_count = self._records.setdefault(record_type, [0])
+        record_histogram = self._record_histograms.setdefault(record_type, _Histogram(self._bounds))
+        record_logs = self._record_logs.setdefault(record_type, dict())
+        countdown = self._countdown
+        interval = self._interval
+        clock = time.perf_counter_ns
+
+        def attribute(operation_stats: _OperationStats, logs: list, produced: int) -> bool:
+            """Atribuye a la operación los logs que agregó a la lista compartida e indica si detienen la cadena."""
+            stop = False
+            for index in range(produced, len(logs)):
+                entry = logs[index]
+                key = (entry.type, entry.code)
+                operation_stats.logs[key] = operation_stats.logs.get(key, 0) + 1
+                stop = stop or entry.type in levels
+            return stop
+
+        def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+            record_count[0] += 1
+            countdown[0] -= 1
+            logs = list()
+            produced = 0
+            # Las llamadas y los logs se cuentan en todos los registros; los tiempos, solo en los muestreados
+            if countdown[0]:
+                for step, operation_stats in steps:
+                    operation_stats.calls += 1
+                    record = step(record, logs)
+                    if len(logs) != produced:
+                        if attribute(operation_stats, logs, produced):
+                            break
+                        produced = len(logs)
+            else:
+                countdown[0] = interval
+                record_start = clock()
+                for step, operation_stats in steps:
+                    operation_stats.calls += 1
+                    start = clock()
+                    record = step(record, logs)
+                    operation_stats.histogram.observe(clock() - start)
+                    if len(logs) != produced:
+                        if attribute(operation_stats, logs, produced):
+                            break
+                        produced = len(logs)
+                record_histogram.observe(clock() - record_start)
+            if logs:
+                for entry in logs:
+                    key = (entry.type, entry.code)
+                    record_logs[key] = record_logs.get(key, 0) + 1
+                return record, logs
+            return record, EMPTY_LOGS
+
+        return pipeline
+
+    def observe_unprocessed(self, record_type: str | None, logs: list):
+        """
+        Registra un registro al que no se le aplicaron operaciones (vacío, sin tipo o sin operaciones asignadas).
+
+        Args:
+            record_type (str | None): Tipo del registro, o None si no tiene.
+            logs (list): Logs con la advertencia de por qué no se procesó.
+        """
+        record_type = record_type if isinstance(record_type, str) else ''
+        self._records.setdefault(record_type, [0])[0] += 1
+        record_logs = self._record_logs.setdefault(record_type, dict())
+        for entry in logs:
+            key = (entry.type, entry.code)
+            record_logs[key] = record_logs.get(key, 0) + 1
+
+    def _operation_stats(self, record_type: str, operation) -> _OperationStats:
+        """Devuelve las estadísticas de la operación, compartidas por las operaciones con la misma clase y campo."""
+        name = type(operation).__name__
+        field = operation.parameters.get('field_name') if hasattr(operation, 'parameters') else None
+        key = (record_type, name, field)
+        stats = self._operations.get(key)
+        if stats is None:
+            stats = self._operations[key] = _OperationStats(name, field, self._bounds)
+        return stats
+
+    def snapshot(self) -> dict[str, any]:
+        """
+        Devuelve una copia de las métricas actuales.
+
+        Los tiempos e histogramas corresponden solo a los registros muestreados; las cantidades de registros, de
+        llamadas y de logs, por tipo de registro y por operación, corresponden a todos los registros.
+
+        Returns:
+            dict[str, any]: Diccionario con sample_rate y, por tipo de registro, la cantidad de registros,
+            el histograma de tiempos del registro, los logs por nivel y código, y la lista de operaciones.
+        """
+        record_types = dict()
+        for record_type, count in self._records.items():
+            histogram = self._record_histograms.get(record_type)
+            logs = dict()
+            for (level, code), total in self._record_logs.get(record_type, dict()).items():
+                logs.setdefault(level, dict())[code] = total
+            record_types[record_type] = {
+                "records": count[0],
+                "time": histogram.to_dict(self.buckets) if histogram else None,
+                "logs": logs,
+                "operations": list(),
+            }
+        for (record_type, _, _), stats in self._operations.items():
+            logs = dict()
+            for (level, code), total in stats.logs.items():
+                logs.setdefault(level, dict())[code] = total
+            record_types[record_type]["operations"].append({
+                "operation": stats.operation,
+                "field": stats.field,
+                "calls": stats.calls,
+                "time": stats.histogram.to_dict(self.buckets),
+                "logs": logs,
+            })
+        return {"sample_rate": self.sample_rate, "record_types": record_types}
+
+    def export(self, exporter: 'MetricsExporter'):
+        """
+        Exporta las métricas actuales con el exportador indicado.
+
+        Args:
+            exporter (MetricsExporter): Exportador que recibe la copia de las métricas.
+        """
+        exporter.export(self.snapshot())
+
+
+class MetricsExporter(ABC):
+    """
+    Clase abstracta para los exportadores de métricas.
+    """
+
+    @abstractmethod
+    def export(self, snapshot: dict[str, any]):
+        """
+        Exporta una copia de las métricas.
+
+        Args:
+            snapshot (dict[str, any]): Métricas devueltas por Metrics.snapshot.
+        """
+        pass
+
+
+class PrometheusFileExporter(MetricsExporter):
+    """
+    Escribe las métricas en un archivo local con el formato de texto de Prometheus.
+
+    El archivo se reemplaza de forma atómica, por lo que puede leerlo el textfile collector de node_exporter
+    sin ver nunca un archivo a medio escribir.
+
+    Attributes:
+        path (str): Ruta del archivo.
+        prefix (str): Prefijo de los nombres de las métricas. Por defecto es 'dynamo_flow'.
+    """
+
+    def __init__(self, path: str, prefix: str = 'dynamo_flow'):
+        """Inicializa el exportador"""
+        self.path = path
+        self.prefix = prefix
+
+    def export(self, snapshot: dict[str, any]):
+        temporary = f"{self.path}.tmp"
+        with open(temporary, 'w', encoding='utf-8') as file:
+            file.write(prometheus_text(snapshot, self.prefix))
+        os.replace(temporary, self.path)
+
+
+def prometheus_text(snapshot: dict[str, any], prefix: str = 'dynamo_flow') -> str:
+    """
+    Convierte una copia de las métricas al formato de texto de Prometheus.
+
+    Args:
+        snapshot (dict[str, any]): Métricas devueltas por Metrics.snapshot.
+        prefix (str): Prefijo de los nombres de las métricas. Por defecto es 'dynamo_flow'.
+
+    Returns:
+        str: Texto con las métricas.
+    """
+    lines = list()
+
+    def header(name: str, kind: str, description: str):
+        lines.append(f"# HELP {prefix}_{name} {description}")
+        lines.append(f"# TYPE {prefix}_{name} {kind}")
+
+    def histogram(name: str, labels: dict[str, any], values: dict[str, any]):
+        for bound, count in values["buckets"]:
+            lines.append(f"{prefix}_{name}_bucket{_labels(labels, le=repr(float(bound)))} {count}")
+        lines.append(f"{prefix}_{name}_bucket{_labels(labels, le='+Inf')} {values['count']}")
+        lines.append(f"{prefix}_{name}_sum{_labels(labels)} {values['time_ns'] / 1e9!r}")
+        lines.append(f"{prefix}_{name}_count{_labels(labels)} {values['count']}")
+
+    record_types = snapshot["record_types"]
+    header("sample_rate", "gauge", "Proporción de registros cuyos tiempos se miden.")
+    lines.append(f"{prefix}_sample_rate {snapshot['sample_rate']!r}")
+
+    header("records_total", "counter", "Registros procesados por tipo de registro.")
+    for record_type, values in record_types.items():
+        lines.append(f"{prefix}_records_total{_labels({'record_type': record_type})} {values['records']}")
+
+    header("logs_total", "counter", "Advertencias y errores por tipo de registro, nivel y código.")
+    for record_type, values in record_types.items():
+        for level, codes in values["logs"].items():
+            for code, count in codes.items():
+                lines.append(f"{prefix}_logs_total{_labels({'record_type': record_type, 'level': level, 'code': code})} {count}")
+
+    header("record_duration_seconds", "histogram", "Tiempo de procesamiento de los registros muestreados.")
+    for record_type, values in record_types.items():
+        if values["time"]:
+            histogram("record_duration_seconds", {'record_type': record_type}, values["time"])
+
+    header("operation_duration_seconds", "histogram", "Tiempo de ejecución de cada operación en los registros muestreados.")
+    for record_type, values in record_types.items():
+        for operation in values["operations"]:
+            labels = {'record_type': record_type, 'operation': operation["operation"], 'field': operation["field"]}
+            histogram("operation_duration_seconds", labels, operation["time"])
+
+    header("operation_calls_total", "counter", "Llamadas a cada operación.")
+    for record_type, values in record_types.items():
+        for operation in values["operations"]:
+            labels = {'record_type': record_type, 'operation': operation["operation"], 'field': operation["field"]}
+            lines.append(f"{prefix}_operation_calls_total{_labels(labels)} {operation['calls']}")
+
+    header("operation_logs_total", "counter", "Advertencias y errores de cada operación.")
+    for record_type, values in record_types.items():
+        for operation in values["operations"]:
+            for level, codes in operation["logs"].items():
+                for code, count in codes.items():
+                    labels = {
+                        'record_type': record_type, 'operation': operation["operation"], 'field': operation["field"],
+                        'level': level, 'code': code,
+                    }
+                    lines.append(f"{prefix}_operation_logs_total{_labels(labels)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def _labels(labels: dict[str, any], **extra: str) -> str:
+    """Da formato a las etiquetas de una métrica de Prometheus, escapando los valores."""
+    labels = {**labels, **extra}
+    if not labels:
+        return ''
+    pairs = list()
+    for name, value in labels.items():
+        value = '' if value is None else str(value)
+        value = value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        pairs.append(f'{name}="{value}"')
+    return '{' + ','.join(pairs) + '}'
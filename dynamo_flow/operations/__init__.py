@@ -1,5 +1,45 @@
-from .contextual_field_validation import ContextualFieldValidation
-from .normalize_amount_operation import NormalizeAmountOperation
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Módulo de cada clase o función exportada. Se importa la primera vez que se usa el nombre (PEP 562), por lo que
+# agregar operaciones no hace más lento el inicio de los procesos que no las usan (ver también registry.operations).
+_EXPORTS = {
+    'ContextualFieldValidation': '.contextual_field_validation',
+    'NormalizeAmountOperation': '.normalize_amount_operation',
+    'NormalizeTimestampOperation': '.normalize_timestamp_operation',
+    'ReferenceLookupOperation': '.reference_lookup_operation',
+    'compile_pipeline': '.pipeline',
+    'compile_async_pipeline': '.pipeline',
+    'compile_batch_pipeline': '.pipeline',
+    'compile_prefetch_pipeline': '.pipeline',
+    **dict.fromkeys(('Condition', 'NotEmpty', 'Regex', 'OneOf', 'Range', 'Length', 'IsType', 'AllOf', 'AnyOf', 'Not'), '.conditions'),
+}
+
+if TYPE_CHECKING:
+    from .conditions import Condition, NotEmpty, Regex, OneOf, Range, Length, IsType, AllOf, AnyOf, Not
+    from .contextual_field_validation import ContextualFieldValidation
+    from .normalize_amount_operation import NormalizeAmountOperation
+    from .normalize_timestamp_operation import NormalizeTimestampOperation
+    from .reference_lookup_operation import ReferenceLookupOperation
+    from .pipeline import compile_pipeline, compile_async_pipeline, compile_batch_pipeline, compile_prefetch_pipeline
+
+
+def __getattr__(name: str) -> any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Se guarda en el módulo para que los siguientes accesos no pasen por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 # Para poder importar las clases facilmente desde fuera del subpaquete operations
-__all__ = ['ContextualFieldValidation', 'NormalizeAmountOperation']
\ No newline at end of file
+__all__ = [
+    'ContextualFieldValidation', 'NormalizeAmountOperation', 'NormalizeTimestampOperation', 'ReferenceLookupOperation', 'compile_pipeline', 'compile_async_pipeline', 'compile_batch_pipeline', 'compile_prefetch_pipeline',
+    'Condition', 'NotEmpty', 'Regex', 'OneOf', 'Range', 'Length', 'IsType', 'AllOf', 'AnyOf', 'Not',
+]
@@ -0,0 +1,302 @@
+import re
+from abc import ABC, abstractmethod
+from typing import Callable, Iterable
+
+class Condition(ABC):
+    """
+    Clase abstracta para las condiciones declarativas de ContextualFieldValidation.
+
+    A diferencia de una lambda, una condición declarativa se prepara una sola vez al construirse (expresiones regulares
+    compiladas, conjuntos congelados), se puede serializar con pickle para enviarla a otros procesos, es comparable y
+    hashable, y se puede inspeccionar (repr muestra sus parámetros). Se combinan con &, | y ~ (AllOf, AnyOf y Not).
+
+    Las subclases llaman a super().__init__ con los mismos argumentos que recibe su constructor: con ellos se comparan,
+    se calcula el hash y se vuelven a construir al deserializarse.
+    """
+
+    def __init__(self, *args: any):
+        self._args = args
+
+    @abstractmethod
+    def __call__(self, value: any) -> bool:
+        """
+        Evalúa la condición sobre el valor de un campo.
+
+        Args:
+            value (any): Valor del campo (nunca None: los campos ausentes se validan antes).
+
+        Returns:
+            bool: Si el valor cumple la condición.
+        """
+        pass
+
+    def compile(self) -> Callable[[any], any]:
+        """
+        Devuelve la función más directa que evalúa la condición, para usarla en las operaciones compiladas.
+
+        El resultado de la función se evalúa como verdadero o falso (por ejemplo, un re.Match o None).
+        Por defecto es la propia condición; las subclases pueden devolver un método de C o una función sin indirecciones.
+
+        Returns:
+            Callable[[any], any]: Función que recibe el valor del campo.
+        """
+        return self.__call__
+
+    def __and__(self, other: Callable[[any], bool]) -> 'AllOf':
+        return AllOf(self, other)
+
+    def __or__(self, other: Callable[[any], bool]) -> 'AnyOf':
+        return AnyOf(self, other)
+
+    def __invert__(self) -> 'Not':
+        return Not(self)
+
+    def __eq__(self, other: any) -> bool:
+        return type(self) is type(other) and self._args == other._args
+
+    def __hash__(self) -> int:
+        return hash((type(self), self._args))
+
+    def __reduce__(self) -> tuple:
+        return (type(self), self._args)
+
+    def __repr__(self) -> str:
+        return f"{type(self).__name__}({', '.join(map(repr, self._args))})"
+
+
+class NotEmpty(Condition):
+    """
+    El valor no es None ni la cadena vacía. Es la condición por defecto de ContextualFieldValidation.
+    """
+
+    def __init__(self):
+        super().__init__()
+
+    def __call__(self, value: any) -> bool:
+        return value is not None and value != ''
+
+
+class Regex(Condition):
+    """
+    El valor es una cadena que coincide con una expresión regular, compilada una sola vez.
+    Si el valor no es una cadena se produce un error de condición, igual que con re.match.
+
+    Attributes:
+        pattern (str): Expresión regular.
+        flags (int): Banderas de re (por ejemplo re.IGNORECASE). Por defecto es 0.
+        mode (str): 'match' (desde el inicio, como re.match), 'fullmatch' (completa) o 'search' (en cualquier posición).
+    """
+
+    MODES = ('match', 'fullmatch', 'search')
+
+    def __init__(self, pattern: str, flags: int = 0, mode: str = 'match'):
+        if mode not in Regex.MODES:
+            raise Exception(f"El modo debe ser uno de {Regex.MODES}.")
+        super().__init__(pattern, flags, mode)
+        self.pattern = pattern
+        self.flags = flags
+        self.mode = mode
+        self._matcher = getattr(re.compile(pattern, flags), mode)
+
+    def __call__(self, value: any) -> bool:
+        return self._matcher(value) is not None
+
+    def compile(self) -> Callable[[any], any]:
+        # El método de la expresión compilada devuelve un re.Match o None
+        return self._matcher
+
+
+class OneOf(Condition):
+    """
+    El valor pertenece a un conjunto de valores permitidos, guardado como frozenset.
+
+    Con ignore_case los valores se comparan en minúsculas; en ese caso el valor del campo debe ser una cadena
+    (otros tipos producen un error de condición).
+
+    Attributes:
+        values (frozenset): Valores permitidos (en minúsculas si ignore_case).
+        ignore_case (bool): Si se ignoran mayúsculas y minúsculas. Por defecto es False.
+    """
+
+    def __init__(self, values: Iterable[any], ignore_case: bool = False):
+        values = frozenset(value.lower() for value in values) if ignore_case else frozenset(values)
+        super().__init__(values, ignore_case)
+        self.values = values
+        self.ignore_case = ignore_case
+
+    def __call__(self, value: any) -> bool:
+        return (value.lower() if self.ignore_case else value) in self.values
+
+    def compile(self) -> Callable[[any], any]:
+        values = self.values
+        if not self.ignore_case:
+            return values.__contains__
+
+        def one_of(value: any) -> bool:
+            return value.lower() in values
+
+        return one_of
+
+    def __repr__(self) -> str:
+        return f"OneOf({sorted(self.values, key=repr)!r}, ignore_case={self.ignore_case!r})"
+
+
+class Range(Condition):
+    """
+    El valor está entre un mínimo y un máximo (incluidos). Cualquiera de los dos límites puede omitirse.
+
+    Attributes:
+        minimum (any): Valor mínimo, o None si no tiene.
+        maximum (any): Valor máximo, o None si no tiene.
+    """
+
+    def __init__(self, minimum: any = None, maximum: any = None):
+        if minimum is None and maximum is None:
+            raise Exception("El rango debe tener un mínimo, un máximo o ambos.")
+        super().__init__(minimum, maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __call__(self, value: any) -> bool:
+        if self.minimum is not None and value < self.minimum:
+            return False
+        return self.maximum is None or value <= self.maximum
+
+
+class Length(Condition):
+    """
+    La longitud del valor (len) está entre un mínimo y un máximo (incluidos). Cualquiera de los dos límites puede omitirse.
+
+    Attributes:
+        minimum (int | None): Longitud mínima, o None si no tiene.
+        maximum (int | None): Longitud máxima, o None si no tiene.
+    """
+
+    def __init__(self, minimum: int | None = None, maximum: int | None = None):
+        if minimum is None and maximum is None:
+            raise Exception("La longitud debe tener un mínimo, un máximo o ambos.")
+        super().__init__(minimum, maximum)
+        self.minimum = minimum
+        self.maximum = maximum
+
+    def __call__(self, value: any) -> bool:
+        size = len(value)
+        if self.minimum is not None and size < self.minimum:
+            return False
+        return self.maximum is None or size <= self.maximum
+
+
+class IsType(Condition):
+    """
+    El valor es una instancia de alguno de los tipos indicados.
+
+    Attributes:
+        types (tuple[type, ...]): Tipos permitidos.
+    """
+
+    def __init__(self, *types: type):
+        if not types:
+            raise Exception("Debe indicarse al menos un tipo.")
+        super().__init__(*types)
+        self.types = types
+
+    def __call__(self, value: any) -> bool:
+        return isinstance(value, self.types)
+
+
+class AllOf(Condition):
+    """
+    El valor cumple todas las condiciones (declarativas o funciones), evaluadas en orden hasta la primera que falla.
+
+    Attributes:
+        conditions (tuple[Callable[[any], bool], ...]): Condiciones a combinar.
+    """
+
+    def __init__(self, *conditions: Callable[[any], bool]):
+        if not conditions:
+            raise Exception("Debe indicarse al menos una condición.")
+        super().__init__(*conditions)
+        self.conditions = conditions
+
+    def __call__(self, value: any) -> bool:
+        return all(condition(value) for condition in self.conditions)
+
+    def compile(self) -> Callable[[any], any]:
+        checks = tuple(compile_condition(condition) for condition in self.conditions)
+
+        def all_of(value: any) -> bool:
+            for check in checks:
+                if not check(value):
+                    return False
+            return True
+
+        return all_of
+
+
+class AnyOf(Condition):
+    """
+    El valor cumple alguna de las condiciones (declarativas o funciones), evaluadas en orden hasta la primera que se cumple.
+
+    Attributes:
+        conditions (tuple[Callable[[any], bool], ...]): Condiciones a combinar.
+    """
+
+    def __init__(self, *conditions: Callable[[any], bool]):
+        if not conditions:
+            raise Exception("Debe indicarse al menos una condición.")
+        super().__init__(*conditions)
+        self.conditions = conditions
+
+    def __call__(self, value: any) -> bool:
+        return any(condition(value) for condition in self.conditions)
+
+    def compile(self) -> Callable[[any], any]:
+        checks = tuple(compile_condition(condition) for condition in self.conditions)
+
+        def any_of(value: any) -> bool:
+            for check in checks:
+                if check(value):
+                    return True
+            return False
+
+        return any_of
+
+
+class Not(Condition):
+    """
+    El valor no cumple la condición (declarativa o función).
+
+    Attributes:
+        condition (Callable[[any], bool]): Condición a negar.
+    """
+
+    def __init__(self, condition: Callable[[any], bool]):
+        super().__init__(condition)
+        self.condition = condition
+
+    def __call__(self, value: any) -> bool:
+        return not self.condition(value)
+
+    def compile(self) -> Callable[[any], any]:
+        check = compile_condition(self.condition)
+
+        def negated(value: any) -> bool:
+            return not check(value)
+
+        return negated
+
+
+def compile_condition(condition: Callable[[any], bool]) -> Callable[[any], any]:
+    """
+    Devuelve la función a llamar para evaluar una condición: la versión compilada de una condición declarativa,
+    o la propia función si es cualquier otro invocable.
+
+    Args:
+        condition (Callable[[any], bool]): Condición declarativa o función.
+
+    Returns:
+        Callable[[any], any]: Función cuyo resultado se evalúa como verdadero o falso.
+    """
+    if isinstance(condition, Condition):
+        return condition.compile()
+    return condition
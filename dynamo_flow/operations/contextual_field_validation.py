@@ -1,5 +1,12 @@
-from typing import Callable
-from .operation import Operation
+from sys import intern
+from typing import TYPE_CHECKING, Awaitable, Callable
+from .operation import Operation, _UNCHANGED, _PASSED
+from .pipeline import compile_batch_pipeline
+from .conditions import NotEmpty, compile_condition
+from ..logs import LogEntry, WARNING, ERROR, FIELD_REQUIRED, CONDITION_FAILED, CONDITION_ERROR
+
+if TYPE_CHECKING:
+    from ..records.schema import RecordSchema, SchemaRecord
 
 class ContextualFieldValidation(Operation):
     """
@@ -8,48 +15,132 @@ class ContextualFieldValidation(Operation):
     Attributes:
         field_name (str): El campo donde se aplicara esta operación.
         required (bool): Si el campo es obligatorio. Por defecto es True.
-        condition (Callable[[any], bool]): La condición que debe cumplir el campo. Por defecto valida que no sea None.
+        condition (Callable[[any], bool]): La condición que debe cumplir el campo. Por defecto valida que no sea None ni vacío (NotEmpty).
+            Puede ser una condición declarativa (ver conditions: Regex, OneOf, Range, Length, IsType, AllOf, AnyOf, Not),
+            que se prepara una sola vez y se puede enviar a otros procesos, o cualquier función.
+            Puede ser una corrutina (async def); en ese caso la operación se ejecuta con process_stream_async.
         target_type (str): Tipo de registro donde se aplica esta operación. Por defecto esta vacío.
     """
     
-    def __init__(self, field_name: str, required: bool = True, condition: Callable[[any], bool] = lambda x: x is not None and x != '', target_type: str = ""):
+    def __init__(self, field_name: str, required: bool = True, condition: Callable[[any], bool] = NotEmpty(), target_type: str = ""):
         super().__init__(field_name=field_name, required=required, condition=condition, target_type=target_type)  
 
     def execute(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
         logs = list()
-        # Recuperamos los atributos de la operación y el valor del campo en operación
-        field_name = self.parameters.get('field_name')
+        record = self.compiled()(record, logs)
+        return record, logs
+
+    def _compile_decision(self, condition: Callable[[any], bool]) -> Callable[[any], tuple[any, LogEntry | None]]:
+        """
+        Decisión de la operación sobre el valor del campo (ver Operation._compile_field_step). No modifica el campo.
+
+        Args:
+            condition (Callable[[any], bool]): Condición ya preparada (síncrona) que debe cumplir el valor.
+        """
         required = self.parameters.get('required')
-        condition = self.parameters.get('condition')        
-        value = record.get(field_name)
-        # Si el campo es obligatorio validamos su existencia y que cumpla la condición
-        if required:
+        operation_name = intern(self.__class__.__name__)
+        field = intern(f"{self.parameters.get('field_name')}")
+
+        def decide(value: any) -> tuple[any, LogEntry | None]:
+            # Si el campo no es obligatorio no hay nada que validar
+            if not required:
+                return _PASSED
+            # Si el campo es obligatorio validamos su existencia y que cumpla la condición
             if value is None:
-                logs.append({
-                    "type": "WARNING",
-                    "operation": self.__class__.__name__,
-                    "field": f"{field_name}",
-                    "message": f"El campo no está presente o es None."
-                })
-            else:
-                try:                    
-                    # Se verifica si se cumple la condición                    
-                    if not condition(value):                    
-                        logs.append({
-                            "type": "WARNING",
-                            "operation": self.__class__.__name__,
-                            "field": f"{field_name}",
-                            "message": f"El campo no cumple la condición.",
-                        })
+                return _UNCHANGED, LogEntry(WARNING, FIELD_REQUIRED, operation_name, field)
+            try:
+                # Se verifica si se cumple la condición
+                if condition(value):
+                    return _PASSED
+                return _UNCHANGED, LogEntry(WARNING, CONDITION_FAILED, operation_name, field)
+            except Exception as e:
+                return _UNCHANGED, LogEntry(ERROR, CONDITION_ERROR, operation_name, field, e)
+
+        return decide
+
+    def _compile_condition(self) -> Callable[[any], bool]:
+        """Prepara la condición una sola vez. Una condición asíncrona no se puede esperar aquí: se registra como error."""
+        condition = self.parameters.get('condition')
+        if _is_coroutine_function(condition):
+            return _async_condition_error
+        return compile_condition(condition)
+
+    def compile(self) -> Callable[[dict[str, any], list], dict[str, any]]:
+        return self._compile_field_step(self._compile_decision(self._compile_condition()))
+
+    def compile_schema(self, schema: 'RecordSchema') -> Callable[['SchemaRecord', list], 'SchemaRecord']:
+        return self._compile_field_schema_step(self._compile_decision(self._compile_condition()), schema)
+
+    @property
+    def reads(self) -> frozenset[str]:
+        return frozenset((self.parameters.get('field_name'),))
+
+    @property
+    def writes(self) -> frozenset[str]:
+        # Solo valida el campo: no modifica el registro
+        return frozenset()
+
+    def execute_batch(self, records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        return compile_batch_pipeline([self])(records)
+
+    def compile_batch(self) -> Callable[[list[dict[str, any]], list[list | None]], list[dict[str, any]]]:
+        return self._compile_field_batch(self._compile_decision(self._compile_condition()))
+
+    @property
+    def is_async(self) -> bool:
+        return _is_coroutine_function(self.parameters.get('condition'))
+
+    def compile_async(self) -> Callable[[dict[str, any], list], Awaitable[dict[str, any]]]:
+        # Recuperamos los atributos de la operación una sola vez y quedan como variables locales
+        field_name = self.parameters.get('field_name')
+        required = self.parameters.get('required')
+        condition = self.parameters.get('condition')
+        # Se decide con la misma función que la ruta síncrona, sobre el resultado ya esperado de la condición
+        decide = self._compile_decision(_Awaited.result)
+
+        async def step(record: dict[str, any], logs: list) -> dict[str, any]:
+            # Si el campo no es obligatorio no hay nada que validar ni que esperar
+            value = record.get(field_name) if required else None
+            if value is not None:
+                try:
+                    # Se espera a la condición asíncrona
+                    value = _Awaited(await condition(value))
                 except Exception as e:
-                    logs.append({
-                        "type": "ERROR",
-                        "operation": self.__class__.__name__,
-                        "field": f"{field_name}",
-                        "message": f"Error al ejecutar la condición: {e}"
-                    })
-        
-        return record, logs
+                    value = _Awaited(error=e)
+            _, entry = decide(value)
+            if entry is not None:
+                logs.append(entry)
+            return record
+
+        return step
+
+
+class _Awaited:
+    """Resultado (o excepción) de esperar una condición asíncrona sobre un valor."""
+
+    __slots__ = ('value', 'error')
+
+    def __init__(self, value: any = None, error: Exception | None = None):
+        self.value = value
+        self.error = error
+
+    def result(self) -> any:
+        """Devuelve el resultado de la condición, o lanza la excepción que produjo."""
+        if self.error is not None:
+            raise self.error
+        return self.value
+
+
+def _async_condition_error(value: any) -> bool:
+    """Reemplaza una condición asíncrona cuando la operación se ejecuta de forma síncrona."""
+    raise Exception("la condición es asíncrona, use process_stream_async.")
+
+
+def _is_coroutine_function(condition: any) -> bool:
+    """Indica si la condición es una corrutina (definida con async def)."""
+    # inspect tarda en importarse: se importa al compilar, no al importar el módulo
+    import inspect
+    return inspect.iscoroutinefunction(condition)
 
 
 if __name__ == '__main__':
@@ -1,5 +1,85 @@
 import re
+from sys import intern
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
 from .operation import Operation
+from .pipeline import compile_batch_pipeline
+from ..cache import LRUCache
+from ..logs import LogEntry, WARNING, ERROR, FIELD_MISSING, NOT_A_NUMBER, CONVERSION_ERROR
+
+if TYPE_CHECKING:
+    import numpy as np
+    from ..records.schema import RecordSchema, SchemaRecord
+
+# numpy es opcional: solo se necesita para la conversión por lotes (number_to_float_many).
+# Tarda en importarse, por lo que se importa la primera vez que se usa (ver _numpy).
+_np = None
+
+
+def _numpy():
+    """Importa numpy la primera vez que se necesita y lo devuelve, o devuelve None si no está instalado."""
+    global _np
+    if _np is None:
+        try:
+            import numpy
+        except ImportError:
+            numpy = False
+        _np = numpy
+    return _np or None
+
+
+# Marca para distinguir "no está en la caché" de un resultado None guardado
+_NOT_CACHED = object()
+
+# Tamaño mínimo de un lote para convertirlo con number_to_float_many; los lotes menores se convierten uno a uno
+_MIN_VECTOR_BATCH = 2048
+
+# Tipos de carácter que distingue el escáner de number_to_float. Los cuatro primeros se conservan al limpiar el número
+_DIGIT, _DOT, _COMMA, _MINUS, _PLUS, _EXPONENT, _NEWLINE, _OTHER = range(8)
+# Tipo de cada carácter ASCII relevante. Los dígitos no ASCII (ejm: '٣') se detectan con str.isdecimal
+_CHAR_KINDS = {
+    **{digit: _DIGIT for digit in '0123456789'},
+    '.': _DOT, ',': _COMMA, '-': _MINUS, '+': _PLUS, 'e': _EXPONENT, 'E': _EXPONENT, '\n': _NEWLINE,
+}
+# Autómata equivalente a r'^[+-]?\d+[\.,]?\d*[eE][+-]?\d+$' (como en re, acepta un salto de línea final).
+# Estados: 0 inicio, 1 signo, 2 dígitos enteros, 3 separador y decimales, 4 'e', 5 signo del exponente,
+# 6 dígitos del exponente, 7 salto de línea final, 8 descartado
+_SCIENTIFIC_TRANSITIONS = (
+    # DIGIT DOT COMMA MINUS PLUS EXP NEWLINE OTHER
+    (2, 8, 8, 1, 1, 8, 8, 8),
+    (2, 8, 8, 8, 8, 8, 8, 8),
+    (2, 3, 3, 8, 8, 4, 8, 8),
+    (3, 8, 8, 8, 8, 4, 8, 8),
+    (6, 8, 8, 5, 5, 8, 8, 8),
+    (6, 8, 8, 8, 8, 8, 8, 8),
+    (6, 8, 8, 8, 8, 8, 7, 8),
+    (8, 8, 8, 8, 8, 8, 8, 8),
+    (8, 8, 8, 8, 8, 8, 8, 8),
+)
+# Estados finales en los que el número está en notación científica, y estado descartado
+_SCIENTIFIC_ACCEPTED = (6, 7)
+_SCIENTIFIC_REJECTED = 8
+
+# Expresiones de number_to_float precompiladas para la conversión por lotes
+_SCIENTIFIC_NOTATION = re.compile(r'^[+-]?\d+[\.,]?\d*[eE][+-]?\d+$')
+# Se conservan los saltos de línea porque la limpieza se aplica sobre la columna unida por líneas
+_NON_NUMERIC_LINES = re.compile(r'[^\d,.\n-]')
+
+
+class BatchConversion(NamedTuple):
+    """
+    Resultado de convertir una columna completa con NormalizeAmountOperation.number_to_float_many.
+
+    Attributes:
+        values (numpy.ndarray): Números convertidos (float64). Las entradas inválidas son NaN.
+        valid (numpy.ndarray): Máscara booleana con las entradas convertidas correctamente.
+        reasons (numpy.ndarray): Código de resultado por índice (ver NormalizeAmountOperation.REASON_*).
+        errors (dict[int, Exception]): Excepción de cada índice con código REASON_ERROR.
+    """
+    values: "np.ndarray"
+    valid: "np.ndarray"
+    reasons: "np.ndarray"
+    errors: dict[int, Exception]
+
 
 class NormalizeAmountOperation(Operation):
     """
@@ -9,10 +89,24 @@ class NormalizeAmountOperation(Operation):
     Attributes:
         field_name (str): El campo donde se aplicara esta operación.        
         target_type (str): Tipo de registro donde se aplica esta operación. Por defecto esta vacío.
+        cache_size (int): Cantidad máxima de conversiones memorizadas. Por defecto es 0 (sin caché).
+        cache_policy (str): Política de desalojo de la caché: 'lru' o 'fifo'. Por defecto es 'lru'.
+        cache (LRUCache | None): Caché de conversiones de la instancia, o None si está desactivada.
     """
     
-    def __init__(self, field_name:str, target_type:str = ""):
-        super().__init__(field_name=field_name, target_type=target_type)        
+    # Códigos de resultado por índice de number_to_float_many
+    REASON_VALID = 0
+    # El valor es None (el campo no existe)
+    REASON_MISSING = 1
+    # number_to_float devuelve None (el campo no es un número)
+    REASON_NOT_A_NUMBER = 2
+    # number_to_float lanza una excepción (error en la conversión)
+    REASON_ERROR = 3
+
+    def __init__(self, field_name:str, target_type:str = "", cache_size: int = 0, cache_policy: str = 'lru'):
+        super().__init__(field_name=field_name, target_type=target_type, cache_size=cache_size, cache_policy=cache_policy)
+        # La caché es opcional y propia de cada instancia; se comparte entre los hilos que usen la misma operación
+        self.cache = LRUCache(cache_size, cache_policy) if cache_size else None
     
     # Es estatico porque no depende de una instancia de la clase
     @staticmethod
@@ -27,89 +121,325 @@ class NormalizeAmountOperation(Operation):
             float: El número convertido
         """
         number = str(number)
+        # Recorre el número una sola vez: conserva dígitos, comas, puntos y guiones, guarda la posición de
+        # cada separador y avanza el autómata que reconoce la notación científica
+        chars = list()
+        dots = list()
+        commas = list()
+        size = 0
+        state = 0
+        for char in number:
+            kind = _CHAR_KINDS.get(char, _OTHER)
+            if kind == _OTHER and char.isdecimal():
+                kind = _DIGIT
+            # Una vez descartada la notación científica no hace falta seguir avanzando el autómata
+            if state != _SCIENTIFIC_REJECTED:
+                state = _SCIENTIFIC_TRANSITIONS[state][kind]
+            if kind <= _MINUS:
+                if kind == _DOT:
+                    dots.append(size)
+                elif kind == _COMMA:
+                    commas.append(size)
+                chars.append(char)
+                size += 1
+
         # Verificar si el numero viene en notación científica
-        scientific_notation = r'^[+-]?\d+[\.,]?\d*[eE][+-]?\d+$'
-        if re.match(scientific_notation, number):            
-            return float(number.replace(',', '.'))                            
+        if state in _SCIENTIFIC_ACCEPTED:
+            return float(number.replace(',', '.') if commas else number)
 
-        # Conserva solo dígitos, comas, puntos y guiones
-        number = re.sub(r'[^\d,.-]','', number)        
-        
         # Si no es un número valido
-        if not number:
+        if not chars:
             return None
-        
-        # Numeros especiales que terminan en -. Ejm: 1.234,56-
-        if number.endswith('-'):
-            number = '-' + number[:-1]        
-        
-        # Caso 1: Cuando esta presente un unico separador (coma o punto) o ninguno
-        dot_count = number.count('.')
-        comma_count = number.count(',')        
 
-        # Sin comas ni puntos    
-        if dot_count == 0 and comma_count == 0:
-            return float(number)
+        # Numeros especiales que terminan en -. Ejm: 1.234,56-
+        sign = ''
+        if chars[-1] == '-':
+            chars.pop()
+            sign = '-'
 
-        # Con punto decimal. Ejem: 123.45
-        if dot_count == 1 and comma_count == 0:            
-            return float(number)
-        
+        # Caso 1: Cuando esta presente un unico separador (coma o punto) o ninguno.
+        # Sin comas ni puntos o con punto decimal (Ejem: 123.45) se convierte tal cual
         # Con coma decimal. Ejem: 123,45
-        if comma_count == 1 and dot_count == 0:            
-            return float(number.replace(',', '.'))
+        if len(commas) == 1 and not dots:
+            chars[commas[0]] = '.'
+        # Caso 2: Cuando esta presente ambos separadores (coma y punto) o varios del mismo
+        elif commas or len(dots) > 1:
+            last_dot = dots[-1] if dots else -1
+            last_comma = commas[-1] if commas else -1
+            # Con coma para miles y punto para decimal. Ejem: 1,234.56
+            if last_dot > last_comma:
+                for position in commas:
+                    chars[position] = ''
+            # Con punto para miles y coma para decimal. Ejem: 1.234,56
+            else:
+                for position in dots:
+                    chars[position] = ''
+                for position in commas:
+                    chars[position] = '.'
+
+        return float(sign + ''.join(chars))
 
-        # Caso 2: Cuando esta presente ambos separadores (coma y punto)
-        last_dot = number.rfind('.')
-        last_comma = number.rfind(',')
+    # Es estatico porque no depende de una instancia de la clase
+    @staticmethod
+    def number_to_float_many(numbers: Iterable[any]) -> BatchConversion:
+        """
+        Convierte una columna completa de números en cualquier formato a float, con el mismo resultado que number_to_float.
 
+        La limpieza de caracteres se hace con una sola pasada de expresión regular sobre toda la columna
+        y la clasificación por separadores (conteo de puntos y comas, última posición de cada uno) y la
+        conversión final se hacen con operaciones vectorizadas de numpy.
+
+        Args:
+            numbers (Iterable[any]): Números en cualquier formato. None se reporta como REASON_MISSING.
+
+        Returns:
+            BatchConversion: Valores convertidos (NaN si no son válidos), máscara de validez,
+            código de resultado por índice y excepciones de las conversiones fallidas.
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError("number_to_float_many requiere numpy. Instálelo con: pip install numpy")
+
+        numbers = list(numbers)
+        size = len(numbers)
+        values = np.full(size, np.nan, dtype=np.float64)
+        reasons = np.full(size, NormalizeAmountOperation.REASON_NOT_A_NUMBER, dtype=np.int8)
+        errors = dict()
+        if not size:
+            return BatchConversion(values, np.zeros(0, dtype=bool), reasons, errors)
+
+        texts = list(map(str, numbers))
+        missing = np.zeros(size, dtype=bool)
+        if None in numbers:
+            missing[[index for index, number in enumerate(numbers) if number is None]] = True
+        # Los valores con saltos de línea no se pueden procesar unidos por líneas, se convierten uno a uno
+        multiline = np.zeros(size, dtype=bool)
+        joined = '\n'.join(texts)
+        if joined.count('\n') != size - 1:
+            multiline[[index for index, text in enumerate(texts) if '\n' in text]] = True
+            for index in np.flatnonzero(multiline):
+                NormalizeAmountOperation._convert_one(numbers[index], index, values, reasons, errors)
+                texts[index] = ''
+            joined = '\n'.join(texts)
+        text_array = np.array(texts, dtype=str)
+
+        # Conserva solo dígitos, comas, puntos y guiones (una sola pasada sobre toda la columna)
+        cleaned_array = np.array(_NON_NUMERIC_LINES.sub('', joined).split('\n'), dtype=str)
+
+        # Verificar que números vienen en notación científica. Solo pueden serlo los que, además de
+        # dígitos, comas, puntos y guiones, únicamente contienen 'e', 'E' o '+'
+        exponent_chars = np.char.count(text_array, 'e') + np.char.count(text_array, 'E')
+        candidates = (exponent_chars > 0) & ~multiline & (
+            np.char.str_len(text_array) == np.char.str_len(cleaned_array) + exponent_chars + np.char.count(text_array, '+')
+        )
+        scientific = np.zeros(size, dtype=bool)
+        for index in np.flatnonzero(candidates):
+            scientific[index] = _SCIENTIFIC_NOTATION.match(texts[index]) is not None
+
+        # Numeros especiales que terminan en -. Ejm: 1.234,56-
+        trailing_minus = np.char.endswith(cleaned_array, '-')
+        if trailing_minus.any():
+            cleaned_array[trailing_minus] = np.char.add('-', np.char.rpartition(cleaned_array[trailing_minus], '-')[:, 0])
+
+        pending = ~(missing | multiline | scientific)
+        # Si no es un número valido
+        pending &= np.char.str_len(cleaned_array) > 0
+
+        # Caso 1 y Caso 2: clasificación por cantidad y posición de separadores
+        # El ancho del arreglo debe alcanzar también para los números en notación científica sin limpiar
+        normalized = cleaned_array.astype(np.promote_types(cleaned_array.dtype, text_array.dtype))
+        dot_count = np.char.count(cleaned_array, '.')
+        comma_count = np.char.count(cleaned_array, ',')
+        last_dot = np.char.rfind(cleaned_array, '.')
+        last_comma = np.char.rfind(cleaned_array, ',')
+        # Con coma decimal. Ejem: 123,45
+        comma_decimal = pending & (comma_count == 1) & (dot_count == 0)
         # Con coma para miles y punto para decimal. Ejem: 1,234.56
-        if last_dot > last_comma:            
-            return float(number.replace(',', ''))
-        else:
+        both = pending & ~((dot_count <= 1) & (comma_count == 0)) & ~comma_decimal
+        comma_thousands = both & (last_dot > last_comma)
         # Con punto para miles y coma para decimal. Ejem: 1.234,56
-            return float(number.replace('.', '').replace(',', '.'))            
+        dot_thousands = both & ~comma_thousands
+        if comma_decimal.any():
+            normalized[comma_decimal] = np.char.replace(cleaned_array[comma_decimal], ',', '.')
+        if comma_thousands.any():
+            normalized[comma_thousands] = np.char.replace(cleaned_array[comma_thousands], ',', '')
+        if dot_thousands.any():
+            normalized[dot_thousands] = np.char.replace(np.char.replace(cleaned_array[dot_thousands], '.', ''), ',', '.')
+        if scientific.any():
+            normalized[scientific] = np.char.replace(text_array[scientific], ',', '.')
+
+        # Una cadena normalizada solo es convertible si tiene a lo sumo un punto, a lo sumo un guion al inicio y algún dígito.
+        # Las demás se convierten una a una para conservar la misma excepción que la ruta escalar
+        minus_count = np.char.count(normalized, '-')
+        point_count = np.char.count(normalized, '.')
+        well_formed = (
+            ((minus_count == 0) | ((minus_count == 1) & np.char.startswith(normalized, '-')))
+            & (point_count <= 1)
+            & (np.char.str_len(normalized) > minus_count + point_count)
+        )
+        for index in np.flatnonzero(pending & ~well_formed):
+            try:
+                values[index] = float(str(normalized[index]))
+                reasons[index] = NormalizeAmountOperation.REASON_VALID
+            except Exception as e:
+                reasons[index] = NormalizeAmountOperation.REASON_ERROR
+                errors[int(index)] = e
+
+        # Conversión final a float de todas las entradas bien formadas en una sola operación
+        convertible = np.flatnonzero((pending & well_formed) | scientific)
+        # Los números fuera del rango de float64 se convierten en inf, igual que en la ruta escalar (sin advertencia)
+        with np.errstate(over='ignore'):
+            values[convertible] = normalized[convertible].astype(np.float64)
+        reasons[convertible] = NormalizeAmountOperation.REASON_VALID
+
+        reasons[missing] = NormalizeAmountOperation.REASON_MISSING
+        return BatchConversion(values, reasons == NormalizeAmountOperation.REASON_VALID, reasons, errors)
+
+    @staticmethod
+    def _convert_one(number: any, index: int, values: "np.ndarray", reasons: "np.ndarray", errors: dict[int, Exception]):
+        """Convierte una sola entrada de number_to_float_many con la ruta escalar."""
+        try:
+            value_float = NormalizeAmountOperation.number_to_float(number)
+        except Exception as e:
+            reasons[index] = NormalizeAmountOperation.REASON_ERROR
+            errors[int(index)] = e
+            return
+        if value_float is None:
+            reasons[index] = NormalizeAmountOperation.REASON_NOT_A_NUMBER
+        else:
+            values[index] = value_float
+            reasons[index] = NormalizeAmountOperation.REASON_VALID
+
+    def cache_info(self) -> dict[str, any] | None:
+        """
+        Devuelve las estadísticas de la caché de conversiones.
+
+        Returns:
+            dict[str, any] | None: Aciertos, fallos, desalojos y tamaño de la caché, o None si está desactivada.
+        """
+        return self.cache.info() if self.cache else None
+
+    def _compile_converter(self) -> Callable[[any], float]:
+        """
+        Devuelve la función de conversión a usar: number_to_float directamente, o envuelta en la caché si está activada.
+        Se memorizan tanto los resultados (incluido None) como las excepciones.
+        """
+        number_to_float = NormalizeAmountOperation.number_to_float
+        if self.cache is None:
+            return number_to_float
+        cache_get = self.cache.get
+        cache_put = self.cache.put
+
+        def cached_number_to_float(number: any) -> float:
+            # La conversión solo depende de str(number), por eso es la clave de la caché
+            key = str(number)
+            result = cache_get(key, _NOT_CACHED)
+            if result is _NOT_CACHED:
+                try:
+                    result = number_to_float(key)
+                except Exception as e:
+                    result = e
+                cache_put(key, result)
+            if isinstance(result, Exception):
+                raise result.with_traceback(None)
+            return result
+
+        return cached_number_to_float
 
     def execute(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
         logs = list()
-        # Recuperamos el field_name y verificamos si existe en el record
-        field_name = self.parameters.get('field_name')
-        value = record.get(field_name)
-        # Si el campo no existe establecemos en None y registramos el log
-        if value is None:
-            record[field_name] = None
-            logs.append({
-                "type": "WARNING",
-                "operation": self.__class__.__name__,
-                "field": f"{field_name}",
-                "message": f"El campo no existe."                
-            })
-        else:
+        record = self.compiled()(record, logs)
+        return record, logs
+
+    def _compile_decision(self, number_to_float: Callable[[any], float | None]) -> Callable[[any], tuple[any, LogEntry | None]]:
+        """
+        Decisión de la operación sobre el valor del campo (ver Operation._compile_field_step).
+
+        Args:
+            number_to_float (Callable[[any], float | None]): Conversión a usar (ver _compile_converter).
+        """
+        operation_name = intern(self.__class__.__name__)
+        field = intern(f"{self.parameters.get('field_name')}")
+
+        def decide(value: any) -> tuple[any, LogEntry | None]:
+            # Si el campo no existe establecemos en None y registramos el log
+            if value is None:
+                return None, LogEntry(WARNING, FIELD_MISSING, operation_name, field)
             # Realizamos la conversión. Si falla registramos el log y establecemos el campo en None
             try:
-                value_float = NormalizeAmountOperation.number_to_float(value)
-                if value_float:
-                    record[field_name] = value_float
-                # Si value es None, entonces el campo no es un numero valido 
+                value_float = number_to_float(value)
+            except Exception as e:
+                return None, LogEntry(ERROR, CONVERSION_ERROR, operation_name, field, e)
+            if value_float:
+                return value_float, None
+            # Si value es None, entonces el campo no es un numero valido
+            return None, LogEntry(WARNING, NOT_A_NUMBER, operation_name, field)
+
+        return decide
+
+    def compile(self) -> Callable[[dict[str, any], list], dict[str, any]]:
+        return self._compile_field_step(self._compile_decision(self._compile_converter()))
+
+    def compile_schema(self, schema: 'RecordSchema') -> Callable[['SchemaRecord', list], 'SchemaRecord']:
+        return self._compile_field_schema_step(self._compile_decision(self._compile_converter()), schema)
+
+    @property
+    def reads(self) -> frozenset[str]:
+        return frozenset((self.parameters.get('field_name'),))
+
+    @property
+    def writes(self) -> frozenset[str]:
+        # Reemplaza el valor del campo por el valor convertido
+        return frozenset((self.parameters.get('field_name'),))
+
+    def execute_batch(self, records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        return compile_batch_pipeline([self])(records)
+
+    def compile_batch(self) -> Callable[[list[dict[str, any]], list[list | None]], list[dict[str, any]]]:
+        scalar_batch_step = self._compile_field_batch(self._compile_decision(self._compile_converter()))
+        # Con caché (que ya evita repetir conversiones) se recorre el lote con la conversión registro a registro
+        if self.cache is not None:
+            return scalar_batch_step
+        field_name = self.parameters.get('field_name')
+        compile_decision = self._compile_decision
+        number_to_float_many = NormalizeAmountOperation.number_to_float_many
+        reason_valid = NormalizeAmountOperation.REASON_VALID
+        reason_missing = NormalizeAmountOperation.REASON_MISSING
+        reason_error = NormalizeAmountOperation.REASON_ERROR
+
+        def batch_step(records: list[dict[str, any]], logs: list[list | None]) -> list[dict[str, any]]:
+            # Sin numpy se recorre el lote con la conversión registro a registro
+            if len(records) < _MIN_VECTOR_BATCH or _numpy() is None:
+                return scalar_batch_step(records, logs)
+            # Se convierte la columna completa del lote con operaciones vectorizadas
+            conversion = number_to_float_many([record.get(field_name) for record in records])
+            values = conversion.values.tolist()
+            reasons = conversion.reasons.tolist()
+            errors = conversion.errors
+
+            def converted(index: int) -> float | None:
+                # Resultado ya convertido de la posición index, con la excepción de la conversión si falló
+                if reasons[index] == reason_error:
+                    raise errors[index]
+                return values[index] if reasons[index] == reason_valid else None
+
+            # Los registros no válidos se deciden con la misma función que la ruta escalar, sobre su posición
+            decide = compile_decision(converted)
+            for index, record in enumerate(records):
+                reason = reasons[index]
+                # Igual que en compile, el valor 0 se considera que no es un número
+                if reason == reason_valid and values[index]:
+                    record[field_name] = values[index]
+                    continue
+                record[field_name], entry = decide(None if reason == reason_missing else index)
+                if logs[index] is None:
+                    logs[index] = [entry]
                 else:
-                    record[field_name] = None
-                    logs.append({
-                        "type": "WARNING",
-                        "operation": self.__class__.__name__,
-                        "field": f"{field_name}",
-                        "message": f"El campo no es un número."                    
-                    })
+                    logs[index].append(entry)
+            return records
 
-            except Exception as e:
-                record[field_name] = None
-                logs.append({
-                    "type": "ERROR",
-                    "operation": self.__class__.__name__,
-                    "field": f"{field_name}",
-                    "message": f"Error en la conversión: {e}"                    
-                })
+        return batch_step
 
-        return record, logs
 
 if __name__ == '__main__':
     # Probar la conversión a float
@@ -164,6 +494,11 @@ if __name__ == '__main__':
     # for value in numeros_especiales:        
     #     print(value,"->", NormalizeAmountOperation.number_to_float(value))   
 
+    # Probar la conversión por lotes (requiere numpy)
+    # conversion = NormalizeAmountOperation.number_to_float_many(numeros_especiales)
+    # for value, number, reason in zip(numeros_especiales, conversion.values, conversion.reasons):
+    #     print(value, "->", number, reason)
+
     # Probar el método execute
     operation1 = NormalizeAmountOperation("price")
     record_example = {
@@ -0,0 +1,398 @@
+from datetime import date, datetime, timedelta, timezone
+from sys import intern
+from typing import TYPE_CHECKING, Callable, Iterable, NamedTuple
+from .operation import Operation, _UNCHANGED, _PASSED
+from .pipeline import compile_batch_pipeline
+from .normalize_amount_operation import _numpy, _MIN_VECTOR_BATCH
+from ..logs import LogEntry, WARNING, ERROR, FIELD_MISSING, INVALID_TIMESTAMP, CONVERSION_ERROR
+
+if TYPE_CHECKING:
+    import numpy as np
+    from ..records.schema import RecordSchema, SchemaRecord
+
+# Formatos de salida: segundos desde 1970-01-01T00:00:00Z (int) o datetime con zona horaria UTC
+OUTPUTS = ('epoch', 'datetime')
+
+UTC = timezone.utc
+_EPOCH = datetime(1970, 1, 1, tzinfo=UTC)
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+_SECOND = timedelta(seconds=1)
+
+# Marca para distinguir "no está en la caché" de una fecha inválida (None) guardada
+_NOT_CACHED = object()
+
+# Forma de la ruta rápida: 'YYYY-MM-DDTHH:MM:SSZ' (o con un espacio en lugar de la 'T').
+# Posiciones de los dígitos y de los separadores fijos
+_FAST_LENGTH = 20
+_DIGIT_POSITIONS = (0, 1, 2, 3, 5, 6, 8, 9, 11, 12, 14, 15, 17, 18)
+_SEPARATORS = {4: '-', 7: '-', 13: ':', 16: ':', 19: 'Z'}
+
+
+class BatchTimestamps(NamedTuple):
+    """
+    Resultado de convertir una columna completa con NormalizeTimestampOperation.timestamp_to_epoch_many.
+
+    Attributes:
+        values (numpy.ndarray): Segundos desde 1970-01-01T00:00:00Z (int64). Las entradas inválidas son 0.
+        valid (numpy.ndarray): Máscara booleana con las entradas convertidas correctamente.
+        reasons (numpy.ndarray): Código de resultado por índice (ver NormalizeTimestampOperation.REASON_*).
+        errors (dict[int, Exception]): Excepción de cada índice con código REASON_ERROR.
+    """
+    values: "np.ndarray"
+    valid: "np.ndarray"
+    reasons: "np.ndarray"
+    errors: dict[int, Exception]
+
+
+class NormalizeTimestampOperation(Operation):
+    """
+    Clase para normalizar un campo de fecha y hora ISO 8601.
+    Convierte a segundos desde 1970-01-01T00:00:00Z (int) o a datetime con zona horaria UTC.
+
+    La forma más común, 'YYYY-MM-DDTHH:MM:SSZ', tiene una ruta rápida: registro a registro se convierte directamente
+    con datetime.fromisoformat (implementado en C, más rápido que leer los campos por posición en Python), y por lotes
+    se leen los campos por posición con operaciones vectorizadas de numpy, validando cada fecha distinta una sola vez
+    con una caché de fechas (los registros de un flujo suelen concentrarse en pocos días). Los demás formatos
+    (fracciones de segundo, desplazamientos como +05:00, solo fecha, etc) se convierten con parse_timestamp; las
+    fechas y horas sin zona horaria se interpretan en UTC. También se aceptan valores ya normalizados: int o float
+    (segundos desde 1970) y datetime.
+
+    Attributes:
+        field_name (str): El campo donde se aplicara esta operación.
+        output (str): Formato de salida: 'epoch' (int) o 'datetime'. Por defecto es 'epoch'.
+        required (bool): Si el campo es obligatorio. Por defecto es True.
+        target_type (str): Tipo de registro donde se aplica esta operación. Por defecto esta vacío.
+        date_cache_size (int): Cantidad máxima de fechas memorizadas al procesar lotes. Por defecto es 4096 (0 desactiva la caché).
+    """
+
+    # Códigos de resultado por índice de timestamp_to_epoch_many
+    REASON_VALID = 0
+    # El valor es None (el campo no existe)
+    REASON_MISSING = 1
+    # El valor no es una fecha y hora válida
+    REASON_INVALID = 2
+    # La conversión lanza una excepción (por ejemplo, fuera del rango de datetime)
+    REASON_ERROR = 3
+
+    def __init__(self, field_name: str, output: str = 'epoch', required: bool = True, target_type: str = "", date_cache_size: int = 4096):
+        if output not in OUTPUTS:
+            raise Exception(f"El formato de salida debe ser uno de {OUTPUTS}.")
+        super().__init__(field_name=field_name, output=output, required=required, target_type=target_type, date_cache_size=date_cache_size)
+        # Caché de fechas de la instancia: año * 10000 + mes * 100 + día -> días desde 1970, o None si no es válida
+        self._date_cache = dict()
+
+    # Es estatico porque no depende de una instancia de la clase
+    @staticmethod
+    def parse_timestamp(value: any) -> datetime | None:
+        """
+        Convierte una fecha y hora en cualquier formato ISO 8601 admitido por datetime.fromisoformat a datetime en UTC.
+
+        Args:
+            value (any): Fecha y hora ISO 8601 (str), segundos desde 1970 (int o float) o datetime.
+                Las fechas y horas sin zona horaria se interpretan en UTC.
+
+        Returns:
+            datetime | None: Fecha y hora con zona horaria UTC, o None si el valor no es una fecha y hora válida.
+        """
+        if isinstance(value, datetime):
+            timestamp = value
+        elif isinstance(value, str):
+            try:
+                timestamp = datetime.fromisoformat(value.strip())
+            except ValueError:
+                return None
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            return datetime.fromtimestamp(value, UTC)
+        else:
+            return None
+        if timestamp.tzinfo is None:
+            return timestamp.replace(tzinfo=UTC)
+        return timestamp.astimezone(UTC)
+
+    # Es estatico porque no depende de una instancia de la clase
+    @staticmethod
+    def timestamp_to_epoch(value: any) -> int | None:
+        """
+        Convierte una fecha y hora a segundos desde 1970-01-01T00:00:00Z.
+
+        Args:
+            value (any): Fecha y hora (ver parse_timestamp).
+
+        Returns:
+            int | None: Segundos desde 1970 (se descartan las fracciones de segundo), o None si no es válida.
+        """
+        timestamp = NormalizeTimestampOperation.parse_timestamp(value)
+        if timestamp is None:
+            return None
+        return (timestamp - _EPOCH) // _SECOND
+
+    # Es estatico porque no depende de una instancia de la clase
+    @staticmethod
+    def timestamp_to_epoch_many(values: Iterable[any], date_cache: dict[int, int | None] | None = None, date_cache_size: int = 4096) -> BatchTimestamps:
+        """
+        Convierte una columna completa de fechas y horas a segundos desde 1970, con el mismo resultado que timestamp_to_epoch.
+
+        Las entradas con la forma 'YYYY-MM-DDTHH:MM:SSZ' se leen por posición con operaciones vectorizadas de numpy
+        sobre los códigos de sus caracteres. Cada fecha distinta de la columna se valida una sola vez (y, con
+        date_cache, una sola vez entre columnas). Las demás entradas se convierten una a una con timestamp_to_epoch.
+
+        Args:
+            values (Iterable[any]): Fechas y horas. None se reporta como REASON_MISSING.
+            date_cache (dict[int, int | None] | None): Caché de fechas a reutilizar entre llamadas. Por defecto no se usa.
+            date_cache_size (int): Cantidad máxima de fechas en date_cache; al llenarse se vacía. Por defecto es 4096.
+
+        Returns:
+            BatchTimestamps: Segundos desde 1970 (0 si no son válidos), máscara de validez, código de resultado por
+            índice y excepciones de las conversiones fallidas.
+        """
+        np = _numpy()
+        if np is None:
+            raise ImportError("timestamp_to_epoch_many requiere numpy. Instálelo con: pip install numpy")
+
+        values = list(values)
+        size = len(values)
+        epochs = np.zeros(size, dtype=np.int64)
+        reasons = np.full(size, NormalizeTimestampOperation.REASON_INVALID, dtype=np.int8)
+        errors = dict()
+        converted = np.zeros(size, dtype=bool)
+
+        indexes, codes = _fast_layout_codes(np, values)
+        if len(indexes):
+            ok = (codes[:, 10] == ord('T')) | (codes[:, 10] == ord(' '))
+            for position, separator in _SEPARATORS.items():
+                ok &= codes[:, position] == ord(separator)
+            # Los códigos son sin signo: los caracteres menores que '0' quedan como valores grandes
+            digits = codes[:, _DIGIT_POSITIONS] - ord('0')
+            ok &= (digits <= 9).all(axis=1)
+            digits = digits.astype(np.int64)
+            hour = digits[:, 8] * 10 + digits[:, 9]
+            minute = digits[:, 10] * 10 + digits[:, 11]
+            second = digits[:, 12] * 10 + digits[:, 13]
+            ok &= (hour < 24) & (minute < 60) & (second < 60)
+            # Cada fecha distinta se valida y se convierte a días desde 1970 una sola vez
+            dates = digits[:, 0] * 10000000 + digits[:, 1] * 1000000 + digits[:, 2] * 100000 + digits[:, 3] * 10000 \
+                + digits[:, 4] * 1000 + digits[:, 5] * 100 + digits[:, 6] * 10 + digits[:, 7]
+            unique_dates, inverse = np.unique(np.where(ok, dates, 0), return_inverse=True)
+            if date_cache is None:
+                date_cache = dict()
+            unique_days = list()
+            for key in unique_dates.tolist():
+                days = date_cache.get(key, _NOT_CACHED)
+                if days is _NOT_CACHED:
+                    days = _date_to_days(key)
+                    if date_cache_size:
+                        # La caché se vacía al llenarse: con pocas fechas distintas casi nunca ocurre
+                        if len(date_cache) >= date_cache_size:
+                            date_cache.clear()
+                        date_cache[key] = days
+                unique_days.append(days)
+            ok &= np.array([days is not None for days in unique_days], dtype=bool)[inverse]
+            days = np.array([days or 0 for days in unique_days], dtype=np.int64)[inverse]
+            valid_indexes = indexes[ok]
+            epochs[valid_indexes] = (days * 86400 + hour * 3600 + minute * 60 + second)[ok]
+            converted[valid_indexes] = True
+
+        # Las demás entradas (otros formatos o fechas inválidas) se convierten una a una
+        timestamp_to_epoch = NormalizeTimestampOperation.timestamp_to_epoch
+        for index in np.flatnonzero(~converted).tolist():
+            value = values[index]
+            if value is None:
+                reasons[index] = NormalizeTimestampOperation.REASON_MISSING
+                continue
+            try:
+                epoch = timestamp_to_epoch(value)
+            except Exception as e:
+                reasons[index] = NormalizeTimestampOperation.REASON_ERROR
+                errors[index] = e
+                continue
+            if epoch is not None:
+                epochs[index] = epoch
+                converted[index] = True
+        reasons[converted] = NormalizeTimestampOperation.REASON_VALID
+        return BatchTimestamps(epochs, converted, reasons, errors)
+
+    def date_cache_info(self) -> dict[str, int]:
+        """
+        Devuelve el tamaño de la caché de fechas.
+
+        Returns:
+            dict[str, int]: Cantidad de fechas memorizadas y cantidad máxima.
+        """
+        return {"size": len(self._date_cache), "maxsize": self.parameters.get('date_cache_size')}
+
+    def _compile_converter(self) -> Callable[[any], int | datetime | None]:
+        """
+        Devuelve la función de conversión: la ruta rápida con fromisoformat y, si no aplica, parse_timestamp.
+        La función devuelve None si el valor no es una fecha y hora válida.
+        """
+        as_epoch = self.parameters.get('output') == 'epoch'
+        fromisoformat = datetime.fromisoformat
+        parse_timestamp = NormalizeTimestampOperation.parse_timestamp
+
+        def convert(value: any) -> int | datetime | None:
+            # Ruta rápida: con la forma 'YYYY-MM-DDTHH:MM:SSZ' fromisoformat ya devuelve la zona horaria UTC
+            if value.__class__ is str and len(value) == 20 and value[19] == 'Z':
+                try:
+                    timestamp = fromisoformat(value)
+                except ValueError:
+                    timestamp = None
+                if timestamp is not None and timestamp.tzinfo is UTC:
+                    if not as_epoch:
+                        return timestamp
+                    # Sin fracciones de segundo el float de timestamp() es exacto y es más rápido que restar _EPOCH
+                    if not timestamp.microsecond:
+                        return int(timestamp.timestamp())
+            # Los demás formatos (y los inválidos, para devolver el mismo resultado) con parse_timestamp
+            timestamp = parse_timestamp(value)
+            if timestamp is None or not as_epoch:
+                return timestamp
+            return (timestamp - _EPOCH) // _SECOND
+
+        return convert
+
+    def execute(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
+        logs = list()
+        record = self.compiled()(record, logs)
+        return record, logs
+
+    def _compile_decision(self, convert: Callable[[any], int | datetime | None]) -> Callable[[any], tuple[any, LogEntry | None]]:
+        """
+        Decisión de la operación sobre el valor del campo (ver Operation._compile_field_step).
+
+        Args:
+            convert (Callable[[any], int | datetime | None]): Conversión a usar (ver _compile_converter).
+        """
+        required = self.parameters.get('required')
+        operation_name = intern(self.__class__.__name__)
+        field = intern(f"{self.parameters.get('field_name')}")
+
+        def decide(value: any) -> tuple[any, LogEntry | None]:
+            # Si el campo no existe y es obligatorio establecemos en None y registramos el log
+            if value is None:
+                if required:
+                    return None, LogEntry(WARNING, FIELD_MISSING, operation_name, field)
+                return _PASSED
+            # Realizamos la conversión. Si falla registramos el log y establecemos el campo en None
+            try:
+                result = convert(value)
+            except Exception as e:
+                return None, LogEntry(ERROR, CONVERSION_ERROR, operation_name, field, e)
+            # Si result es None, entonces el campo no es una fecha y hora válida
+            if result is None:
+                return None, LogEntry(WARNING, INVALID_TIMESTAMP, operation_name, field)
+            return result, None
+
+        return decide
+
+    def compile(self) -> Callable[[dict[str, any], list], dict[str, any]]:
+        return self._compile_field_step(self._compile_decision(self._compile_converter()))
+
+    def compile_schema(self, schema: 'RecordSchema') -> Callable[['SchemaRecord', list], 'SchemaRecord']:
+        return self._compile_field_schema_step(self._compile_decision(self._compile_converter()), schema)
+
+    @property
+    def reads(self) -> frozenset[str]:
+        return frozenset((self.parameters.get('field_name'),))
+
+    @property
+    def writes(self) -> frozenset[str]:
+        # Reemplaza el valor del campo por el valor convertido
+        return frozenset((self.parameters.get('field_name'),))
+
+    def execute_batch(self, records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        return compile_batch_pipeline([self])(records)
+
+    def compile_batch(self) -> Callable[[list[dict[str, any]], list[list | None]], list[dict[str, any]]]:
+        scalar_batch_step = self._compile_field_batch(self._compile_decision(self._compile_converter()))
+        # Los datetime se crean uno a uno: se recorre el lote con la conversión registro a registro
+        if self.parameters.get('output') != 'epoch':
+            return scalar_batch_step
+        field_name = self.parameters.get('field_name')
+        date_cache = self._date_cache
+        date_cache_size = self.parameters.get('date_cache_size')
+        compile_decision = self._compile_decision
+        timestamp_to_epoch_many = NormalizeTimestampOperation.timestamp_to_epoch_many
+        reason_valid = NormalizeTimestampOperation.REASON_VALID
+        reason_missing = NormalizeTimestampOperation.REASON_MISSING
+        reason_error = NormalizeTimestampOperation.REASON_ERROR
+
+        def batch_step(records: list[dict[str, any]], logs: list[list | None]) -> list[dict[str, any]]:
+            # Los lotes pequeños, o sin numpy, se recorren con la conversión registro a registro
+            if len(records) < _MIN_VECTOR_BATCH or _numpy() is None:
+                return scalar_batch_step(records, logs)
+            # Se convierte la columna completa del lote con operaciones vectorizadas
+            conversion = timestamp_to_epoch_many([record.get(field_name) for record in records], date_cache, date_cache_size)
+            values = conversion.values.tolist()
+            reasons = conversion.reasons.tolist()
+            errors = conversion.errors
+
+            def converted(index: int) -> int | None:
+                # Resultado ya convertido de la posición index, con la excepción de la conversión si falló
+                if reasons[index] == reason_error:
+                    raise errors[index]
+                return values[index] if reasons[index] == reason_valid else None
+
+            # Los registros no válidos se deciden con la misma función que la ruta escalar, sobre su posición
+            decide = compile_decision(converted)
+            for index, record in enumerate(records):
+                reason = reasons[index]
+                if reason == reason_valid:
+                    record[field_name] = values[index]
+                    continue
+                value, entry = decide(None if reason == reason_missing else index)
+                if value is not _UNCHANGED:
+                    record[field_name] = value
+                if entry is not None:
+                    if logs[index] is None:
+                        logs[index] = [entry]
+                    else:
+                        logs[index].append(entry)
+            return records
+
+        return batch_step
+
+
+def _fast_layout_codes(np: any, values: list[any]) -> tuple["np.ndarray", "np.ndarray"]:
+    """
+    Devuelve los índices de las cadenas de 20 caracteres y el código de cada uno de sus caracteres (una fila por cadena).
+    """
+    # Caso común: todas son cadenas ASCII de 20 caracteres, se convierten juntas en una sola operación
+    try:
+        if set(map(len, values)) == {_FAST_LENGTH}:
+            joined = ''.join(values)
+            if joined.isascii():
+                codes = np.frombuffer(joined.encode('ascii'), dtype=np.uint8).reshape(-1, _FAST_LENGTH)
+                return np.arange(len(values)), codes
+    except TypeError:
+        # Hay valores que no son cadenas (None, números, datetime, ...)
+        pass
+    candidates = [index for index, value in enumerate(values) if value.__class__ is str and len(value) == _FAST_LENGTH]
+    texts = np.array([values[index] for index in candidates], dtype=f'U{_FAST_LENGTH}')
+    return np.array(candidates, dtype=np.intp), texts.view(np.uint32).reshape(-1, _FAST_LENGTH)
+
+
+def _date_to_days(key: int) -> int | None:
+    """Valida una fecha año * 10000 + mes * 100 + día y devuelve los días desde 1970-01-01, o None si no es válida."""
+    try:
+        return date(key // 10000, key // 100 % 100, key % 100).toordinal() - _EPOCH_ORDINAL
+    except ValueError:
+        return None
+
+
+if __name__ == '__main__':
+    # Probar la conversión de fechas y horas
+    fechas = [
+        "2023-10-26T14:00:00Z",
+        "2023-10-26 14:00:00Z",
+        "2024-02-29T23:59:59Z",
+        "2023-02-29T10:00:00Z",
+        "2024-13-01T25:61:00Z",
+        "2023-10-26T14:00:00.250+02:00",
+        "2023-10-26",
+        "26/10/2023",
+        1698328800,
+    ]
+    operation = NormalizeTimestampOperation("timestamp")
+    for value in fechas:
+        record, logs = operation.execute({"timestamp": value})
+        print(value, "->", record["timestamp"], logs)
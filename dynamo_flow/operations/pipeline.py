@@ -0,0 +1,194 @@
+from typing import TYPE_CHECKING, Awaitable, Callable
+from .operation import Operation
+from ..logs import EMPTY_LOGS, ERROR, WARNING
+
+if TYPE_CHECKING:
+    from ..records.schema import RecordSchema
+
+# Niveles de log que detienen la cadena de operaciones de un registro según stop_on
+STOP_LEVELS = {
+    ERROR: frozenset((ERROR,)),
+    WARNING: frozenset((WARNING, ERROR)),
+}
+
+# Cantidad de registros que process_stream lee por adelantado para precargarlos (ver compile_prefetch_pipeline)
+PREFETCH_WINDOW = 512
+
+def compile_pipeline(operations: list[Operation], stop_on: str | None = None, schema: 'RecordSchema | None' = None) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+    """
+    Compila una lista de operaciones en una única función que procesa un registro.
+
+    Cada operación se compila una sola vez, por lo que al procesar un registro ya no se leen
+    sus parámetros ni se crea una lista de logs por cada operación. Los registros sin advertencias
+    ni errores comparten la lista vacía de solo lectura EMPTY_LOGS.
+
+    Con stop_on la cadena se corta en la primera operación que produce un log de ese nivel ('ERROR') o de nivel
+    'WARNING' o superior ('WARNING'): el registro queda como lo dejó esa operación y los logs indican la primera causa
+    por la que no es válido, sin gastar tiempo en las operaciones siguientes.
+
+    Args:
+        operations (list[Operation]): Lista de operaciones en el orden en que se deben ejecutar.
+        stop_on (str | None): Nivel de log que detiene la cadena ('ERROR' o 'WARNING'). Por defecto es None (se
+            ejecutan todas las operaciones).
+        schema (RecordSchema | None): Si se indica, la función recibe registros de ese esquema en lugar de
+            diccionarios y las operaciones se compilan con Operation.compile_schema.
+
+    Returns:
+        Callable[[dict[str, any]], tuple[dict[str, any], list]]: Función que recibe un registro y devuelve
+        el registro procesado y la lista de errores o advertencias.
+    """
+    if schema is None:
+        steps = tuple(operation.compile() for operation in operations)
+    else:
+        steps = tuple(operation.compile_schema(schema) for operation in operations)
+    if stop_on is not None:
+        return _compile_fail_fast(steps, check_stop_on(stop_on))
+
+    def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        logs = list()
+        for step in steps:
+            record = step(record, logs)
+        return record, logs or EMPTY_LOGS
+
+    return pipeline
+
+
+def compile_batch_pipeline(operations: list[Operation]) -> Callable[[list[dict[str, any]]], list[tuple[dict[str, any], list]]]:
+    """
+    Compila una lista de operaciones en una única función que procesa un lote de registros.
+
+    Cada operación recorre el lote completo antes de pasar a la siguiente (ver Operation.compile_batch), por lo que
+    las operaciones con una implementación por lotes reparten su costo entre todos los registros del lote.
+
+    Args:
+        operations (list[Operation]): Lista de operaciones en el orden en que se deben ejecutar.
+
+    Returns:
+        Callable[[list[dict[str, any]]], list[tuple[dict[str, any], list]]]: Función que recibe un lote de registros
+        y devuelve, en el mismo orden, cada registro procesado con su lista de errores o advertencias.
+    """
+    steps = tuple(operation.compile_batch() for operation in operations)
+
+    def batch_pipeline(records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        records = list(records)
+        logs = [None] * len(records)
+        for step in steps:
+            records = step(records, logs)
+        return [(record, entries or EMPTY_LOGS) for record, entries in zip(records, logs)]
+
+    return batch_pipeline
+
+
+def compile_prefetch_pipeline(operations: list[Operation]) -> Callable[[list[dict[str, any]]], None] | None:
+    """
+    Compila las precargas de una lista de operaciones (ver Operation.compile_prefetch) en una única función que recibe
+    una ventana de registros.
+
+    Solo se precargan las operaciones cuyo campo no modifica una operación anterior de la cadena: de lo contrario se
+    precargaría el valor anterior del campo y no el que la operación va a recibir. Una operación anterior que no
+    declara los campos que modifica (writes) desactiva la precarga de las siguientes.
+
+    Args:
+        operations (list[Operation]): Lista de operaciones en el orden en que se deben ejecutar.
+
+    Returns:
+        Callable[[list[dict[str, any]]], None] | None: Función de precarga de la cadena, o None si ninguna operación
+        precarga.
+    """
+    prefetchers = list()
+    written = set()
+    for operation in operations:
+        prefetch = operation.compile_prefetch()
+        if prefetch is not None and operation.parameters.get('field_name') not in written:
+            prefetchers.append(prefetch)
+        writes = operation.writes
+        if writes is None:
+            break
+        written.update(writes)
+    if not prefetchers:
+        return None
+    if len(prefetchers) == 1:
+        return prefetchers[0]
+    prefetchers = tuple(prefetchers)
+
+    def prefetch_pipeline(records: list[dict[str, any]]):
+        for prefetch in prefetchers:
+            prefetch(records)
+
+    return prefetch_pipeline
+
+
+def check_stop_on(stop_on: str) -> frozenset[str]:
+    """
+    Valida el nivel de stop_on y devuelve los niveles de log que detienen la cadena.
+
+    Args:
+        stop_on (str): Nivel de log: 'ERROR' o 'WARNING'.
+
+    Returns:
+        frozenset[str]: Niveles de log que detienen la cadena.
+    """
+    levels = STOP_LEVELS.get(stop_on)
+    if levels is None:
+        raise Exception(f"stop_on debe ser uno de {tuple(STOP_LEVELS)}.")
+    return levels
+
+
+def _compile_fail_fast(steps: tuple, levels: frozenset[str]) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+    """Compila las operaciones ya compiladas en una cadena que se corta en el primer log de uno de los niveles."""
+    if WARNING in levels:
+        # Cualquier log detiene la cadena
+        def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+            logs = list()
+            for step in steps:
+                record = step(record, logs)
+                if logs:
+                    return record, logs
+            return record, EMPTY_LOGS
+
+        return pipeline
+
+    def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        logs = list()
+        for step in steps:
+            produced = len(logs)
+            record = step(record, logs)
+            for index in range(produced, len(logs)):
+                if logs[index].type in levels:
+                    return record, logs
+        return record, logs or EMPTY_LOGS
+
+    return pipeline
+
+
+def compile_async_pipeline(operations: list[Operation]) -> Callable[[dict[str, any]], Awaitable[tuple[dict[str, any], list]]] | None:
+    """
+    Compila una lista de operaciones que contiene operaciones asíncronas en una única corrutina.
+
+    Las operaciones síncronas de la lista se ejecutan directamente dentro de la corrutina, sin crear tareas.
+
+    Args:
+        operations (list[Operation]): Lista de operaciones en el orden en que se deben ejecutar.
+
+    Returns:
+        Callable[[dict[str, any]], Awaitable[tuple[dict[str, any], list]]] | None: Corrutina que recibe un registro
+        y devuelve el registro procesado y la lista de errores o advertencias, o None si todas las operaciones son
+        síncronas (en ese caso se usa la función de compile_pipeline).
+    """
+    if not any(operation.is_async for operation in operations):
+        return None
+    steps = tuple(
+        (operation.compile_async(), True) if operation.is_async else (operation.compile(), False)
+        for operation in operations
+    )
+
+    async def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        logs = list()
+        for step, is_async in steps:
+            if is_async:
+                record = await step(record, logs)
+            else:
+                record = step(record, logs)
+        return record, logs or EMPTY_LOGS
+
+    return pipeline
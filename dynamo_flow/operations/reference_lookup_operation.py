@@ -0,0 +1,119 @@
+from sys import intern
+from typing import TYPE_CHECKING, Callable
+from .operation import Operation, _UNCHANGED, _PASSED
+from .pipeline import compile_batch_pipeline
+from ..lookup import ReferenceCatalog
+from ..logs import LogEntry, WARNING, ERROR, FIELD_REQUIRED, REFERENCE_NOT_FOUND, LOOKUP_ERROR
+
+if TYPE_CHECKING:
+    from ..records.schema import RecordSchema, SchemaRecord
+
+class ReferenceLookupOperation(Operation):
+    """
+    Clase para validar que el valor de un campo existe en un catálogo de referencia (por ejemplo, una tabla SQLite).
+
+    Con process_stream (y process_jsonl o process_stream_threaded) los valores se precargan por ventanas de
+    PREFETCH_WINDOW registros (ver compile_prefetch): los que no están en las cachés del catálogo se resuelven juntos
+    con pocas consultas IN (...) y después cada registro se valida en las cachés. Con process_stream_batched se reúnen
+    los valores de todo el lote de la misma forma. Para que la precarga sirva, la caché positiva y la negativa del
+    catálogo deben tener lugar al menos para una ventana de claves.
+
+    Attributes:
+        field_name (str): El campo donde se aplicara esta operación.
+        catalog (ReferenceCatalog): Catálogo de referencia donde se buscan los valores del campo.
+        required (bool): Si el campo es obligatorio. Por defecto es True. Si no lo es, solo se validan los valores presentes.
+        target_type (str): Tipo de registro donde se aplica esta operación. Por defecto esta vacío.
+    """
+
+    def __init__(self, field_name: str, catalog: ReferenceCatalog, required: bool = True, target_type: str = ""):
+        super().__init__(field_name=field_name, catalog=catalog, required=required, target_type=target_type)
+
+    def execute(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
+        logs = list()
+        record = self.compiled()(record, logs)
+        return record, logs
+
+    def _compile_decision(self, contains: Callable[[any], bool]) -> Callable[[any], tuple[any, LogEntry | None]]:
+        """
+        Decisión de la operación sobre el valor del campo (ver Operation._compile_field_step). No modifica el campo.
+
+        Args:
+            contains (Callable[[any], bool]): Función que indica si un valor existe en el catálogo.
+        """
+        required = self.parameters.get('required')
+        operation_name = intern(self.__class__.__name__)
+        field = intern(f"{self.parameters.get('field_name')}")
+
+        def decide(value: any) -> tuple[any, LogEntry | None]:
+            if value is None:
+                if required:
+                    return _UNCHANGED, LogEntry(WARNING, FIELD_REQUIRED, operation_name, field)
+                return _PASSED
+            try:
+                if contains(value):
+                    return _PASSED
+                return _UNCHANGED, LogEntry(WARNING, REFERENCE_NOT_FOUND, operation_name, field)
+            except Exception as e:
+                return _UNCHANGED, LogEntry(ERROR, LOOKUP_ERROR, operation_name, field, e)
+
+        return decide
+
+    def compile(self) -> Callable[[dict[str, any], list], dict[str, any]]:
+        return self._compile_field_step(self._compile_decision(self.parameters.get('catalog').contains))
+
+    def compile_schema(self, schema: 'RecordSchema') -> Callable[['SchemaRecord', list], 'SchemaRecord']:
+        return self._compile_field_schema_step(self._compile_decision(self.parameters.get('catalog').contains), schema)
+
+    def compile_prefetch(self) -> Callable[[list[dict[str, any]]], None]:
+        field_name = self.parameters.get('field_name')
+        resolve = self.parameters.get('catalog').resolve
+
+        def prefetch(records: list[dict[str, any]]):
+            # Resolver la ventana deja sus claves en las cachés del catálogo, donde las busca la función de compile
+            try:
+                resolve(value for record in records if (value := record.get(field_name)) is not None)
+            except Exception:
+                # El error se registra al validar cada registro, que vuelve a consultar su valor
+                pass
+
+        return prefetch
+
+    @property
+    def reads(self) -> frozenset[str]:
+        return frozenset((self.parameters.get('field_name'),))
+
+    @property
+    def writes(self) -> frozenset[str]:
+        # Solo valida el campo: no modifica el registro
+        return frozenset()
+
+    def execute_batch(self, records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        return compile_batch_pipeline([self])(records)
+
+    def compile_batch(self) -> Callable[[list[dict[str, any]], list[list | None]], list[dict[str, any]]]:
+        # Recuperamos los atributos de la operación una sola vez y quedan como variables locales
+        field_name = self.parameters.get('field_name')
+        resolve = self.parameters.get('catalog').resolve
+        compile_field_batch = self._compile_field_batch
+        compile_decision = self._compile_decision
+
+        def batch_step(records: list[dict[str, any]], logs: list[list | None]) -> list[dict[str, any]]:
+            # Se resuelven juntos todos los valores del lote
+            try:
+                found = resolve(value for record in records if (value := record.get(field_name)) is not None)
+                # Los valores no hashables no se pueden buscar en el catálogo: found[value] lanza TypeError
+                contains = found.__getitem__
+            except Exception as e:
+                contains = _raiser(e)
+            # Cada registro se decide con la misma función que la ruta registro a registro
+            return compile_field_batch(compile_decision(contains))(records, logs)
+
+        return batch_step
+
+
+def _raiser(error: Exception) -> Callable[[any], bool]:
+    """Devuelve una función que lanza error, para registrar el mismo error de consulta en todos los registros de un lote."""
+    def contains(value: any) -> bool:
+        raise error.with_traceback(None)
+
+    return contains
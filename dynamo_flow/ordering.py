@@ -0,0 +1,338 @@
+import time
+from threading import Lock
+from typing import Callable, Iterable
+from dynamo_flow.operations.operation import Operation
+from .operations.pipeline import check_stop_on
+from .logs import EMPTY_LOGS, WARNING
+
+
+# Mejora mínima del costo esperado por registro para cambiar el orden de una cadena
+MIN_IMPROVEMENT = 0.01
+
+
+class _ChainState:
+    """Estadísticas y orden vigente de la cadena de un tipo de registro para un nivel de stop_on."""
+
+    __slots__ = (
+        'operations', 'labels', 'levels', 'steps', 'after', 'order', 'current', 'countdown',
+        'calls', 'time_ns', 'failures', 'samples', 'pending', 'reorders', 'declared_cost_ns', 'cost_ns', 'sampling_ns',
+    )
+
+    def __init__(self, operations: tuple[Operation, ...], stop_on: str):
+        self.operations = operations
+        self.labels = tuple(_label(operation) for operation in operations)
+        self.levels = check_stop_on(stop_on)
+        # Operaciones compiladas en el orden declarado
+        self.steps = tuple(operation.compile() for operation in operations)
+        # Por cada operación, las operaciones anteriores que deben ejecutarse antes que ella
+        self.after = tuple(
+            frozenset(index for index in range(position) if _depends(operations[index], operation))
+            for position, operation in enumerate(operations)
+        )
+        self.order = tuple(range(len(operations)))
+        # Operaciones compiladas en el orden vigente; se reemplaza con una sola asignación al cambiar el orden
+        self.current = [self.steps]
+        self.countdown = [1]
+        self.calls = 0.0
+        self.time_ns = [0.0] * len(operations)
+        self.failures = [0.0] * len(operations)
+        self.samples = 0
+        self.pending = 0
+        self.reorders = 0
+        self.declared_cost_ns = 0
+        self.cost_ns = 0
+        self.sampling_ns = 0
+
+
+class AdaptiveOrdering:
+    """
+    Reordenamiento adaptativo de las cadenas de operaciones que se cortan en el primer log (stop_on).
+
+    Con stop_on la cadena de un registro inválido se detiene en la primera operación que falla, por lo que conviene
+    ejecutar primero las operaciones baratas con más probabilidad de fallar. Por cada tipo de registro se mide, sobre
+    una muestra sistemática de los registros (uno de cada 1 / sample_rate), el tiempo medio de cada operación y la
+    probabilidad de que produzca un log del nivel de stop_on. Para medirlas, cada registro muestreado se procesa con
+    el orden vigente midiendo cada operación y, si la cadena se corta, las operaciones que no llegaron a ejecutarse se
+    ejecutan después sobre una copia del registro, que se descarta. Así cada operación se ejecuta a lo sumo una vez
+    más por registro muestreado, y solo las que el orden vigente no alcanzó.
+
+    Cada reorder_every registros muestreados se recalcula el orden: entre las operaciones que ya pueden ejecutarse se
+    elige la de menor tiempo medio dividido por su probabilidad de fallar, y el orden nuevo se adopta si su costo
+    esperado por registro es al menos MIN_IMPROVEMENT menor que el del vigente. Solo se adelanta una operación sobre
+    otra anterior si son independientes según sus reads y writes (ver Operation.reads): una operación que modifica un
+    campo que otra lee, o cuyos campos no se conocen, mantiene el orden declarado respecto de ellas. Después de cada
+    recálculo los contadores se reducen a la mitad, para seguir los cambios en los datos del flujo.
+
+    El orden no cambia si un registro es válido (si tiene logs), pero sí cuál es el primer log informado y qué
+    operaciones alcanzaron a modificar un registro inválido. Desactivado (por defecto en RecordContextManager), las
+    cadenas se ejecutan siempre en el orden declarado.
+
+    Los contadores se actualizan con un bloqueo solo en los registros muestreados, por lo que una instancia se puede
+    usar desde varios hilos (process_stream_threaded).
+
+    Attributes:
+        sample_rate (float): Proporción de registros muestreados, entre 0 (excluido) y 1.
+        reorder_every (int): Registros muestreados de un tipo entre dos recálculos de su orden.
+    """
+
+    def __init__(self, sample_rate: float = 0.01, reorder_every: int = 100):
+        """Inicializa el reordenamiento sin estadísticas"""
+        if not 0 < sample_rate <= 1:
+            raise Exception("La tasa de muestreo debe estar entre 0 (excluido) y 1.")
+        if reorder_every < 1:
+            raise Exception("reorder_every debe ser al menos 1.")
+        self.sample_rate = sample_rate
+        self.reorder_every = reorder_every
+        self._interval = max(1, round(1 / sample_rate))
+        self._lock = Lock()
+        self._states = dict()
+
+    def wrap(self, record_type: str, operations: Iterable[Operation], stop_on: str) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+        """
+        Compila la cadena de un tipo de registro con stop_on, en el orden aprendido hasta el momento.
+
+        Las estadísticas se conservan entre flujos mientras las operaciones del tipo de registro no cambien.
+
+        Args:
+            record_type (str): Tipo de registro.
+            operations (Iterable[Operation]): Operaciones en el orden declarado.
+            stop_on (str): Nivel de log que detiene la cadena ('ERROR' o 'WARNING').
+
+        Returns:
+            Callable[[dict[str, any]], tuple[dict[str, any], list]]: Función que recibe un registro y devuelve
+            el registro procesado y la lista de errores o advertencias.
+        """
+        operations = tuple(operations)
+        key = (record_type, stop_on)
+        with self._lock:
+            state = self._states.get(key)
+            if state is None or state.operations != operations:
+                state = self._states[key] = _ChainState(operations, stop_on)
+        return _compile_adaptive(state, self._interval, self._sample)
+
+    def _sample(self, state: _ChainState, record: dict[str, any]) -> tuple[dict[str, any], list]:
+        """
+        Procesa un registro muestreado con el orden vigente midiendo cada operación y, si la cadena se corta, mide las
+        operaciones restantes sobre una copia del registro.
+        """
+        clock = time.perf_counter_ns
+        levels = state.levels
+        steps = state.steps
+        order = state.order
+        times = [0] * len(steps)
+        failed = [False] * len(steps)
+        logs = list()
+        start = clock()
+        for position, index in enumerate(order):
+            produced = len(logs)
+            begin = clock()
+            record = steps[index](record, logs)
+            times[index] = clock() - begin
+            if any(logs[entry].type in levels for entry in range(produced, len(logs))):
+                failed[index] = True
+                break
+        else:
+            position = len(order)
+        # Las operaciones que la cadena no alcanzó se miden sobre una copia, para no modificar el registro procesado
+        remaining = order[position + 1:]
+        if remaining:
+            measured = dict(record)
+            scratch = list()
+            for index in remaining:
+                produced = len(scratch)
+                begin = clock()
+                measured = steps[index](measured, scratch)
+                times[index] = clock() - begin
+                failed[index] = any(scratch[entry].type in levels for entry in range(produced, len(scratch)))
+        # Costo del muestreo: todo lo que tardó el registro además de su cadena con el orden vigente
+        sampling = clock() - start - _chain_cost(order, times, failed)
+        with self._lock:
+            self._observe(state, order, times, failed, sampling)
+        return record, logs or EMPTY_LOGS
+
+    def _observe(self, state: _ChainState, order: tuple[int, ...], times: list[int], failed: list[bool], sampling: int):
+        """Acumula las mediciones de un registro muestreado y recalcula el orden cada reorder_every muestras."""
+        state.calls += 1
+        for index, elapsed in enumerate(times):
+            state.time_ns[index] += elapsed
+            state.failures[index] += failed[index]
+        state.samples += 1
+        state.declared_cost_ns += _chain_cost(range(len(times)), times, failed)
+        state.cost_ns += _chain_cost(order, times, failed)
+        state.sampling_ns += max(sampling, 0)
+        state.pending += 1
+        if state.pending >= self.reorder_every:
+            state.pending = 0
+            self._reorder(state)
+
+    @staticmethod
+    def _reorder(state: _ChainState):
+        """Recalcula el orden de la cadena y lo adopta si mejora el costo esperado."""
+        means = [value / state.calls for value in state.time_ns]
+        # Probabilidad de fallar suavizada, para no descartar una operación que todavía no falló
+        probabilities = [(value + 1) / (state.calls + 2) for value in state.failures]
+        ranks = [mean / probability for mean, probability in zip(means, probabilities)]
+        order = list()
+        placed = set()
+        remaining = list(range(len(state.operations)))
+        while remaining:
+            # Entre las operaciones cuyas dependencias ya están ubicadas, la de menor rango (o la declarada antes)
+            ready = [index for index in remaining if state.after[index] <= placed]
+            best = min(ready, key=lambda index: (ranks[index], index))
+            order.append(best)
+            placed.add(best)
+            remaining.remove(best)
+        order = tuple(order)
+        # Solo se cambia el orden si el costo esperado mejora lo suficiente (no se alterna entre órdenes equivalentes)
+        if order != state.order and _expected_cost(order, means, probabilities) < \
+                (1 - MIN_IMPROVEMENT) * _expected_cost(state.order, means, probabilities):
+            state.current[0] = tuple(state.steps[index] for index in order)
+            state.order = order
+            state.reorders += 1
+        state.calls /= 2
+        state.time_ns = [value / 2 for value in state.time_ns]
+        state.failures = [value / 2 for value in state.failures]
+
+    def ordered_operations(self, record_type: str, stop_on: str = 'WARNING') -> list[Operation] | None:
+        """
+        Devuelve las operaciones de un tipo de registro en el orden elegido, por ejemplo para fijarlo con
+        RecordContextManager.register_context y procesar con ese orden de forma determinista.
+
+        Args:
+            record_type (str): Tipo de registro.
+            stop_on (str): Nivel de stop_on de la cadena. Por defecto es 'WARNING'.
+
+        Returns:
+            list[Operation] | None: Operaciones en el orden elegido, o None si todavía no se procesó el tipo.
+        """
+        state = self._states.get((record_type, stop_on))
+        if state is None:
+            return None
+        return [state.operations[index] for index in state.order]
+
+    def reset(self):
+        """Descarta las estadísticas y los órdenes aprendidos (los flujos nuevos empiezan con el orden declarado)."""
+        with self._lock:
+            self._states = dict()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve el orden elegido y las mediciones de cada cadena.
+
+        El costo por registro se calcula sobre los registros muestreados, con los tiempos medidos de cada operación
+        hasta la primera que falla: con el orden declarado (declared_cost_ns) y con el orden vigente al procesar
+        cada registro (cost_ns). sampling_cost_ns es el costo del muestreo repartido entre todos los registros
+        procesados (la medición y las operaciones restantes de los registros muestreados). savings es la proporción
+        del costo declarado que se ahorró, descontando el costo del muestreo (puede ser negativa).
+
+        Returns:
+            dict[str, any]: sample_rate, reorder_every y, por tipo de registro y nivel de stop_on, los registros
+            muestreados, la cantidad de cambios de orden, el orden declarado y el elegido, el tiempo medio y la
+            probabilidad de fallar de cada operación, y los costos por registro.
+        """
+        record_types = dict()
+        with self._lock:
+            for (record_type, stop_on), state in self._states.items():
+                samples = state.samples
+                calls = state.calls or 1
+                declared_cost = state.declared_cost_ns / samples if samples else 0.0
+                cost = state.cost_ns / samples if samples else 0.0
+                # Se muestrea uno de cada _interval registros
+                sampling_cost = state.sampling_ns / (samples * self._interval) if samples else 0.0
+                record_types.setdefault(record_type, dict())[stop_on] = {
+                    "samples": samples,
+                    "reorders": state.reorders,
+                    "declared_order": list(state.labels),
+                    "order": [state.labels[index] for index in state.order],
+                    "operations": [
+                        {
+                            "operation": label,
+                            "mean_time_ns": state.time_ns[index] / calls,
+                            "failure_rate": state.failures[index] / calls,
+                        }
+                        for index, label in enumerate(state.labels)
+                    ],
+                    "declared_cost_ns": declared_cost,
+                    "cost_ns": cost,
+                    "sampling_cost_ns": sampling_cost,
+                    "savings": 1 - (cost + sampling_cost) / declared_cost if declared_cost else 0.0,
+                }
+        return {"sample_rate": self.sample_rate, "reorder_every": self.reorder_every, "record_types": record_types}
+
+
+def _compile_adaptive(state: _ChainState, interval: int, sample: Callable) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+    """
+    Compila la cadena con el orden vigente de state, que se corta igual que las de compile_pipeline con stop_on, y
+    procesa uno de cada interval registros con sample, que además los mide.
+    """
+    countdown = state.countdown
+    current = state.current
+    levels = state.levels
+    # El recorrido de las operaciones se repite aquí (en lugar de llamar a una cadena de compile_pipeline) para no
+    # agregar una llamada por registro
+    if WARNING in levels:
+        def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+            countdown[0] -= 1
+            if countdown[0] <= 0:
+                countdown[0] = interval
+                return sample(state, record)
+            logs = list()
+            for step in current[0]:
+                record = step(record, logs)
+                if logs:
+                    return record, logs
+            return record, EMPTY_LOGS
+
+        return pipeline
+
+    def pipeline(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        countdown[0] -= 1
+        if countdown[0] <= 0:
+            countdown[0] = interval
+            return sample(state, record)
+        logs = list()
+        for step in current[0]:
+            produced = len(logs)
+            record = step(record, logs)
+            for index in range(produced, len(logs)):
+                if logs[index].type in levels:
+                    return record, logs
+        return record, logs or EMPTY_LOGS
+
+    return pipeline
+
+
+def _depends(first: Operation, second: Operation) -> bool:
+    """Indica si second debe ejecutarse después de first (first está antes en el orden declarado)."""
+    first_reads, first_writes = first.reads, first.writes
+    second_reads, second_writes = second.reads, second.writes
+    if first_reads is None or first_writes is None or second_reads is None or second_writes is None:
+        return True
+    return bool(first_writes & (second_reads | second_writes) or second_writes & first_reads)
+
+
+def _chain_cost(order: Iterable[int], times: list[int], failed: list[bool]) -> int:
+    """Tiempo de la cadena con un orden hasta la primera operación que falla (incluida)."""
+    cost = 0
+    for index in order:
+        cost += times[index]
+        if failed[index]:
+            break
+    return cost
+
+
+def _expected_cost(order: Iterable[int], means: list[float], probabilities: list[float]) -> float:
+    """Costo esperado de la cadena con un orden, suponiendo que las operaciones fallan de forma independiente."""
+    cost = 0.0
+    reached = 1.0
+    for index in order:
+        cost += reached * means[index]
+        reached *= 1 - probabilities[index]
+    return cost
+
+
+def _label(operation: Operation) -> str:
+    """Nombre de la operación con su campo, por ejemplo 'NormalizeAmountOperation(amount)'."""
+    name = type(operation).__name__
+    field = operation.parameters.get('field_name') if hasattr(operation, 'parameters') else None
+    return f"{name}({field})" if field is not None else name
@@ -0,0 +1,181 @@
+import pickle
+from collections import deque
+from itertools import islice
+from typing import TYPE_CHECKING, Callable, Generator, Iterable
+from .logs import LogEntry, ERROR, INVALID_JSON
+from .streams.mmap_jsonl import read_jsonl_mmap
+
+# multiprocessing y concurrent.futures tardan en importarse y solo se usan con los pools:
+# se importan al usarse por primera vez, para no hacer más lento el inicio de los procesos que no los usan
+if TYPE_CHECKING:
+    import multiprocessing
+    from concurrent.futures import Executor, Future
+
+# Gestor de registros de cada proceso trabajador. Se crea una sola vez al iniciar el pool.
+_worker_manager = None
+_worker_default = True
+
+
+def chunked(records: Iterable[dict[str, any]], chunk_size: int) -> Generator[list[dict[str, any]], None, None]:
+    """
+    Agrupa un iterable de registros en listas de tamaño chunk_size (la última puede ser menor).
+
+    Args:
+        records (Iterable[dict[str, any]]): Registros a agrupar.
+        chunk_size (int): Cantidad de registros por grupo.
+
+    Returns:
+        Generator: Generador de listas de registros.
+    """
+    if chunk_size <= 0:
+        raise Exception("El tamaño de los bloques debe ser mayor que cero.")
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
+
+
+def map_chunks(executor: 'Executor', function: Callable[[list], list], chunks: Iterable[list], ordered: bool = True, max_pending: int = 4) -> Generator[any, None, None]:
+    """
+    Ejecuta function sobre cada bloque en el executor y devuelve los elementos de cada resultado.
+
+    Solo se mantienen max_pending bloques en vuelo, de modo que la entrada se consume a medida que se entregan resultados.
+
+    Args:
+        executor (Executor): Pool de procesos o de hilos.
+        function (Callable[[list], list]): Función que procesa un bloque y devuelve una lista de resultados.
+        chunks (Iterable[list]): Bloques a procesar.
+        ordered (bool): Si los resultados se entregan en el orden de entrada (True) o en el orden en que terminan (False).
+        max_pending (int): Cantidad máxima de bloques enviados y aún no entregados.
+
+    Returns:
+        Generator: Generador con los elementos de los resultados de cada bloque.
+    """
+    pending = deque() if ordered else set()
+    try:
+        for chunk in chunks:
+            if len(pending) >= max_pending:
+                yield from _take_finished(pending, ordered)
+            future = executor.submit(function, chunk)
+            if ordered:
+                pending.append(future)
+            else:
+                pending.add(future)
+        while pending:
+            yield from _take_finished(pending, ordered)
+    finally:
+        # Si el consumidor se detiene antes de terminar, se cancelan los bloques pendientes
+        for future in pending:
+            future.cancel()
+
+
+def _take_finished(pending: 'deque[Future] | set[Future]', ordered: bool) -> Generator[any, None, None]:
+    """Espera y entrega el siguiente bloque en orden de entrada, o todos los que ya terminaron."""
+    if ordered:
+        yield from pending.popleft().result()
+        return
+    from concurrent.futures import FIRST_COMPLETED, wait
+    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+    for future in done:
+        pending.discard(future)
+        yield from future.result()
+
+
+def process_pool_context(start_method: str | None = None) -> 'multiprocessing.context.BaseContext':
+    """
+    Devuelve el contexto de multiprocessing para el pool de procesos.
+
+    Sin start_method se usa el método de inicio por defecto de la plataforma ('fork' en Linux hasta Python 3.13,
+    'forkserver' desde 3.14 y 'spawn' en macOS y Windows). No se fuerza 'fork': copia el proceso con el estado de los
+    hilos que estén en ejecución (por ejemplo, bloqueos tomados por otro hilo), lo que puede bloquear a los
+    trabajadores. Con 'fork' los procesos heredan la configuración sin serializarla y se admiten condiciones definidas
+    con lambdas; con 'spawn' y 'forkserver' la configuración debe poder serializarse con pickle (ver check_picklable).
+
+    Args:
+        start_method (str | None): 'fork', 'forkserver' o 'spawn', o None para el método por defecto.
+    """
+    import multiprocessing
+    return multiprocessing.get_context(start_method)
+
+
+def check_picklable(config: any):
+    """
+    Verifica que la configuración se puede enviar a procesos iniciados con 'spawn' o 'forkserver'.
+
+    Args:
+        config (any): Configuración a enviar a los procesos.
+    """
+    try:
+        pickle.dumps(config)
+    except Exception as e:
+        raise Exception(
+            f"La configuración de operaciones no se puede serializar para enviarla a los procesos ({e}). "
+            "Use condiciones definidas con funciones de módulo en lugar de lambdas, o el método de inicio 'fork' (start_method)."
+        )
+
+
+def init_worker(record_config: dict[str, list], default_config: dict[str, list], default: bool):
+    """
+    Inicializa el gestor de registros de un proceso trabajador con la configuración del proceso principal.
+
+    Args:
+        record_config (dict[str, list[Operation]]): Operaciones asignadas manualmente por tipo de registro.
+        default_config (dict[str, list[Operation]]): Operaciones por defecto por tipo de registro.
+        default (bool): Si se aplican las operaciones por defecto.
+    """
+    # Se importa aquí para evitar una importación circular con record_context_manager
+    from .record_context_manager import RecordContextManager
+    from .config_snapshot import CompiledChain
+
+    global _worker_manager, _worker_default
+    _worker_manager = RecordContextManager(dict(record_config))
+    # Las operaciones por defecto del proceso trabajador quedan iguales a las del proceso principal
+    defaults = _worker_manager.get_default_operations()
+    for record_type in defaults:
+        if record_type not in default_config:
+            _worker_manager.delete_default_record(record_type)
+    for record_type, operations in default_config.items():
+        if record_type in defaults:
+            _worker_manager.set_default_record(record_type, operations)
+        else:
+            # Tipo registrado en el proceso principal después de iniciarse (por ejemplo con registry.record_types.
+            # register): con 'spawn' o 'forkserver' el registro del trabajador no lo conoce, y se instala su cadena
+            RecordContextManager._install_default_chain(record_type, CompiledChain(operations))
+    _worker_default = default
+
+
+def process_chunk(records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+    """
+    Procesa un bloque de registros en un proceso trabajador.
+
+    Args:
+        records (list[dict[str, any]]): Bloque de registros.
+
+    Returns:
+        list[tuple[dict[str, any], list]]: Registros procesados con su lista de errores o advertencias.
+    """
+    return list(_worker_manager.process_stream(records, default=_worker_default))
+
+
+def process_shard(shard: tuple[str, int, int]) -> list[tuple[int, dict[str, any] | None, list]]:
+    """
+    Decodifica y procesa un fragmento de un archivo JSON Lines en un proceso trabajador.
+
+    Args:
+        shard (tuple[str, int, int]): Ruta del archivo y posiciones en bytes (start, end) del fragmento.
+
+    Returns:
+        list[tuple[int, dict[str, any] | None, list]]: Por cada línea no vacía, su posición en bytes, el registro
+        procesado (None si la línea no es JSON válido) y la lista de errores o advertencias.
+    """
+    path, start, end = shard
+    results = list()
+
+    # Las líneas ilegibles se agregan en su lugar: on_error se llama antes de leer el registro siguiente
+    def on_error(offset: int, line: bytes, error: Exception):
+        results.append((offset, None, [LogEntry(ERROR, INVALID_JSON, detail=error)]))
+
+    offsets = deque()
+    records = read_jsonl_mmap(path, start, end, on_error=on_error, offsets=offsets)
+    for record, logs in _worker_manager.process_stream(records, default=_worker_default):
+        results.append((offsets.popleft(), record, logs))
+    return results
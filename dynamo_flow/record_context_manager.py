@@ -1,93 +1,885 @@
-from typing import Generator
+import copy
+import os
+import time
+from collections import deque
+from contextlib import nullcontext
+from functools import partial
+from itertools import islice
+from threading import Lock
+from typing import TYPE_CHECKING, AsyncGenerator, AsyncIterable, BinaryIO, Callable, Generator, Iterable, Mapping
 from dynamo_flow.operations.operation import Operation
-from .operations import NormalizeAmountOperation
-from .operations import ContextualFieldValidation
-from .records import OrderEventRecord
-from .records import ProductoUpdateRecord
+from .operations.pipeline import PREFETCH_WINDOW, check_stop_on, compile_pipeline
+from . import registry
+from .metrics import Metrics, DEFAULT_BUCKETS
+from .streams.jsonl import BUFFER_SIZE, read_jsonl
+from .streams.mmap_jsonl import SHARD_SIZE, shard_offsets
+from .logs import LogEntry, WARNING, ERROR, INVALID_RECORD, NO_OPERATIONS, NOT_VALIDATED, INVALID_JSON, DUPLICATE_RECORD
+from .budget import ErrorBudget, ErrorBudgetExceeded
+from .cache import LRUCache
+from .config_snapshot import ConfigSnapshot, CompiledChain
+
+# asyncio, concurrent.futures y parallel (que importa pickle) tardan en importarse y solo los usan algunos modos de
+# procesamiento: se importan al usarse por primera vez (process_stream_async, process_stream_parallel, ...)
+if TYPE_CHECKING:
+    import asyncio
+    from .checkpoint import Checkpoint
+    from .sinks import RoutingSink
+    from .summary import StreamSummary
+    from .records.schema import SchemaRecord
+    from .dedup import Deduplicator
+    from .ordering import AdaptiveOrdering
 
 class RecordContextManager:
     """
     Clase principal responsable de registrar contextos de registro y procesar flujos de registros.
 
+    La configuración de operaciones (la asignada manualmente y la por defecto) se guarda en instantáneas inmutables
+    (ver ConfigSnapshot): cada flujo fija la instantánea vigente al llamarse y la usa hasta terminar, y los cambios de
+    configuración reemplazan la instantánea con una sola asignación. Por eso varios hilos pueden procesar flujos con el
+    mismo gestor (o con varios gestores) mientras otro cambia la configuración, sin bloqueos al procesar los registros.
+
     Attributes:
-        recod_config (dict[str, list[Operation]]): Diccionario de la lista de operaciones por cada tipo de registro
+        record_config (dict[str, list[Operation]]): Copia del diccionario de la lista de operaciones por cada tipo de registro
+        metrics (Metrics | None): Métricas de process_stream, o None si no están activadas (ver enable_metrics).
+        result_cache (LRUCache | None): Caché de resultados de process_stream, o None si no está activada (ver enable_result_cache).
+        deduplicator (Deduplicator | None): Detector de registros repetidos, o None si no está activado (ver enable_deduplication).
+        adaptive_ordering (AdaptiveOrdering | None): Reordenamiento de las cadenas con stop_on, o None si no está activado (ver enable_adaptive_ordering).
     """
 
-    # Diccionario que asocia cada tipo de registro con su clase de operaciones por defecto.
-    # Se definen como variable de clase porque no depende de una instancia en específico.
-    _records_by_default = {
-        "order_event": OrderEventRecord(),
-        "product_update": ProductoUpdateRecord(),
-    }
+    # Instantánea con las operaciones por defecto de cada tipo de registro (su clase de operaciones por defecto).
+    # Se define como variable de clase porque no depende de una instancia en específico: los cambios con
+    # set_default_record y delete_default_record aplican a todos los gestores.
+    # Los tipos de registro se declaran en registry.record_types y se importan e instancian la primera vez que se
+    # usan las operaciones por defecto (ver _defaults), no al importar el módulo.
+    _default_snapshot = None
+    # Versión de registry.record_types en la que se declaró cada tipo de registro ya agregado (o eliminado con
+    # delete_default_record) (ver Registry.revision), para agregar solo los tipos declarados o vueltos a declarar
+    # después; y versión del registro de la última sincronización
+    _default_synced = dict()
+    _default_version = -1
+    # Serializa los cambios de las operaciones por defecto (los flujos leen la instantánea sin bloqueos)
+    _default_lock = Lock()
 
-    def __init__(self, record_config: dict[str, list[Operation]] = {}):
+    def __init__(self, record_config: dict[str, list[Operation]] | None = None):
         """Inicializa las operaciones por tipo de registro"""
-        self.record_config = record_config
+        # Instantánea con las operaciones asignadas manualmente ya compiladas por tipo de registro.
+        # Se compila una copia de record_config, por lo que cambiar el diccionario después no afecta al gestor.
+        self._snapshot = ConfigSnapshot.compile(record_config or dict())
+        self._lock = Lock()
+        self.metrics = None
+        self.result_cache = None
+        self.deduplicator = None
+        self.adaptive_ordering = None
+
+    def enable_metrics(self, sample_rate: float = 1.0, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> Metrics:
+        """
+        Activa las métricas de process_stream por tipo de registro y por operación.
+
+        Con las métricas desactivadas (por defecto) process_stream no mide nada. Al activarlas, cada flujo usa cadenas
+        de operaciones instrumentadas que cuentan registros y logs, y miden tiempos sobre la proporción sample_rate
+        de los registros.
+
+        Args:
+            sample_rate (float): Proporción de registros cuyos tiempos se miden. Por defecto es 1.0 (todos).
+            buckets (tuple[float, ...]): Límites superiores en segundos de los intervalos de los histogramas.
+
+        Returns:
+            Metrics: Las métricas, para consultarlas con snapshot o exportarlas con export.
+        """
+        self.metrics = Metrics(sample_rate=sample_rate, buckets=buckets)
+        return self.metrics
+
+    def disable_metrics(self):
+        """Desactiva las métricas de process_stream."""
+        self.metrics = None
+
+    def enable_result_cache(self, maxsize: int = 100_000, ttl: float | None = None, policy: str = 'lru') -> LRUCache:
+        """
+        Activa la caché de resultados de process_stream para los registros idénticos a uno ya procesado.
+
+        La clave de cada resultado es el hash del contenido del registro junto con la huella de la cadena de operaciones
+        de su tipo, por lo que un registro repetido (por ejemplo, un evento reenviado tras un reintento) se entrega con
+        el resultado guardado sin ejecutar las operaciones. Al cambiar las operaciones con register_context,
+        set_default_record o delete_default_record la caché se vacía, y los resultados guardados con otra cadena
+        dejan de encontrarse porque su huella ya no coincide.
+
+        Args:
+            maxsize (int): Cantidad máxima de resultados guardados. Por defecto es 100.000.
+            ttl (float | None): Segundos que vive cada resultado, o None si no vencen. Por defecto es None.
+            policy (str): Política de desalojo: 'lru' o 'fifo'. Por defecto es 'lru'.
+
+        Returns:
+            LRUCache: La caché, para consultar sus estadísticas con info().
+        """
+        self.result_cache = LRUCache(maxsize, policy=policy, ttl=ttl)
+        return self.result_cache
+
+    def disable_result_cache(self):
+        """Desactiva la caché de resultados de process_stream."""
+        self.result_cache = None
+
+    def result_cache_info(self) -> dict[str, any] | None:
+        """
+        Devuelve las estadísticas de la caché de resultados.
+
+        Returns:
+            dict[str, any] | None: Aciertos, fallos, tasa de aciertos, desalojos y vencimientos, o None si está desactivada.
+        """
+        return self.result_cache.info() if self.result_cache is not None else None
+
+    def enable_deduplication(self, keys: Mapping[str, str | Iterable[str]], mode: str = 'exact', maxsize: int = 1_000_000, ttl: float | None = None, error_rate: float = 0.001, action: str = 'flag') -> 'Deduplicator':
+        """
+        Activa la detección de registros repetidos por sus campos clave (por ejemplo, order_id) en process_stream,
+        process_stream_threaded y process_jsonl.
+
+        La clave de cada registro se revisa antes de aplicar sus operaciones, por lo que un registro repetido no
+        paga la validación completa: con la acción 'flag' se entrega sin procesar con el log DUPLICATE_RECORD y con
+        'drop' no se entrega (process_jsonl no lo escribe). Las claves vistas se recuerdan con memoria acotada, de
+        forma exacta o aproximada según el modo (ver Deduplicator). Las claves vistas no se guardan en los puntos de
+        control: al reanudar process_jsonl empiezan vacías.
+
+        Args:
+            keys (Mapping[str, str | Iterable[str]]): Campo o campos clave por tipo de registro.
+            mode (str): 'exact' (conjunto LRU de claves, sin falsos positivos) o 'approximate' (filtros de huellas de memoria fija). Por defecto es 'exact'.
+            maxsize (int): Cantidad de claves recordadas por tipo de registro (por filtro en el modo 'approximate'). Por defecto es 1.000.000.
+            ttl (float | None): Segundos que se recuerda una clave, o None sin límite de tiempo. Por defecto es None.
+            error_rate (float): Probabilidad de falsos positivos de cada filtro en el modo 'approximate'. Por defecto es 0.001.
+            action (str): 'flag' (marcar) o 'drop' (descartar) los registros repetidos. Por defecto es 'flag'.
+
+        Returns:
+            Deduplicator: El detector, para consultar sus contadores con info().
+        """
+        from .dedup import Deduplicator
+        self.deduplicator = Deduplicator(keys, mode=mode, maxsize=maxsize, ttl=ttl, error_rate=error_rate, action=action)
+        return self.deduplicator
+
+    def disable_deduplication(self):
+        """Desactiva la detección de registros repetidos."""
+        self.deduplicator = None
+
+    def deduplication_info(self) -> dict[str, any] | None:
+        """
+        Devuelve los contadores de registros repetidos.
+
+        Returns:
+            dict[str, any] | None: Registros revisados, repetidos y tasa de repetidos, en total y por tipo de registro,
+            o None si la detección está desactivada.
+        """
+        return self.deduplicator.info() if self.deduplicator is not None else None
+
+    def enable_adaptive_ordering(self, sample_rate: float = 0.01, reorder_every: int = 100) -> 'AdaptiveOrdering':
+        """
+        Activa el reordenamiento adaptativo de las operaciones de cada tipo de registro en process_stream,
+        process_stream_threaded y process_jsonl con stop_on.
+
+        Cuando solo importa si el registro es válido, la cadena se corta en la primera operación que falla: el
+        gestor mide por tipo de registro el costo y la probabilidad de fallar de cada operación sobre una muestra de
+        los registros y adelanta las validaciones baratas que más fallan, manteniendo el orden declarado entre las
+        operaciones que dependen unas de otras (ver AdaptiveOrdering). Sin stop_on, con las métricas activadas o con
+        el reordenamiento desactivado (por defecto), las operaciones se ejecutan en el orden declarado.
+
+        Args:
+            sample_rate (float): Proporción de registros muestreados para medir las operaciones. Por defecto es 0.01.
+            reorder_every (int): Registros muestreados de un tipo entre dos recálculos de su orden. Por defecto es 100.
+
+        Returns:
+            AdaptiveOrdering: El reordenamiento, para consultar el orden elegido y el ahorro medido con info().
+        """
+        from .ordering import AdaptiveOrdering
+        self.adaptive_ordering = AdaptiveOrdering(sample_rate=sample_rate, reorder_every=reorder_every)
+        return self.adaptive_ordering
+
+    def disable_adaptive_ordering(self):
+        """Desactiva el reordenamiento adaptativo: las operaciones vuelven a ejecutarse en el orden declarado."""
+        self.adaptive_ordering = None
+
+    def adaptive_ordering_info(self) -> dict[str, any] | None:
+        """
+        Devuelve el orden elegido y el ahorro medido por tipo de registro.
+
+        Returns:
+            dict[str, any] | None: Orden declarado y elegido, mediciones de cada operación y costo por registro con
+            cada orden, o None si el reordenamiento está desactivado.
+        """
+        return self.adaptive_ordering.info() if self.adaptive_ordering is not None else None
+
+    def _invalidate_result_cache(self):
+        """Vacía la caché de resultados al cambiar las operaciones."""
+        if self.result_cache is not None:
+            self.result_cache.clear()
+
+    @property
+    def record_config(self) -> dict[str, list[Operation]]:
+        """Copia de las operaciones asignadas manualmente por tipo de registro (modificarla no afecta al gestor)."""
+        return {record_type: list(operations) for record_type, operations in self._snapshot.operations.items()}
+
+    def config_snapshot(self, default: bool = True) -> ConfigSnapshot:
+        """
+        Devuelve la instantánea vigente de la configuración de operaciones.
+
+        Args:
+            default (bool): Si se devuelven las operaciones por defecto (True) o las asignadas manualmente (False).
+
+        Returns:
+            ConfigSnapshot: Instantánea inmutable con las cadenas compiladas.
+        """
+        return RecordContextManager._defaults() if default else self._snapshot
+
+    @staticmethod
+    def _defaults() -> ConfigSnapshot:
+        """
+        Devuelve la instantánea de las operaciones por defecto, instanciando los tipos de registro de
+        registry.record_types que todavía no se agregaron o que se volvieron a declarar (la primera vez, todos).
+        """
+        snapshot = RecordContextManager._default_snapshot
+        if snapshot is not None and RecordContextManager._default_version == registry.record_types.version:
+            return snapshot
+        with RecordContextManager._default_lock:
+            return RecordContextManager._sync_defaults()
+
+    @staticmethod
+    def _sync_defaults() -> ConfigSnapshot:
+        """
+        Agrega a la instantánea por defecto los tipos de registro declarados después de la última sincronización, y
+        reemplaza la cadena de los que se volvieron a declarar (con register, aunque se hayan eliminado con
+        delete_default_record).
+        """
+        record_types = registry.record_types
+        # Los entry points no se buscan aquí: se agregan solo si ya se buscaron (load_entry_points, names() o un
+        # nombre no declarado), para que el primer registro no recorra los paquetes instalados
+        names = record_types.names(entry_points=False)
+        version = record_types.version
+        snapshot = RecordContextManager._default_snapshot or ConfigSnapshot()
+        if RecordContextManager._default_version != version:
+            synced = dict(RecordContextManager._default_synced)
+            for record_type in names:
+                revision = record_types.revision(record_type)
+                if synced.get(record_type) != revision:
+                    snapshot = snapshot.with_chain(record_type, record_types.create(record_type))
+                    synced[record_type] = revision
+            RecordContextManager._default_synced = synced
+            RecordContextManager._default_version = version
+        RecordContextManager._default_snapshot = snapshot
+        return snapshot
 
     def register_context(self, record_type: str, operations: list[Operation]):
         """
         Registra una lista de operaciones por tipo de registro.
+
+        Los flujos ya iniciados siguen usando la configuración anterior.
         
         Args:
             record_type (str): Tipo de registro.
             operations (list[Operation]): Lista de operaciones para el registro.                    
         """
-        self.record_config[record_type] = operations
+        # Se compila fuera del bloqueo; el bloqueo solo evita perder cambios hechos a la vez desde varios hilos
+        chain = CompiledChain(operations)
+        with self._lock:
+            self._snapshot = self._snapshot.with_chain(record_type, chain)
+        self._invalidate_result_cache()
 
-    def process_stream(self, records: list[dict[str, any]], default: bool = True) -> Generator[dict[str, any], list]:
+    def process_stream(self, records: list[dict[str, any]], default: bool = True, stop_on: str | None = None, error_budget: ErrorBudget | None = None) -> Generator[dict[str, any], list]:
         """
         Procesa un iterable de registros, identificando el tipo de cada uno y aplicando las operaciones correspondientes.
 
         Cada registro puede tener operaciones asignadas manualmente o usar las operaciones predeterminadas definidas para su tipo. 
-        El orden de ejecución de las operaciones respeta el orden en que fueron definidas, ya sea manualmente o por defecto.        
+        El orden de ejecución de las operaciones respeta el orden en que fueron definidas, ya sea manualmente o por defecto,
+        salvo con stop_on y el reordenamiento adaptativo activado (ver enable_adaptive_ordering).
+        Si alguna operación precarga (ver Operation.compile_prefetch, por ejemplo ReferenceLookupOperation), los
+        registros se leen por ventanas de PREFETCH_WINDOW registros que se precargan antes de procesarlos.
 
         Args:
             records (list[dict[str, any]]): lista de registros.
             default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            stop_on (str | None): Si es 'ERROR' o 'WARNING', la cadena de cada registro se detiene en la primera operación
+                que produce un log de ese nivel (o superior), por lo que los logs indican la primera causa por la que el
+                registro no es válido. Por defecto es None (se ejecutan todas las operaciones).
+            error_budget (ErrorBudget | None): Presupuesto de errores del flujo. Al superarse, el flujo se interrumpe con
+                ErrorBudgetExceeded o pasa a validar solo una muestra de los registros, según la acción del presupuesto.
             
         Returns:
             Generator (Generator [dict[str, any], list]): Generador con el registro procesado y la lista de errores o advertencias.
         """
+        # Se fija la configuración vigente y se elige la tabla de despacho una sola vez para todo el flujo
+        results = self._process_stream_snapshot(records, self.config_snapshot(default), stop_on, error_budget)
+        return self._drop_duplicates(results)
+
+    def _process_stream_snapshot(self, records: Iterable[dict[str, any]], snapshot: ConfigSnapshot, stop_on: str | None, error_budget: ErrorBudget | None) -> Generator[dict[str, any], list]:
+        """
+        Igual que process_stream, con la configuración de una instantánea ya fijada.
+        """
+        metrics = self.metrics
+        pipelines = self._stream_pipelines(snapshot, stop_on, metrics)
+        if snapshot.prefetch_pipelines:
+            records = RecordContextManager._prefetched(records, snapshot.prefetch_pipelines)
+        if metrics is not None or error_budget is not None:
+            return self._process_stream_observed(records, pipelines, metrics, error_budget)
+        return RecordContextManager._process_records(records, pipelines)
+
+    @staticmethod
+    def _process_records(records: Iterable[dict[str, any]], pipelines: Mapping[str, Callable]) -> Generator[dict[str, any], list]:
+        """
+        Aplica a cada registro la cadena de su tipo según la tabla de despacho fijada por process_stream.
+        """
+        # Copia local de la tabla: buscar en un dict es más rápido que en la vista de solo lectura de la instantánea
+        pipelines = dict(pipelines)
+        for record in records:
+            record_type = record.get('__type__')
+            pipeline = pipelines.get(record_type)
+            # Realiza las operaciones (por defecto o asignadas manualmente) ya compiladas para el tipo de registro
+            if pipeline is not None and record_type:
+                yield pipeline(record)
+            else:
+                yield RecordContextManager._unprocessed_record(record)
+
+    @staticmethod
+    def _prefetched(records: Iterable[dict[str, any]], prefetch_pipelines: Mapping[str, Callable]) -> Generator[dict[str, any], None]:
+        """
+        Entrega los mismos registros y en el mismo orden, leyéndolos por ventanas de PREFETCH_WINDOW registros que se
+        precargan antes de entregarlas (ver Operation.compile_prefetch).
+        """
+        prefetch_pipelines = dict(prefetch_pipelines)
+        records = iter(records)
+        while window := list(islice(records, PREFETCH_WINDOW)):
+            RecordContextManager._prefetch(window, prefetch_pipelines)
+            yield from window
+
+    @staticmethod
+    def _prefetch(records: list[dict[str, any]], prefetch_pipelines: Mapping[str, Callable]):
+        """Precarga una ventana de registros con la precarga del tipo de cada uno."""
+        groups = dict()
+        for record in records:
+            record_type = record.get('__type__')
+            if record_type in prefetch_pipelines:
+                group = groups.get(record_type)
+                if group is None:
+                    groups[record_type] = [record]
+                else:
+                    group.append(record)
+        for record_type, group in groups.items():
+            prefetch_pipelines[record_type](group)
+
+    def _stream_pipelines(self, snapshot: ConfigSnapshot, stop_on: str | None, metrics: Metrics | None) -> Mapping[str, Callable]:
+        """
+        Devuelve la tabla de despacho de un flujo a partir de una instantánea, según stop_on, las métricas, el
+        reordenamiento adaptativo y la caché de resultados.
+
+        Las cadenas instrumentadas y las reordenadas se compilan al iniciar el flujo; las demás ya están compiladas en
+        la instantánea.
+        """
+        if stop_on is not None:
+            check_stop_on(stop_on)
+        if metrics is not None:
+            pipelines = {
+                record_type: metrics.instrument(record_type, operations, stop_on=stop_on)
+                for record_type, operations in snapshot.operations.items()
+            }
+        elif stop_on is None:
+            pipelines = snapshot.pipelines
+        elif self.adaptive_ordering is not None:
+            adaptive_ordering = self.adaptive_ordering
+            pipelines = {
+                record_type: adaptive_ordering.wrap(record_type, operations, stop_on)
+                for record_type, operations in snapshot.operations.items()
+            }
+        else:
+            pipelines = snapshot.fail_fast_pipelines[stop_on]
+        result_cache = self.result_cache
+        if result_cache is not None:
+            # result_cache importa hashlib y json: solo se importa con la caché de resultados activada
+            from .result_cache import cached_pipeline, chain_fingerprint
+            pipelines = {
+                record_type: cached_pipeline(pipeline, chain_fingerprint(snapshot.operations[record_type], stop_on), result_cache)
+                for record_type, pipeline in pipelines.items()
+            }
+        # Los registros repetidos se detectan antes de buscar en la caché y de aplicar las operaciones
+        deduplicator = self.deduplicator
+        if deduplicator is not None:
+            pipelines = {record_type: deduplicator.wrap(record_type, pipeline) for record_type, pipeline in pipelines.items()}
+        return pipelines
+
+    def _drop_duplicates(self, results: Iterable[tuple[dict[str, any], list]]) -> Iterable[tuple[dict[str, any], list]]:
+        """Descarta los registros repetidos de los resultados si la detección está activada con la acción 'drop'."""
+        deduplicator = self.deduplicator
+        if deduplicator is not None and deduplicator.action == 'drop':
+            return deduplicator.drop_duplicates(results)
+        return results
+
+    def _process_stream_observed(self, records: Iterable[dict[str, any]], pipelines: Mapping[str, Callable], metrics: Metrics | None, error_budget: ErrorBudget | None) -> Generator[dict[str, any], list]:
+        """
+        Igual que process_stream, pero registrando los registros sin procesar en las métricas y aplicando el presupuesto de errores.
+        """
+        pipelines = dict(pipelines)
+        for record in records:
+            if error_budget is not None and error_budget.exceeded:
+                if error_budget.action == 'abort':
+                    raise ErrorBudgetExceeded(
+                        f"Se superó el presupuesto de errores del flujo: {error_budget.info()['recent_invalid_ratio']:.1%} "
+                        f"de registros inválidos en los últimos {error_budget.window} registros."
+                    )
+                # Con la acción 'sample' solo se valida una muestra de los registros
+                if not error_budget.sample():
+                    yield record, [LogEntry(WARNING, NOT_VALIDATED)]
+                    continue
+            record_type = record.get('__type__')
+            pipeline = pipelines.get(record_type)
+            if pipeline is not None and record_type:
+                result = pipeline(record)
+            else:
+                result = RecordContextManager._unprocessed_record(record)
+                if metrics is not None:
+                    metrics.observe_unprocessed(record_type, result[1])
+            if error_budget is not None:
+                error_budget.observe(bool(result[1]))
+            yield result
+
+    @staticmethod
+    def _unprocessed_record(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        """
+        Devuelve el registro sin procesar con la advertencia de por qué no se le aplicaron operaciones.
+
+        Args:
+            record (dict[str, any]): Registro vacío, sin tipo o cuyo tipo no tiene operaciones asignadas.
+
+        Returns:
+            tuple[dict[str, any], list]: El registro y la lista con la advertencia.
+        """
+        # Valida si el registro esta vacío o no tiene el formato valido
+        if not record or not record.get('__type__'):
+            return record, [LogEntry(WARNING, INVALID_RECORD)]
+        # El tipo de registro no tiene operaciones asignadas
+        return record, [LogEntry(WARNING, NO_OPERATIONS)]
+
+    def process_schema_stream(self, records: Iterable['SchemaRecord | dict[str, any]'], default: bool = True, stop_on: str | None = None) -> Generator['SchemaRecord | dict[str, any]', list]:
+        """
+        Procesa un iterable de registros con esquema (ver records.RecordSchema) igual que process_stream.
+
+        La cadena de cada clase de registro generada se compila con el esquema la primera vez que aparece en el flujo
+        (ver Operation.compile_schema), por lo que las operaciones incorporadas leen y escriben los campos
+        directamente en los slots del registro. El registro se elige por su clase, sin buscar '__type__'. Los
+        diccionarios del flujo (por ejemplo, los de tipos sin esquema) se procesan igual que en process_stream.
+        No se usan las métricas, la caché de resultados ni un presupuesto de errores.
+
+        Args:
+            records (Iterable[SchemaRecord | dict[str, any]]): Registros con esquema o diccionarios.
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            stop_on (str | None): Nivel de log que detiene la cadena de cada registro, igual que en process_stream.
+
+        Returns:
+            Generator (Generator [SchemaRecord | dict[str, any], list]): Generador con el registro procesado y la lista de errores o advertencias.
+        """
+        snapshot = self.config_snapshot(default)
+        if stop_on is not None:
+            check_stop_on(stop_on)
+        return RecordContextManager._process_schema_records(records, snapshot, stop_on)
+
+    @staticmethod
+    def _process_schema_records(records: Iterable['SchemaRecord | dict[str, any]'], snapshot: ConfigSnapshot, stop_on: str | None) -> Generator['SchemaRecord | dict[str, any]', list]:
+        """
+        Aplica a cada registro la cadena de su clase, compilada con el esquema la primera vez que aparece la clase.
+        """
+        from .records.schema import SchemaRecord
+        dict_pipelines = dict(snapshot.pipelines if stop_on is None else snapshot.fail_fast_pipelines[stop_on])
+
+        def process_dict(record: dict[str, any]) -> tuple[dict[str, any], list]:
+            record_type = record.get('__type__')
+            pipeline = dict_pipelines.get(record_type)
+            if pipeline is not None and record_type:
+                return pipeline(record)
+            return RecordContextManager._unprocessed_record(record)
+
+        # Cadena por clase de registro
+        pipelines = {dict: process_dict}
         for record in records:
-            logs = list()
-            record_type = record.get('__type__')            
-            # Valida si el registro esta vacío o no tiene el formato valido
-            if not record or not record_type:
-                logs.append({
-                    "type": "WARNING",                    
-                    "message": f"El registro esta vacío o no tiene un formato valido."                
-                })
-                yield record, logs
-                continue            
-            # Realiza las operaciones por defecto al registro
-            if default:
-                # Valida que el registro tiene operaciones asignadas por defecto
-                if record_type in RecordContextManager._records_by_default:
-                    order_event_record = RecordContextManager._records_by_default.get(record_type)
-                    yield order_event_record.process_record(record)
+            pipeline = pipelines.get(record.__class__)
+            if pipeline is None:
+                record_class = record.__class__
+                if not issubclass(record_class, SchemaRecord):
+                    raise Exception(f"El registro de clase {record_class.__name__} no es un diccionario ni un registro con esquema.")
+                operations = snapshot.operations.get(record_class.record_type)
+                if operations is None:
+                    pipeline = RecordContextManager._unprocessed_record
+                else:
+                    pipeline = compile_pipeline(operations, stop_on=stop_on, schema=record_class.schema)
+                pipelines[record_class] = pipeline
+            yield pipeline(record)
+
+    def summarize_stream(self, records: Iterable[dict[str, any]], default: bool = True, stop_on: str | None = None, numeric_fields: Iterable[str] = ('amount', 'price'), top_n: int = 10) -> 'StreamSummary':
+        """
+        Procesa un iterable de registros igual que process_stream, pero en lugar de entregar cada registro con sus logs
+        devuelve un único resumen: registros por tipo (válidos e inválidos), logs por nivel, código, operación y campo,
+        los valores más frecuentes que produjeron logs y la cantidad, suma, mínimo y máximo de los campos numéricos.
+
+        No se crea una lista de logs ni una tupla de resultado por registro, y la memoria usada no depende de la
+        cantidad de registros. Los resúmenes de distintas partes de un flujo se combinan con StreamSummary.merge.
+        No se usan las métricas, la caché de resultados ni un presupuesto de errores.
+
+        Args:
+            records (Iterable[dict[str, any]]): Registros a procesar.
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            stop_on (str | None): Nivel de log que detiene la cadena de cada registro, igual que en process_stream.
+            numeric_fields (Iterable[str]): Campos numéricos a resumir después de aplicar las operaciones. Por defecto 'amount' y 'price'.
+            top_n (int): Cantidad de valores más frecuentes por operación y campo que se informan. Por defecto es 10.
+
+        Returns:
+            StreamSummary: Resumen del flujo.
+        """
+        from .summary import StreamSummary
+        summary = StreamSummary(numeric_fields=numeric_fields, top_n=top_n)
+        return summary.update(records, self.config_snapshot(default).operations, stop_on=stop_on)
+
+    def process_stream_batched(self, records: Iterable[dict[str, any]], batch_size: int = 8192, default: bool = True) -> Generator[dict[str, any], list]:
+        """
+        Procesa un iterable de registros por lotes, con el mismo resultado y en el mismo orden que process_stream.
+
+        Se leen hasta batch_size registros, se agrupan por tipo de registro y cada grupo se procesa con la cadena de
+        operaciones compilada para lotes (ver Operation.compile_batch), en la que cada operación recorre el grupo completo
+        antes de pasar a la siguiente. Los resultados se entregan en el orden de entrada.
+
+        Args:
+            records (Iterable[dict[str, any]]): Iterable de registros.
+            batch_size (int): Cantidad máxima de registros leídos y procesados juntos. Por defecto es 8192.
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+
+        Returns:
+            Generator (Generator [dict[str, any], list]): Generador con el registro procesado y la lista de errores o advertencias.
+        """
+        return RecordContextManager._process_batches(records, self.config_snapshot(default).batch_pipelines, batch_size)
+
+    @staticmethod
+    def _process_batches(records: Iterable[dict[str, any]], batch_pipelines: Mapping[str, Callable], batch_size: int) -> Generator[dict[str, any], list]:
+        """
+        Procesa los lotes de process_stream_batched con la tabla de despacho fijada al llamarlo.
+        """
+        from . import parallel
+        batch_pipelines = dict(batch_pipelines)
+        for chunk in parallel.chunked(records, batch_size):
+            results = [None] * len(chunk)
+            # Posiciones de los registros de cada tipo dentro del lote
+            groups = dict()
+            for index, record in enumerate(chunk):
+                record_type = record.get('__type__')
+                if record_type and record_type in batch_pipelines:
+                    groups.setdefault(record_type, list()).append(index)
                 else:
-                    logs.append({
-                        "type": "WARNING",                    
-                        "message": f"El registro no tiene operaciones asignadas."                
-                    })
-                    yield record, logs
-                    continue                
-            # Realiza las operaciones asignadas manualmente al registro. 
-            else:                
-                # Valida que el registro tiene operaciones asignadas manualmente
-                if record_type in self.record_config:
-                    operations = self.record_config.get(record_type)
-                    for operation in operations:
-                        record, new_logs = operation.execute(record)
-                        logs.extend(new_logs)
-                    yield record, logs
+                    results[index] = RecordContextManager._unprocessed_record(record)
+            for record_type, indexes in groups.items():
+                group = batch_pipelines[record_type]([chunk[index] for index in indexes])
+                for index, result in zip(indexes, group):
+                    results[index] = result
+            yield from results
+
+    async def process_stream_async(self, records: AsyncIterable[dict[str, any]] | Iterable[dict[str, any]], default: bool = True, concurrency: int = 100) -> AsyncGenerator[tuple[dict[str, any], list], None]:
+        """
+        Procesa un iterable asíncrono de registros (por ejemplo, leídos de un socket o una cola), en el orden de entrada.
+
+        Los tipos de registro cuyas operaciones son todas síncronas se procesan directamente, sin crear tareas.
+        Los que tienen operaciones asíncronas (execute o condiciones definidas con async def) se ejecutan como tareas,
+        con a lo sumo concurrency registros en vuelo: mientras ese límite esté ocupado no se leen más registros de la
+        fuente, lo que aplica contrapresión cuando el consumidor no alcanza a la fuente.
+
+        Args:
+            records (AsyncIterable[dict[str, any]] | Iterable[dict[str, any]]): Iterable (asíncrono o no) de registros.
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            concurrency (int): Cantidad máxima de registros en vuelo. Por defecto es 100.
+
+        Returns:
+            AsyncGenerator: Generador asíncrono con el registro procesado y la lista de errores o advertencias.
+        """
+        if concurrency <= 0:
+            raise Exception("La concurrencia debe ser mayor que cero.")
+        import asyncio
+        snapshot = self.config_snapshot(default)
+        pipelines = snapshot.pipelines
+        async_pipelines = snapshot.async_pipelines
+        if not hasattr(records, '__aiter__'):
+            records = _as_async_iterable(records)
+
+        # Resultados pendientes en orden de entrada: tareas en vuelo o resultados ya calculados
+        pending = deque()
+        try:
+            async for record in records:
+                record_type = record.get('__type__')
+                async_pipeline = async_pipelines.get(record_type)
+                if async_pipeline is not None and record_type:
+                    pending.append(asyncio.ensure_future(async_pipeline(record)))
                 else:
-                    logs.append({
-                        "type": "WARNING",                    
-                        "message": f"El registro no tiene operaciones asignadas."                
-                    })
-                    yield record, logs
-                    continue                
+                    pipeline = pipelines.get(record_type)
+                    result = pipeline(record) if pipeline is not None and record_type else RecordContextManager._unprocessed_record(record)
+                    # Sin registros en vuelo, el resultado síncrono se entrega de inmediato
+                    if not pending:
+                        yield result
+                        continue
+                    pending.append(result)
+                # Se entregan los resultados listos y se espera al más antiguo si se alcanzó el límite de concurrencia
+                while pending and (len(pending) >= concurrency or _is_ready(pending[0])):
+                    head = pending.popleft()
+                    yield head if isinstance(head, tuple) else await head
+            while pending:
+                head = pending.popleft()
+                yield head if isinstance(head, tuple) else await head
+        finally:
+            # Si el consumidor se detiene antes de terminar, se cancelan las tareas en vuelo
+            for head in pending:
+                if not isinstance(head, tuple):
+                    head.cancel()
+
+    def process_stream_parallel(self, records: Iterable[dict[str, any]], workers: int | None = None, chunk_size: int = 1000, ordered: bool = True, default: bool = True, start_method: str | None = None) -> Generator[dict[str, any], list]:
+        """
+        Procesa un iterable de registros en un pool de procesos, repartiendo bloques de chunk_size registros.
+
+        La configuración de operaciones se envía a cada proceso una sola vez al iniciar el pool. Por defecto se usa el
+        método de inicio de la plataforma (ver parallel.process_pool_context). Con 'fork' los procesos heredan la
+        configuración sin serializarla, por lo que se admiten condiciones con lambdas, pero solo es seguro si el proceso
+        no tiene otros hilos en ejecución; con 'spawn' o 'forkserver' la configuración debe poder serializarse con
+        pickle, por lo que las condiciones deben ser funciones de módulo o condiciones declarativas (ver conditions).
+        Los registros devueltos son copias procesadas en los trabajadores: los registros de entrada no se modifican.
+
+        Args:
+            records (Iterable[dict[str, any]]): Iterable de registros.
+            workers (int | None): Cantidad de procesos. Por defecto es la cantidad de CPUs.
+            chunk_size (int): Cantidad de registros por bloque enviado a un proceso. Por defecto es 1000.
+            ordered (bool): Si se devuelven en el orden de entrada (True) o en el orden en que terminan los bloques (False).
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            start_method (str | None): Método de inicio de los procesos ('fork', 'forkserver' o 'spawn'). Por defecto es
+                el de la plataforma.
+
+        Returns:
+            Generator (Generator [dict[str, any], list]): Generador con el registro procesado y la lista de errores o advertencias.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from . import parallel
+        workers = workers or os.cpu_count() or 1
+        context = parallel.process_pool_context(start_method)
+        record_config = self.record_config
+        default_config = self.get_default_operations()
+        if context.get_start_method() != 'fork':
+            parallel.check_picklable((record_config, default_config))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=parallel.init_worker,
+            initargs=(record_config, default_config, default),
+        )
+        try:
+            chunks = parallel.chunked(records, chunk_size)
+            yield from parallel.map_chunks(executor, parallel.process_chunk, chunks, ordered=ordered, max_pending=2 * workers)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def process_jsonl(self, source: str | BinaryIO, sink: 'RoutingSink', checkpoint: 'Checkpoint | None' = None, default: bool = True, stop_on: str | None = None, error_budget: ErrorBudget | None = None) -> dict[str, any]:
+        """
+        Procesa un archivo JSON Lines con process_stream y escribe los resultados en sink, opcionalmente con puntos de
+        control para poder reanudar un procesamiento interrumpido.
+
+        Los registros válidos se escriben en el destino de válidos de sink y los inválidos, con sus logs y su número de
+        línea, en su destino de inválidos; las líneas que no son JSON válido se escriben con sink.reject.
+
+        Con checkpoint, cada checkpoint.every registros o checkpoint.interval segundos se confirman los destinos
+        (sink.commit) y después se guarda de forma atómica la posición en bytes del archivo hasta la que se escribieron
+        los resultados, los contadores y la huella de la configuración de operaciones (ver checkpoint.config_fingerprint).
+        Si el archivo de estado ya existe, la lectura continúa directamente desde esa posición y los destinos descartan
+        lo escrito después del último punto de control (sink.restore), por lo que los registros no se pierden ni se
+        duplican. No se reanuda si la configuración de operaciones cambió, y no se procesa nada si el estado indica que
+        el archivo ya se procesó completo (checkpoint.clear() permite volver a empezar).
+
+        Args:
+            source (str | BinaryIO): Ruta del archivo JSON Lines, o flujo binario abierto (solo sin checkpoint).
+            sink (RoutingSink): Destino de los resultados.
+            checkpoint (Checkpoint | None): Archivo de estado. Por defecto no se guardan puntos de control.
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            stop_on (str | None): Nivel de log que detiene la cadena de cada registro, igual que en process_stream.
+            error_budget (ErrorBudget | None): Presupuesto de errores del flujo, igual que en process_stream. No se
+                guarda en los puntos de control: al reanudar empieza vacío.
+
+        Returns:
+            dict[str, any]: Estado final: posición en bytes, número de línea del último registro y contadores de sink.
+        """
+        from .checkpoint import config_fingerprint
+        path = os.path.abspath(source) if isinstance(source, str) else None
+        if checkpoint is not None and path is None:
+            raise Exception("Los puntos de control solo se pueden usar al leer un archivo.")
+        # La huella se calcula sobre la misma instantánea que se usa para procesar los registros
+        snapshot = self.config_snapshot(default)
+        fingerprint = config_fingerprint(snapshot.operations, stop_on) if checkpoint is not None else None
+        offset = line = 0
+        state = checkpoint.load() if checkpoint is not None else None
+        if state is not None:
+            if state["input"] != path:
+                raise Exception(f"El archivo de estado corresponde a otro archivo de entrada ({state['input']}).")
+            if state["fingerprint"] != fingerprint:
+                raise Exception("La configuración de operaciones cambió desde el último punto de control: no se puede reanudar.")
+            # Se restaura también si el archivo ya se procesó, para que los destinos no reemplacen lo escrito
+            sink.restore(state["sink"])
+            if state["complete"]:
+                return state
+            offset, line = state["offset"], state["line"]
+
+        def save(complete: bool) -> dict[str, any]:
+            # Primero se confirman los destinos: si el proceso se interrumpe antes de guardar el estado, al reanudar
+            # se descarta lo escrito después del punto de control anterior
+            position = sink.commit()
+            state = {"input": path, "offset": offset, "line": line, "complete": complete, "fingerprint": fingerprint, **sink.info(), "sink": position}
+            checkpoint.save(state)
+            return state
+
+        def on_error(line_number: int, raw: bytes, error: Exception):
+            sink.reject({
+                "line": line_number,
+                "raw": raw.decode('utf-8', errors='replace').rstrip('\n'),
+                "logs": [LogEntry(ERROR, INVALID_JSON, detail=error)],
+            })
+
+        with open(path, 'rb', buffering=BUFFER_SIZE) if path is not None else nullcontext(source) as stream:
+            if offset:
+                stream.seek(offset - 1)
+                if stream.read(1) != b'\n':
+                    raise Exception("La posición guardada no es el comienzo de una línea: el archivo de entrada cambió.")
+            # process_stream entrega un resultado por registro y en orden, por lo que las colas de números de línea
+            # y posiciones avanzan al mismo ritmo que la lectura y no crecen más que la ventana de precarga
+            line_numbers = deque()
+            offsets = deque()
+            records = read_jsonl(stream, on_error=on_error, line_numbers=line_numbers, offsets=offsets, start_line=line + 1, start_offset=offset)
+            results = self._process_stream_snapshot(records, snapshot, stop_on, error_budget)
+            # Con la acción 'drop' los registros repetidos no se escriben (los resultados siguen siendo uno por registro)
+            write = sink.write
+            deduplicator = self.deduplicator
+            if deduplicator is not None and deduplicator.action == 'drop':
+                write = partial(RecordContextManager._write_unique, sink.write)
+            if checkpoint is None:
+                for result in results:
+                    write(result, line=line_numbers.popleft())
+                    offsets.popleft()
+                return {"offset": stream.tell() if path is not None else None, "line": None, "complete": True, **sink.info()}
+            every = checkpoint.every
+            interval = checkpoint.interval
+            pending = 0
+            last_save = time.monotonic()
+            for result in results:
+                line = line_numbers.popleft()
+                offset = offsets.popleft()
+                write(result, line=line)
+                pending += 1
+                if pending >= every or time.monotonic() - last_save >= interval:
+                    save(False)
+                    pending = 0
+                    last_save = time.monotonic()
+            # Las líneas vacías o inválidas después del último registro también quedan procesadas
+            offset = stream.tell()
+        return save(True)
+
+    @staticmethod
+    def _write_unique(write: Callable, result: tuple[dict[str, any], list], **details: any):
+        """Escribe un resultado de process_jsonl salvo que sea un registro repetido."""
+        logs = result[1]
+        if not logs or logs[0].code != DUPLICATE_RECORD:
+            write(result, **details)
+
+    def process_jsonl_parallel(self, path: str, workers: int | None = None, shard_size: int = SHARD_SIZE, ordered: bool = True, default: bool = True, start_method: str | None = None) -> Generator[tuple[int, dict[str, any] | None, list], None, None]:
+        """
+        Procesa un archivo JSON Lines mapeado en memoria, repartiendo fragmentos de bytes entre un pool de procesos.
+
+        El archivo se divide en fragmentos que terminan en un salto de línea (ver shard_offsets); a cada proceso se le
+        envía solo la ruta y las posiciones (start, end), y el proceso decodifica su fragmento del archivo mapeado y lo
+        procesa con process_stream. La división es determinista: con el mismo archivo y shard_size se obtienen los
+        mismos fragmentos. Los procesos se inician igual que en process_stream_parallel (ver start_method).
+
+        Args:
+            path (str): Ruta del archivo JSON Lines.
+            workers (int | None): Cantidad de procesos. Por defecto es la cantidad de CPUs.
+            shard_size (int): Tamaño mínimo en bytes de cada fragmento. Por defecto es 4 MiB.
+            ordered (bool): Si se devuelven en el orden del archivo (True) o en el orden en que terminan los fragmentos (False).
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            start_method (str | None): Método de inicio de los procesos ('fork', 'forkserver' o 'spawn'). Por defecto es
+                el de la plataforma.
+
+        Returns:
+            Generator: Generador con la posición en bytes de la línea de origen, el registro procesado (None si la línea
+            no es JSON válido) y la lista de errores o advertencias.
+        """
+        from concurrent.futures import ProcessPoolExecutor
+        from . import parallel
+        workers = workers or os.cpu_count() or 1
+        context = parallel.process_pool_context(start_method)
+        record_config = self.record_config
+        default_config = self.get_default_operations()
+        if context.get_start_method() != 'fork':
+            parallel.check_picklable((record_config, default_config))
+        executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=context,
+            initializer=parallel.init_worker,
+            initargs=(record_config, default_config, default),
+        )
+        try:
+            shards = ((path, start, end) for start, end in shard_offsets(path, shard_size))
+            yield from parallel.map_chunks(executor, parallel.process_shard, shards, ordered=ordered, max_pending=2 * workers)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    def process_stream_threaded(self, records: Iterable[dict[str, any]], workers: int | None = None, chunk_size: int = 1000, ordered: bool = True, default: bool = True, stop_on: str | None = None) -> Generator[dict[str, any], list]:
+        """
+        Procesa un iterable de registros en un pool de hilos, repartiendo bloques de chunk_size registros.
+
+        Todos los hilos usan la instantánea de la configuración fijada al llamar al método, sin bloqueos al procesar
+        los registros, por lo que la configuración se puede cambiar mientras tanto sin afectar al flujo. A diferencia de
+        process_stream_parallel no se copian los registros ni la configuración: los registros de entrada se modifican
+        en el lugar, igual que con process_stream, y se admiten condiciones con lambdas.
+        Con el GIL los hilos solo se aprovechan cuando las operaciones liberan el GIL (por ejemplo, consultas de E/S);
+        en las compilaciones de CPython sin GIL (free-threaded) las operaciones se ejecutan en paralelo.
+        Las métricas no se pueden usar en este modo porque sus contadores no son seguros entre hilos.
+
+        Args:
+            records (Iterable[dict[str, any]]): Iterable de registros.
+            workers (int | None): Cantidad de hilos. Por defecto es la cantidad de CPUs.
+            chunk_size (int): Cantidad de registros por bloque enviado a un hilo. Por defecto es 1000.
+            ordered (bool): Si se devuelven en el orden de entrada (True) o en el orden en que terminan los bloques (False).
+            default (bool): Si se van a aplicar las operaciones por defecto a los tipos de registro. Por defecto es True.
+            stop_on (str | None): Nivel de log que detiene la cadena de cada registro, igual que en process_stream.
+
+        Returns:
+            Generator (Generator [dict[str, any], list]): Generador con el registro procesado y la lista de errores o advertencias.
+        """
+        if self.metrics is not None:
+            raise Exception("Las métricas no se pueden usar con process_stream_threaded: desactívelas con disable_metrics.")
+        workers = workers or os.cpu_count() or 1
+        snapshot = self.config_snapshot(default)
+        pipelines = self._stream_pipelines(snapshot, stop_on, None)
+        return self._drop_duplicates(RecordContextManager._process_chunks_threaded(records, pipelines, snapshot.prefetch_pipelines, workers, chunk_size, ordered))
+
+    @staticmethod
+    def _process_chunks_threaded(records: Iterable[dict[str, any]], pipelines: Mapping[str, Callable], prefetch_pipelines: Mapping[str, Callable], workers: int, chunk_size: int, ordered: bool) -> Generator[dict[str, any], list]:
+        """
+        Reparte los bloques de process_stream_threaded en el pool de hilos con la tabla de despacho fijada al llamarlo.
+        """
+        from concurrent.futures import ThreadPoolExecutor
+        from . import parallel
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='dynamo_flow')
+        try:
+            chunks = parallel.chunked(records, chunk_size)
+            process_chunk = partial(RecordContextManager._process_chunk, pipelines, prefetch_pipelines)
+            yield from parallel.map_chunks(executor, process_chunk, chunks, ordered=ordered, max_pending=2 * workers)
+        finally:
+            executor.shutdown(wait=True, cancel_futures=True)
+
+    @staticmethod
+    def _process_chunk(pipelines: Mapping[str, Callable], prefetch_pipelines: Mapping[str, Callable], records: list[dict[str, any]]) -> list[tuple[dict[str, any], list]]:
+        """Procesa un bloque de registros en un hilo del pool, precargando el bloque completo."""
+        if prefetch_pipelines:
+            RecordContextManager._prefetch(records, prefetch_pipelines)
+        return list(RecordContextManager._process_records(records, pipelines))
+
+    def get_default_operations(self) -> dict[str, list[Operation]]:
+        """
+        Devuelve las operaciones por defecto de cada tipo de registro.
+
+        Returns:
+            dict[str, list[Operation]]: Lista de operaciones por defecto por tipo de registro.
+        """
+        return {
+            record_type: list(operations)
+            for record_type, operations in RecordContextManager._defaults().operations.items()
+        }
 
     def set_default_record(self, record_type: str, operations: list[Operation]):
         """
@@ -97,13 +889,28 @@ class RecordContextManager:
             record_type (str): Tipo de registro.
             operations (list[Operation]): Nueva lista de operaciones por defecto.
         """
-        default_record = RecordContextManager._records_by_default.get(record_type)
-        # Verifica si record_type existe
-        if default_record:
-            default_record.set_operations(operations)
-        else:
-            raise Exception("El tipo de registro no existe.")
+        with RecordContextManager._default_lock:
+            default_snapshot = RecordContextManager._sync_defaults()
+            default_record = default_snapshot.chain(record_type)
+            # Verifica si record_type existe
+            if default_record:
+                # Se compila una copia del record para no modificar la instantánea que usan los flujos en curso
+                default_record = copy.copy(default_record)
+                default_record.set_operations(operations)
+                RecordContextManager._default_snapshot = default_snapshot.with_chain(record_type, default_record)
+            else:
+                raise Exception("El tipo de registro no existe.")
+        self._invalidate_result_cache()
         
+    @staticmethod
+    def _install_default_chain(record_type: str, chain: CompiledChain):
+        """
+        Agrega a las operaciones por defecto la cadena de un tipo de registro que no está en registry.record_types
+        (la usan los procesos trabajadores para copiar las operaciones por defecto del proceso principal).
+        """
+        with RecordContextManager._default_lock:
+            RecordContextManager._default_snapshot = RecordContextManager._sync_defaults().with_chain(record_type, chain)
+
     def delete_default_record(self, record_type: str):
         """        
         Elimina el tipo de registro por defecto junto con sus operaciones.
@@ -111,17 +918,32 @@ class RecordContextManager:
         Args:
             record_type (str): Tipo de registro.            
         """
-        # Verifica si record_type existe
-        if record_type in RecordContextManager._records_by_default:
-            del RecordContextManager._records_by_default[record_type]
-        else:
-            raise Exception("El tipo de registro no existe.")
+        with RecordContextManager._default_lock:
+            default_snapshot = RecordContextManager._sync_defaults()
+            # Verifica si record_type existe
+            if record_type in default_snapshot:
+                RecordContextManager._default_snapshot = default_snapshot.without(record_type)
+            else:
+                raise Exception("El tipo de registro no existe.")
+        self._invalidate_result_cache()
+
+async def _as_async_iterable(records: Iterable[dict[str, any]]) -> AsyncGenerator[dict[str, any], None]:
+    """Adapta un iterable síncrono de registros a un iterable asíncrono."""
+    for record in records:
+        yield record
+
+
+def _is_ready(result: 'tuple | asyncio.Future') -> bool:
+    """Indica si un resultado pendiente de process_stream_async ya se puede entregar."""
+    return isinstance(result, tuple) or result.done()
 
 if __name__ == '__main__':
 
     import re
     from pprint import pprint
     from copy import deepcopy
+    from dynamo_flow.logs import as_dict_logs
+    from dynamo_flow.operations import NormalizeAmountOperation, ContextualFieldValidation
 
 
     records_example = [{
@@ -154,7 +976,7 @@ if __name__ == '__main__':
     ])
 
     # Ejecutar el proceso de records con operaciones ingresadas manualmente
-    for i, (record, logs) in enumerate(record_manager.process_stream(records_example, default=False)):
+    for i, (record, logs) in enumerate(as_dict_logs(record_manager.process_stream(records_example, default=False))):
         status = "INVÁLIDO" if len(logs) else "VALIDO"
         print(f"===================REGISTRO {i+1}: {status}===================")
         print("Registro:")
@@ -165,7 +987,7 @@ if __name__ == '__main__':
     print('\n')
 
     # Ejecutar el proceso de records con operaciones por defecto    
-    for i, (record, logs) in enumerate(record_manager.process_stream(records_example_2)):
+    for i, (record, logs) in enumerate(as_dict_logs(record_manager.process_stream(records_example_2))):
         status = "INVÁLIDO" if len(logs) else "VALIDO"
         print(f"===================REGISTRO {i+1}: {status}===================")
         print("Registro:")
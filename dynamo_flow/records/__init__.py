@@ -1,5 +1,35 @@
-from .order_event_record import OrderEventRecord
-from .product_update_record import ProductoUpdateRecord
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Módulo de cada clase exportada. Se importa la primera vez que se usa el nombre (PEP 562), por lo que agregar
+# tipos de registro no hace más lento el inicio de los procesos que no los usan (ver también registry.record_types).
+_EXPORTS = {
+    'OrderEventRecord': '.order_event_record',
+    'ProductoUpdateRecord': '.product_update_record',
+    'RecordSchema': '.schema',
+    'SchemaRecord': '.schema',
+    'from_dicts': '.schema',
+}
+
+if TYPE_CHECKING:
+    from .order_event_record import OrderEventRecord
+    from .product_update_record import ProductoUpdateRecord
+    from .schema import RecordSchema, SchemaRecord, from_dicts
+
+
+def __getattr__(name: str) -> any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Se guarda en el módulo para que los siguientes accesos no pasen por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
 
 # Para poder importar las clases facilmente desde fuera del subpaquete records
-__all__ = ['OrderEventRecord', 'ProductoUpdateRecord']
\ No newline at end of file
+__all__ = ['OrderEventRecord', 'ProductoUpdateRecord', 'RecordSchema', 'SchemaRecord', 'from_dicts']
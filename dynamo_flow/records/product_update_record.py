@@ -1,7 +1,8 @@
-from dynamo_flow.operations.operation import Operation
 from .record import Record
+from .schema import RecordSchema
 from ..operations import ContextualFieldValidation
 from ..operations import NormalizeAmountOperation
+from ..operations import OneOf
 
 class ProductoUpdateRecord(Record):
     """
@@ -9,27 +10,25 @@ class ProductoUpdateRecord(Record):
 
     Attributes:
         operations (list[Operation]): Lista de operaciones por defecto.   
+        pipeline (Callable[[dict[str, any]], tuple[dict[str, any], list]]): Operaciones por defecto compiladas en una única función.
+        async_pipeline (Callable | None): Operaciones por defecto compiladas en una corrutina, o None si todas son síncronas.
+        fail_fast_pipelines (dict[str, Callable]): Operaciones por defecto compiladas en cadenas que se cortan en el primer log, por nivel de stop_on.
+        batch_pipeline (Callable[[list[dict[str, any]]], list[tuple[dict[str, any], list]]]): Operaciones por defecto compiladas para procesar lotes de registros.
+        prefetch_pipeline (Callable[[list[dict[str, any]]], None] | None): Precarga de las operaciones por defecto por ventana de registros, o None si ninguna precarga.
+        schema (RecordSchema): Esquema de los campos del registro, para procesarlo como registro compacto (ver RecordSchema).
 
     Operaciones por defecto:
         NormalizeAmountOperation(field_name="price")
         ContextualFieldValidation(field_name="product_sku", required=True)
-        ContextualFieldValidation(field_name="is_active", required=True, condition=lambda x: x.lower() in ('true', 'false'))
+        ContextualFieldValidation(field_name="is_active", required=True, condition=OneOf(('true', 'false'), ignore_case=True))
     """
 
+    schema = RecordSchema("product_update", {"product_sku": str, "price": float, "is_active": str})
+
     def __init__(self):
         """Inicializa las operaciones por defecto"""
-        self._operations = [
+        self.set_operations([
             NormalizeAmountOperation(field_name="price"),
             ContextualFieldValidation(field_name="product_sku", required=True),
-            ContextualFieldValidation(field_name="is_active", required=True, condition=lambda x: x.lower() in ('true', 'false')),
-        ]
-
-    def process_record(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
-        logs = list()
-        for operation in self._operations:
-             record, new_logs = operation.execute(record)
-             logs.extend(new_logs)
-        return record, logs
-    
-    def set_operations(self, operations: list[Operation]):
-        self._operations = operations
\ No newline at end of file
+            ContextualFieldValidation(field_name="is_active", required=True, condition=OneOf(('true', 'false'), ignore_case=True)),
+        ])
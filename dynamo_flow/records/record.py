@@ -1,27 +1,33 @@
-from abc import ABC, abstractmethod
+from abc import ABC
 from dynamo_flow.operations.operation import Operation
+from ..config_snapshot import CompiledChain
 
 class Record(ABC):
     """
     Clase abstracta para todos los tipos de registro con operaciones por defecto.
+
+    Las subclases asignan sus operaciones por defecto con set_operations, que las compila una sola vez con las mismas
+    cadenas que CompiledChain (pipeline, async_pipeline, fail_fast_pipelines, batch_pipeline y prefetch_pipeline).
     """
 
-    @abstractmethod
-    def process_record(self, record : dict[str, any]) -> tuple[dict[str, any], list]:
+    def process_record(self, record : dict[str, any], stop_on: str | None = None) -> tuple[dict[str, any], list]:
         """
         Procesa un tipo de registro aplicando todas las operaciones por defecto.
 
         Args:
             record (dict[str, any]): El registro a procesar.
+            stop_on (str | None): Si es 'ERROR' o 'WARNING', se detiene en la primera operación que produce un log
+                de ese nivel (o superior). Por defecto es None (se ejecutan todas las operaciones).
         
         Returns:
             tuple: Una tupla conteniendo:
                 - dict[str, any]: Registro modificado.
                 - list: Lista de advertencias o errores.
         """
-        pass
+        if stop_on is None:
+            return self.pipeline(record)
+        return self.fail_fast_pipelines[stop_on](record)
     
-    @abstractmethod
     def set_operations(self, operations: list[Operation]):
         """
         Cambia las operaciones por defecto
@@ -29,4 +35,20 @@ class Record(ABC):
         Args:
             operations (list[Operation]): Nueva lista de operaciones por defecto.
         """
-        pass
\ No newline at end of file
+        self._operations = operations
+        # Se compila la cadena una sola vez para no recorrer las operaciones en cada registro
+        chain = CompiledChain(operations)
+        self.pipeline = chain.pipeline
+        self.async_pipeline = chain.async_pipeline
+        self.fail_fast_pipelines = chain.fail_fast_pipelines
+        self.batch_pipeline = chain.batch_pipeline
+        self.prefetch_pipeline = chain.prefetch_pipeline
+
+    def get_operations(self) -> list[Operation]:
+        """
+        Devuelve las operaciones por defecto.
+
+        Returns:
+            list[Operation]: Lista de operaciones por defecto.
+        """
+        return self._operations
\ No newline at end of file
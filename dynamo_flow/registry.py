@@ -0,0 +1,206 @@
+import os
+from importlib import import_module
+from threading import RLock
+
+# Variable de entorno que desactiva la carga de plugins declarados como entry points
+# (igual que PYTEST_DISABLE_PLUGIN_AUTOLOAD en pytest), para los procesos que no los necesitan
+DISABLE_AUTOLOAD_ENV = 'DYNAMO_FLOW_DISABLE_PLUGIN_AUTOLOAD'
+
+# Marca para distinguir "todavía no se importó" de cualquier objeto registrado
+_NOT_LOADED = object()
+
+
+class Registry:
+    """
+    Registro de componentes (operaciones o tipos de registro) declarados por nombre, que se importan al usarse por primera vez.
+
+    Cada componente se declara con una referencia 'modulo:atributo' (o directamente con el objeto): registrarlo no
+    importa nada, por lo que agregar componentes no hace más lento el inicio de los procesos que no los usan.
+    Además de los declarados con register, se cargan los que otros paquetes declaran como entry points del grupo
+    del registro (por ejemplo, en pyproject.toml):
+
+        [project.entry-points."dynamo_flow.operations"]
+        MiOperacion = "mi_paquete.operaciones:MiOperacion"
+
+    Los entry points se buscan una sola vez y solo cuando hace falta: al pedir un nombre que no está declarado, al
+    listar los nombres (names) o con load_entry_points. Buscarlos importa importlib.metadata y recorre los paquetes
+    instalados, por lo que no se hace al usar los componentes declarados. Los declarados con register tienen
+    prioridad sobre los entry points.
+
+    Attributes:
+        group (str): Grupo de entry points del registro.
+        version (int): Contador que aumenta con cada cambio de los nombres declarados.
+    """
+
+    def __init__(self, group: str, builtins: dict[str, str] | None = None):
+        """Inicializa el registro con los componentes incluidos en dynamo_flow, sin importarlos"""
+        self.group = group
+        self.version = 0
+        self._targets = dict(builtins or dict())
+        # Versión del registro en la que se declaró cada nombre (ver revision)
+        self._revisions = dict.fromkeys(self._targets, 0)
+        self._loaded = dict()
+        self._entry_points_scanned = False
+        self._lock = RLock()
+
+    def register(self, name: str, target: str | object):
+        """
+        Declara un componente por nombre. Reemplaza al componente con el mismo nombre, si existe.
+
+        Args:
+            name (str): Nombre del componente (por ejemplo, el nombre de la clase de una operación o el tipo de registro).
+            target (str | object): Referencia 'modulo:atributo' que se importa al usarse por primera vez, o el objeto.
+        """
+        if isinstance(target, str) and ':' not in target:
+            raise Exception("La referencia debe tener la forma 'modulo:atributo'.")
+        with self._lock:
+            self._targets[name] = target
+            self._loaded.pop(name, None)
+            self.version += 1
+            self._revisions[name] = self.version
+
+    def unregister(self, name: str):
+        """
+        Elimina un componente del registro.
+
+        Args:
+            name (str): Nombre del componente.
+        """
+        with self._lock:
+            if name not in self._targets:
+                raise Exception(f"'{name}' no está registrado en {self.group}.")
+            del self._targets[name]
+            self._revisions.pop(name, None)
+            self._loaded.pop(name, None)
+            self.version += 1
+
+    def get(self, name: str) -> any:
+        """
+        Devuelve un componente, importándolo si es la primera vez que se usa.
+
+        Args:
+            name (str): Nombre del componente.
+
+        Returns:
+            any: El componente (por ejemplo, la clase de una operación).
+        """
+        loaded = self._loaded.get(name, _NOT_LOADED)
+        if loaded is not _NOT_LOADED:
+            return loaded
+        with self._lock:
+            if name not in self._targets:
+                self._scan_entry_points()
+            if name not in self._targets:
+                raise Exception(f"'{name}' no está registrado en {self.group}.")
+            target = self._targets[name]
+            if isinstance(target, str):
+                module_name, _, attribute = target.partition(':')
+                target = import_module(module_name)
+                for part in attribute.split('.'):
+                    target = getattr(target, part)
+            elif hasattr(target, 'load') and hasattr(target, 'group'):
+                # Entry point de importlib.metadata
+                target = target.load()
+            self._loaded[name] = target
+            return target
+
+    def create(self, name: str, *args: any, **kwargs: any) -> any:
+        """
+        Crea una instancia de un componente, importándolo si es la primera vez que se usa.
+
+        Args:
+            name (str): Nombre del componente.
+            *args, **kwargs: Argumentos del constructor (por ejemplo, field_name de una operación).
+
+        Returns:
+            any: Instancia del componente.
+        """
+        return self.get(name)(*args, **kwargs)
+
+    def names(self, entry_points: bool = True) -> list[str]:
+        """
+        Devuelve los nombres de todos los componentes, incluidos los declarados como entry points, sin importarlos.
+
+        Args:
+            entry_points (bool): Si se buscan los entry points (la primera vez). Con False solo se devuelven los
+                declarados con register y los entry points ya encontrados. Por defecto es True.
+
+        Returns:
+            list[str]: Nombres de los componentes.
+        """
+        with self._lock:
+            if entry_points:
+                self._scan_entry_points()
+            return list(self._targets)
+
+    def load_entry_points(self):
+        """
+        Busca los entry points del grupo del registro (solo la primera vez) y agrega los que no están declarados, sin
+        importarlos.
+        """
+        with self._lock:
+            self._scan_entry_points()
+
+    def revision(self, name: str) -> int | None:
+        """
+        Devuelve la versión del registro en la que se declaró un componente, sin buscar entry points ni importarlo.
+        Cambia cada vez que el nombre se vuelve a declarar (aunque sea con la misma referencia).
+
+        Args:
+            name (str): Nombre del componente.
+
+        Returns:
+            int | None: Versión en la que se declaró, o None si el nombre no está declarado.
+        """
+        return self._revisions.get(name)
+
+    def is_loaded(self, name: str) -> bool:
+        """
+        Indica si un componente ya se importó.
+
+        Args:
+            name (str): Nombre del componente.
+
+        Returns:
+            bool: Si el componente ya se importó.
+        """
+        return name in self._loaded
+
+    def __contains__(self, name: str) -> bool:
+        with self._lock:
+            if name not in self._targets:
+                self._scan_entry_points()
+            return name in self._targets
+
+    def _scan_entry_points(self):
+        """Agrega los entry points del grupo del registro, buscándolos una sola vez."""
+        if self._entry_points_scanned:
+            return
+        self._entry_points_scanned = True
+        if os.environ.get(DISABLE_AUTOLOAD_ENV):
+            return
+        # importlib.metadata tarda en importarse: solo se importa si hace falta buscar entry points
+        from importlib.metadata import entry_points
+        added = dict()
+        for entry_point in entry_points(group=self.group):
+            if entry_point.name not in self._targets and entry_point.name not in added:
+                added[entry_point.name] = entry_point
+        if added:
+            self.version += 1
+            self._targets.update(added)
+            self._revisions.update(dict.fromkeys(added, self.version))
+
+
+# Operaciones por nombre de clase
+operations = Registry('dynamo_flow.operations', {
+    'NormalizeAmountOperation': 'dynamo_flow.operations.normalize_amount_operation:NormalizeAmountOperation',
+    'NormalizeTimestampOperation': 'dynamo_flow.operations.normalize_timestamp_operation:NormalizeTimestampOperation',
+    'ContextualFieldValidation': 'dynamo_flow.operations.contextual_field_validation:ContextualFieldValidation',
+    'ReferenceLookupOperation': 'dynamo_flow.operations.reference_lookup_operation:ReferenceLookupOperation',
+})
+
+# Tipos de registro con operaciones por defecto: clases de records (ver records.Record) que se instancian sin argumentos
+record_types = Registry('dynamo_flow.record_types', {
+    'order_event': 'dynamo_flow.records.order_event_record:OrderEventRecord',
+    'product_update': 'dynamo_flow.records.product_update_record:ProductoUpdateRecord',
+})
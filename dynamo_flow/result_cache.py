@@ -0,0 +1,114 @@
+import json
+from hashlib import blake2b
+from typing import Callable
+from .cache import LRUCache
+from .logs import EMPTY_LOGS
+
+# Marca para distinguir "no está en la caché" de cualquier resultado guardado
+_MISS = object()
+
+# Tipos de valor cuyo repr identifica el valor sin ambigüedad
+_SCALAR_TYPES = frozenset((str, int, float, bool, type(None)))
+
+# Tipos de valor que se pueden usar directamente en la clave: su igualdad no confunde tipos distintos
+_TEXT_TYPES = frozenset((str, type(None)))
+
+
+def chain_fingerprint(operations: list, stop_on: str | None = None) -> str:
+    """
+    Calcula la huella de una cadena de operaciones: cambia si cambian las operaciones, su orden o sus parámetros.
+
+    Se basa en la clase y el repr de los parámetros de cada operación. Las funciones (por ejemplo, lambdas) se
+    representan por su identidad, por lo que la huella solo es válida dentro del proceso.
+
+    Args:
+        operations (list[Operation]): Lista de operaciones en el orden en que se ejecutan.
+        stop_on (str | None): Nivel de log que detiene la cadena, ya que también cambia el resultado.
+
+    Returns:
+        str: Huella hexadecimal de la cadena.
+    """
+    description = repr((stop_on, [
+        (type(operation).__module__, type(operation).__qualname__, sorted(getattr(operation, 'parameters', dict()).items(), key=repr))
+        for operation in operations
+    ]))
+    return blake2b(description.encode('utf-8', errors='replace'), digest_size=16).hexdigest()
+
+
+def record_digest(record: dict[str, any]) -> bytes:
+    """
+    Calcula un hash estable del contenido de un registro, respetando el orden de sus claves.
+
+    Los reintentos de un evento producen el mismo registro con las mismas claves en el mismo orden, por lo que
+    no hace falta ordenarlas. Si todos los valores son escalares (str, int, float, bool o None) se usa su repr, que
+    los distingue por tipo y es más rápido que serializarlos; si no, se serializa el registro a JSON.
+
+    Args:
+        record (dict[str, any]): Registro sin procesar.
+
+    Returns:
+        bytes: Hash de 16 bytes. Lanza TypeError o ValueError si el registro no se puede serializar a JSON.
+    """
+    if set(map(type, record.values())) <= _SCALAR_TYPES:
+        return blake2b(repr(record).encode('utf-8', errors='surrogatepass'), digest_size=16, person=b'repr').digest()
+    return blake2b(json.dumps(record).encode(), digest_size=16, person=b'json').digest()
+
+
+def record_key(record: dict[str, any]) -> tuple | bytes:
+    """
+    Devuelve la clave de contenido de un registro para la caché de resultados.
+
+    Los registros leídos de JSON suelen tener solo cadenas: en ese caso la clave es la tupla de sus pares
+    (clave, valor), que se compara por igualdad exacta y no requiere calcular un hash criptográfico.
+    Con otros tipos de valor (donde 1 == 1.0 == True) la clave es record_digest, que distingue los tipos.
+
+    Args:
+        record (dict[str, any]): Registro sin procesar.
+
+    Returns:
+        tuple | bytes: Clave del registro.
+    """
+    if set(map(type, record.values())) <= _TEXT_TYPES:
+        return tuple(record.items())
+    return record_digest(record)
+
+
+def cached_pipeline(pipeline: Callable[[dict[str, any]], tuple[dict[str, any], list]], fingerprint: str, cache: LRUCache) -> Callable[[dict[str, any]], tuple[dict[str, any], list]]:
+    """
+    Envuelve una cadena compilada para que los registros idénticos a uno ya procesado no vuelvan a procesarse.
+
+    La clave de la caché es la huella de la cadena junto con la clave del registro (ver record_key) antes de procesarlo, por lo que al
+    cambiar la cadena de un tipo de registro sus resultados anteriores dejan de encontrarse.
+    En un acierto el registro de entrada se reemplaza en el lugar por el resultado guardado (igual que lo habrían
+    modificado las operaciones) y se devuelve una copia de sus logs.
+    Los registros que no se pueden serializar a JSON se procesan sin caché.
+
+    Args:
+        pipeline (Callable[[dict[str, any]], tuple[dict[str, any], list]]): Cadena compilada del tipo de registro.
+        fingerprint (str): Huella de la cadena (ver chain_fingerprint).
+        cache (LRUCache): Caché de resultados.
+
+    Returns:
+        Callable[[dict[str, any]], tuple[dict[str, any], list]]: Cadena con caché, con el mismo contrato que pipeline.
+    """
+    cache_get = cache.get
+    cache_put = cache.put
+
+    def pipeline_with_cache(record: dict[str, any]) -> tuple[dict[str, any], list]:
+        try:
+            key = (fingerprint, record_key(record))
+        except (TypeError, ValueError):
+            return pipeline(record)
+        cached = cache_get(key, _MISS)
+        if cached is not _MISS:
+            cached_record, cached_logs = cached
+            # El registro de entrada queda igual (contenido y orden de claves) al que dejaron las operaciones
+            record.clear()
+            record.update(cached_record)
+            return record, list(cached_logs) if cached_logs else EMPTY_LOGS
+        record, logs = pipeline(record)
+        # Se guardan copias para que los cambios posteriores del consumidor no alteren la caché
+        cache_put(key, (dict(record), tuple(logs)))
+        return record, logs
+
+    return pipeline_with_cache
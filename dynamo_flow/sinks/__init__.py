@@ -0,0 +1,36 @@
+from importlib import import_module
+from typing import TYPE_CHECKING
+
+# Módulo de cada clase exportada. Se importa la primera vez que se usa el nombre (PEP 562).
+_EXPORTS = {
+    'Sink': '.sink',
+    'FileSink': '.file_sink',
+    'JsonlSink': '.jsonl_sink',
+    'CsvSink': '.csv_sink',
+    'RoutingSink': '.routing_sink',
+}
+
+if TYPE_CHECKING:
+    from .sink import Sink
+    from .file_sink import FileSink
+    from .jsonl_sink import JsonlSink
+    from .csv_sink import CsvSink
+    from .routing_sink import RoutingSink
+
+
+def __getattr__(name: str) -> any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(module, __name__), name)
+    # Se guarda en el módulo para que los siguientes accesos no pasen por __getattr__
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(__all__))
+
+
+# Para poder importar las clases facilmente desde fuera del subpaquete sinks
+__all__ = ['Sink', 'FileSink', 'JsonlSink', 'CsvSink', 'RoutingSink']
@@ -0,0 +1,78 @@
+import csv
+import io
+from collections.abc import Mapping
+from json import JSONEncoder
+from typing import BinaryIO
+from .file_sink import FileSink
+from ..streams.jsonl import _json_default
+
+class CsvSink(FileSink):
+    """
+    Destino que escribe cada registro como una fila CSV, con una fila de encabezados al comienzo de cada archivo.
+
+    Cada lote se escribe con un único csv.writer sobre un búfer en memoria. Los campos que faltan en un registro
+    quedan vacíos (también los None), los que no están en fields se ignoran, y los valores anidados (diccionarios,
+    listas o logs) se escriben como JSON compacto.
+
+    Sin fields, las columnas son los campos del primer registro escrito y un registro posterior con campos que no
+    están en ellas es un error (se lanza al escribir, al confirmar o al cerrar el destino), para no perder datos en
+    silencio con flujos que mezclan tipos de registro. Para esos flujos se indican las columnas con fields.
+
+    Acepta los mismos parámetros que FileSink (batch_size, flush_interval, queue_size, max_bytes, rotate_interval,
+    append, background y fsync).
+
+    Attributes:
+        fields (list[str] | None): Columnas del archivo, en orden. Si es None se usan los campos del primer registro escrito.
+        dialect (str): Dialecto de csv (por ejemplo 'excel' o 'unix'). Por defecto es 'excel'.
+    """
+
+    def __init__(self, target: str | BinaryIO, fields: list[str] | None = None, dialect: str = 'excel', **kwargs: any):
+        self.fields = list(fields) if fields is not None else None
+        # Campos de las columnas tomadas del primer registro, para detectar los registros con otros campos
+        self._inferred = None
+        self.dialect = dialect
+        self._encode = JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default).encode
+        super().__init__(target, **kwargs)
+
+    def header(self) -> bytes:
+        if not self.fields:
+            return b''
+        return self._rows([self.fields])
+
+    def serialize(self, values: list[any]) -> bytes:
+        if self.fields is None:
+            first = values[0]
+            fields = list(first) if isinstance(first, Mapping) else [str(index) for index in range(len(first))]
+            self._inferred = frozenset(fields)
+            self.fields = fields
+        fields = self.fields
+        inferred = self._inferred
+        encode = self._encode
+        rows = list()
+        for value in values:
+            if isinstance(value, Mapping):
+                if inferred is not None and not inferred.issuperset(value):
+                    self._raise_extra_fields([key for key in value if key not in inferred])
+                row = [value.get(field) for field in fields]
+            else:
+                row = list(value)
+                if inferred is not None and len(row) > len(fields):
+                    self._raise_extra_fields([str(index) for index in range(len(fields), len(row))])
+            for index, cell in enumerate(row):
+                if cell is not None and not isinstance(cell, (str, int, float, bool)):
+                    row[index] = encode(cell)
+            rows.append(row)
+        return self._rows(rows)
+
+    def _raise_extra_fields(self, extra: list[str]):
+        """Lanza el error de un registro con campos que no están en las columnas tomadas del primer registro."""
+        raise Exception(
+            f"El registro tiene campos que no están en las columnas del archivo ({', '.join(map(str, extra))}), "
+            f"que se tomaron del primer registro: indique las columnas con fields."
+        )
+
+    def _rows(self, rows: list[list[any]]) -> bytes:
+        """Serializa filas con csv.writer (None queda como celda vacía)."""
+        buffer = io.StringIO()
+        csv.writer(buffer, dialect=self.dialect).writerows(rows)
+        return buffer.getvalue().encode('utf-8')
@@ -0,0 +1,371 @@
+import os
+import time
+from abc import abstractmethod
+from queue import Queue, Empty
+from threading import Event, Lock, Thread
+from typing import BinaryIO, Iterable
+from .sink import Sink
+from ..streams.jsonl import BUFFER_SIZE
+
+# Marca que indica al hilo escritor que debe terminar
+_CLOSE = object()
+
+
+class FileSink(Sink):
+    """
+    Clase abstracta para los destinos que escriben en un archivo (o en un flujo binario) por lotes, desde un hilo
+    escritor en segundo plano.
+
+    write solo agrega el valor al lote actual. Al completar batch_size valores el lote se serializa de una vez
+    (serialize) y se pasa al hilo escritor por una cola acotada de queue_size lotes: si el disco no da abasto la cola
+    se llena y write espera (contrapresión) en lugar de acumular memoria. Mientras tanto el hilo que procesa los
+    registros sigue trabajando, sin detenerse en cada escritura al disco.
+    Si pasan flush_interval segundos sin lotes nuevos, el hilo escritor escribe el lote incompleto y vacía el búfer
+    del archivo, por lo que los valores no quedan retenidos en memoria cuando el flujo se detiene.
+
+    Con max_bytes o rotate_interval los valores se reparten en archivos numerados (salida.00000.jsonl,
+    salida.00001.jsonl, ...): se pasa al siguiente archivo antes de escribir un lote que haría superar max_bytes,
+    o cuando el archivo actual tiene más de rotate_interval segundos. Los lotes no se dividen entre archivos.
+
+    Los valores se serializan al completar el lote, por lo que no deben modificarse después de escribirlos.
+    Los errores del hilo escritor (por ejemplo, disco lleno) se lanzan en la siguiente llamada a write, flush o close.
+
+    Attributes:
+        path (str | None): Ruta del archivo, o None si se escribe en un flujo.
+        paths (list[str]): Archivos escritos hasta el momento (más de uno si hay rotación).
+        batch_size (int): Cantidad de valores por lote. Por defecto es 1000.
+        flush_interval (float): Segundos sin lotes nuevos tras los que se escribe el lote incompleto. Por defecto es 1.
+        queue_size (int): Cantidad máxima de lotes serializados esperando al hilo escritor. Por defecto es 16.
+        max_bytes (int | None): Tamaño máximo de cada archivo, en bytes. Por defecto no hay rotación por tamaño.
+        rotate_interval (float | None): Segundos tras los que se pasa al siguiente archivo. Por defecto no hay rotación por tiempo.
+        append (bool): Si se agregan los valores al final del archivo en lugar de reemplazarlo. Por defecto es False.
+        background (bool): Si se escribe desde un hilo en segundo plano. Con False se escribe en el mismo hilo, al completar cada lote.
+        fsync (bool): Si close espera a que el sistema operativo grabe el archivo en el disco (os.fsync). Por defecto es False.
+    """
+
+    def __init__(
+            self,
+            target: str | BinaryIO,
+            batch_size: int = 1000,
+            flush_interval: float = 1.0,
+            queue_size: int = 16,
+            max_bytes: int | None = None,
+            rotate_interval: float | None = None,
+            append: bool = False,
+            background: bool = True,
+            fsync: bool = False,
+        ):
+        """Inicializa el destino y, si background es True, inicia el hilo escritor"""
+        if batch_size <= 0 or queue_size <= 0:
+            raise Exception("El tamaño del lote y de la cola deben ser mayores que cero.")
+        if flush_interval <= 0:
+            raise Exception("El intervalo de escritura debe ser mayor que cero.")
+        if max_bytes is not None and max_bytes <= 0 or rotate_interval is not None and rotate_interval <= 0:
+            raise Exception("El tamaño máximo y el intervalo de rotación deben ser mayores que cero.")
+        self.path = target if isinstance(target, str) else None
+        if self.path is None and (max_bytes is not None or rotate_interval is not None):
+            raise Exception("La rotación solo se puede usar al escribir en un archivo.")
+        self.paths = list()
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue_size = queue_size
+        self.max_bytes = max_bytes
+        self.rotate_interval = rotate_interval
+        self.append = append
+        self.background = background
+        self.fsync = fsync
+        self.values = 0
+        self.batches = 0
+        self.bytes = 0
+        self._stream = None if self.path is not None else target
+        self._file = None
+        self._file_index = -1
+        self._file_bytes = 0
+        self._file_opened_at = 0.0
+        self._last_flush = time.monotonic()
+        self._buffer = list()
+        self._lock = Lock()
+        self._error = None
+        self._closed = False
+        self._queue = None
+        self._thread = None
+        if background:
+            self._queue = Queue(queue_size)
+            self._thread = Thread(target=self._run, name=f"{self.__class__.__name__}-writer", daemon=True)
+            self._thread.start()
+
+    @abstractmethod
+    def serialize(self, values: list[any]) -> bytes:
+        """
+        Serializa un lote de valores. Se llama con el bloqueo del destino tomado, por lo que puede actualizar el
+        estado del destino sin otro bloqueo.
+
+        Args:
+            values (list[any]): Valores del lote.
+
+        Returns:
+            bytes: Contenido que se agrega al archivo.
+        """
+        pass
+
+    def header(self) -> bytes:
+        """
+        Contenido que se escribe al comienzo de cada archivo nuevo (por ejemplo, la fila de encabezados de un CSV).
+        Por defecto no hay encabezado.
+
+        Returns:
+            bytes: Encabezado del archivo.
+        """
+        return b''
+
+    def write(self, value: any):
+        with self._lock:
+            if self._closed:
+                raise Exception("El destino está cerrado.")
+            buffer = self._buffer
+            buffer.append(value)
+            if len(buffer) >= self.batch_size:
+                self._submit()
+
+    def write_many(self, values: Iterable[any]):
+        batch_size = self.batch_size
+        with self._lock:
+            self._check_open()
+            buffer = self._buffer
+            for value in values:
+                buffer.append(value)
+                if len(buffer) >= batch_size:
+                    self._submit()
+                    buffer = self._buffer
+
+    def flush(self):
+        """Escribe el lote incompleto y espera a que el hilo escritor entregue al sistema operativo todo lo escrito."""
+        with self._lock:
+            self._check_open()
+            self._submit()
+            if self._queue is None:
+                self._flush_file()
+                return
+            done = Event()
+            self._queue.put(done)
+        done.wait()
+        self._raise_error()
+
+    def commit(self) -> dict[str, any] | None:
+        """
+        Escribe los valores pendientes, los graba en el disco (os.fsync) y devuelve los archivos escritos y el tamaño
+        del último. Si se escribe en un flujo, solo se vacía su búfer y devuelve None.
+
+        Returns:
+            dict[str, any] | None: Posición confirmada, para restore.
+        """
+        self.flush()
+        with self._lock:
+            if self._stream is not None:
+                return None
+            # El hilo escritor ya escribió todo: la cola está vacía y el bloqueo impide agregar lotes nuevos
+            if self._file is not None:
+                os.fsync(self._file.fileno())
+            return {"paths": list(self.paths), "bytes": self._file_bytes if self.paths else 0}
+
+    def restore(self, position: dict[str, any] | None):
+        """
+        Descarta lo escrito en los archivos después de una posición devuelta por commit, para continuar escribiendo
+        a partir de ella. Se debe llamar antes de escribir el primer valor.
+
+        Args:
+            position (dict[str, any] | None): Posición devuelta por commit. Con None no se descarta nada.
+        """
+        if position is None:
+            return
+        with self._lock:
+            if self._stream is not None:
+                raise Exception("No se puede descartar lo escrito en un flujo: use un archivo.")
+            if self._file is not None or self.paths or self.values:
+                raise Exception("La posición se debe restaurar antes de escribir en el destino.")
+            paths = list(position["paths"])
+            if not paths:
+                return
+            last = paths[-1]
+            if not os.path.exists(last) or os.path.getsize(last) < position["bytes"]:
+                raise Exception(f"El archivo {last} es más corto que la posición confirmada: no se puede reanudar.")
+            with open(last, 'r+b') as file:
+                file.truncate(position["bytes"])
+            # Los archivos rotados después de la posición confirmada solo tienen valores sin confirmar
+            if self.max_bytes is not None or self.rotate_interval is not None:
+                root, extension = os.path.splitext(self.path)
+                index = len(paths)
+                while os.path.exists(f"{root}.{index:05d}{extension}"):
+                    os.remove(f"{root}.{index:05d}{extension}")
+                    index += 1
+            # El siguiente archivo que se abra es el último confirmado, para agregar al final
+            self.paths = paths[:-1]
+            self._file_index = len(paths) - 2
+            self.append = True
+
+    def close(self):
+        """Escribe los valores pendientes, detiene el hilo escritor y cierra el archivo."""
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            try:
+                self._submit()
+            finally:
+                if self._queue is not None:
+                    self._queue.put(_CLOSE)
+                    self._thread.join()
+                else:
+                    self._close_file()
+        self._raise_error()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve las estadísticas del destino.
+
+        Returns:
+            dict[str, any]: Valores, lotes y bytes escritos, y los archivos escritos.
+        """
+        return {"values": self.values, "batches": self.batches, "bytes": self.bytes, "paths": list(self.paths)}
+
+    def _check_open(self):
+        if self._closed:
+            raise Exception("El destino está cerrado.")
+
+    def _raise_error(self):
+        """Lanza en el hilo que usa el destino el error que se produjo en el hilo escritor."""
+        if self._error is not None:
+            raise Exception(f"Error al escribir en {self.path or 'el flujo'}: {self._error}") from self._error
+
+    def _submit(self):
+        """Serializa el lote actual y lo escribe o lo pasa al hilo escritor. Se llama con el bloqueo tomado."""
+        self._raise_error()
+        values = self._buffer
+        if not values:
+            return
+        self._buffer = list()
+        data = self.serialize(values)
+        self.values += len(values)
+        if self._queue is None:
+            self._write_data(data)
+        else:
+            # Si la cola está llena se espera al hilo escritor (contrapresión)
+            self._queue.put(data)
+
+    def _run(self):
+        """Ciclo del hilo escritor: escribe los lotes en el orden en que llegan."""
+        queue = self._queue
+        while True:
+            try:
+                item = queue.get(timeout=self.flush_interval)
+            except Empty:
+                self._flush_idle()
+                continue
+            if item is _CLOSE:
+                try:
+                    self._close_file()
+                except Exception as e:
+                    self._error = self._error or e
+                return
+            try:
+                if isinstance(item, Event):
+                    self._flush_file()
+                    item.set()
+                elif self._error is None:
+                    self._write_data(item)
+                    if time.monotonic() - self._last_flush >= self.flush_interval:
+                        self._flush_file()
+            except Exception as e:
+                # El hilo sigue consumiendo la cola (sin escribir) para que write no quede esperando
+                self._error = self._error or e
+                if isinstance(item, Event):
+                    item.set()
+
+    def _flush_idle(self):
+        """Escribe el lote incompleto cuando no llegan lotes nuevos, si el hilo que usa el destino no lo está haciendo."""
+        if not self._lock.acquire(blocking=False):
+            return
+        data = None
+        try:
+            # Los lotes se encolan con el bloqueo tomado: si la cola está vacía, el lote actual es el último
+            if self._buffer and self._queue.empty() and self._error is None:
+                values = self._buffer
+                self._buffer = list()
+                self.values += len(values)
+                # Se serializa con el bloqueo tomado, igual que en _submit, porque serialize puede actualizar el estado
+                # del destino (por ejemplo, las columnas de CsvSink); solo la escritura en el archivo queda afuera
+                data = self.serialize(values)
+        except Exception as e:
+            self._error = self._error or e
+        finally:
+            self._lock.release()
+        try:
+            if data is not None:
+                self._write_data(data)
+            if self._file is not None or self._stream is not None:
+                self._flush_file()
+        except Exception as e:
+            self._error = self._error or e
+
+    def _write_data(self, data: bytes):
+        """Escribe un lote serializado, pasando antes al siguiente archivo si corresponde."""
+        file = self._file
+        if file is None:
+            file = self._open_file()
+        elif self._file_bytes and self._should_rotate(len(data)):
+            self._close_file()
+            file = self._open_file()
+        file.write(data)
+        self._file_bytes += len(data)
+        self.bytes += len(data)
+        self.batches += 1
+
+    def _should_rotate(self, size: int) -> bool:
+        if self.max_bytes is not None and self._file_bytes + size > self.max_bytes:
+            return True
+        return self.rotate_interval is not None and time.monotonic() - self._file_opened_at >= self.rotate_interval
+
+    def _open_file(self) -> BinaryIO:
+        """Abre el archivo siguiente (o prepara el flujo) y escribe el encabezado si el archivo está vacío."""
+        if self._stream is not None:
+            self._file = self._stream
+            self._file_bytes = 0
+        else:
+            self._file_index += 1
+            path = self.path
+            if self.max_bytes is not None or self.rotate_interval is not None:
+                root, extension = os.path.splitext(self.path)
+                path = f"{root}.{self._file_index:05d}{extension}"
+            self._file = open(path, 'ab' if self.append else 'wb', buffering=BUFFER_SIZE)
+            self._file_bytes = self._file.tell()
+            self.paths.append(path)
+        self._file_opened_at = time.monotonic()
+        if not self._file_bytes:
+            header = self.header()
+            if header:
+                self._file.write(header)
+                self._file_bytes += len(header)
+                self.bytes += len(header)
+        return self._file
+
+    def _flush_file(self):
+        """Entrega al sistema operativo lo escrito en el archivo actual."""
+        if self._file is not None:
+            self._file.flush()
+        self._last_flush = time.monotonic()
+
+    def _close_file(self):
+        """Cierra el archivo actual (un flujo recibido no se cierra, solo se vacía su búfer)."""
+        file = self._file
+        if file is None:
+            if self._stream is None and not self.paths and self._error is None:
+                # Se crea el archivo aunque no se haya escrito nada, como al abrirlo directamente
+                file = self._open_file()
+            else:
+                return
+        self._file = None
+        file.flush()
+        if self.fsync:
+            os.fsync(file.fileno())
+        if file is not self._stream:
+            file.close()
@@ -0,0 +1,25 @@
+from json import JSONEncoder
+from typing import BinaryIO
+from .file_sink import FileSink
+from ..streams.jsonl import _json_default
+
+class JsonlSink(FileSink):
+    """
+    Destino que escribe cada valor como una línea JSON compacta (JSON Lines), igual que write_jsonl.
+
+    Cada lote se serializa con un único codificador preparado al crear el destino y se une en un solo bloque de bytes,
+    en lugar de llamar a json.dumps y escribir por cada registro. Los objetos tipo diccionario (como LogEntry)
+    se escriben como objetos JSON.
+
+    Acepta los mismos parámetros que FileSink (batch_size, flush_interval, queue_size, max_bytes, rotate_interval,
+    append, background y fsync).
+    """
+
+    def __init__(self, target: str | BinaryIO, **kwargs: any):
+        self._encode = JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=_json_default).encode
+        super().__init__(target, **kwargs)
+
+    def serialize(self, values: list[any]) -> bytes:
+        lines = list(map(self._encode, values))
+        lines.append('')
+        return '\n'.join(lines).encode('utf-8')
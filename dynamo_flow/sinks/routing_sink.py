@@ -0,0 +1,128 @@
+from typing import Iterable
+from .sink import Sink
+
+class RoutingSink(Sink):
+    """
+    Destino que recibe los resultados de process_stream (pares de registro y logs) y los reparte entre dos destinos:
+    los registros válidos (sin logs) van a valid, y los inválidos, junto con sus logs, a dead_letter.
+
+    Cada registro inválido se escribe en dead_letter como un diccionario {"record": ..., "logs": ...}, precedido por
+    los datos adicionales que se pasen a write (por ejemplo, el número de línea de origen).
+
+        with RoutingSink(JsonlSink("validos.jsonl"), JsonlSink("invalidos.jsonl")) as sink:
+            sink.write_many(record_manager.process_stream(records))
+
+    Al cerrarse cierra los dos destinos.
+
+    Attributes:
+        valid (Sink): Destino de los registros válidos.
+        dead_letter (Sink | None): Destino de los registros inválidos. Si es None, los registros inválidos se descartan.
+        valid_count (int): Cantidad de registros válidos recibidos.
+        invalid_count (int): Cantidad de registros inválidos recibidos.
+        rejected_count (int): Cantidad de entradas escritas con reject (por ejemplo, líneas que no son JSON válido).
+    """
+
+    def __init__(self, valid: Sink, dead_letter: Sink | None = None):
+        self.valid = valid
+        self.dead_letter = dead_letter
+        self.valid_count = 0
+        self.invalid_count = 0
+        self.rejected_count = 0
+
+    def write(self, result: tuple[dict[str, any], list], **details: any):
+        """
+        Escribe un resultado en el destino que le corresponde.
+
+        Args:
+            result (tuple[dict[str, any], list]): Registro procesado y su lista de logs.
+            **details: Datos adicionales que se agregan a la entrada de dead_letter, por ejemplo line=12.
+        """
+        record, logs = result
+        if logs:
+            self.invalid_count += 1
+            if self.dead_letter is not None:
+                details["record"] = record
+                details["logs"] = logs
+                self.dead_letter.write(details)
+        else:
+            self.valid_count += 1
+            self.valid.write(record)
+
+    def write_many(self, results: Iterable[tuple[dict[str, any], list]]):
+        valid = self.valid.write
+        dead_letter = self.dead_letter.write if self.dead_letter is not None else None
+        valid_count = invalid_count = 0
+        try:
+            for record, logs in results:
+                if logs:
+                    invalid_count += 1
+                    if dead_letter is not None:
+                        dead_letter({"record": record, "logs": logs})
+                else:
+                    valid_count += 1
+                    valid(record)
+        finally:
+            self.valid_count += valid_count
+            self.invalid_count += invalid_count
+
+    def reject(self, entry: dict[str, any]):
+        """
+        Escribe en dead_letter una entrada que no llegó a procesarse, por ejemplo una línea que no es JSON válido.
+
+        Args:
+            entry (dict[str, any]): Entrada a escribir, con sus logs.
+        """
+        self.rejected_count += 1
+        if self.dead_letter is not None:
+            self.dead_letter.write(entry)
+
+    def flush(self):
+        self.valid.flush()
+        if self.dead_letter is not None:
+            self.dead_letter.flush()
+
+    def commit(self) -> dict[str, any]:
+        """
+        Confirma los dos destinos y devuelve sus posiciones junto con los contadores.
+
+        Returns:
+            dict[str, any]: Posición confirmada, para restore.
+        """
+        return {
+            "valid": self.valid.commit(),
+            "dead_letter": self.dead_letter.commit() if self.dead_letter is not None else None,
+            **self.info(),
+        }
+
+    def restore(self, position: dict[str, any] | None):
+        """
+        Restaura los dos destinos y los contadores a una posición devuelta por commit.
+
+        Args:
+            position (dict[str, any] | None): Posición devuelta por commit. Con None no se descarta nada.
+        """
+        if position is None:
+            return
+        self.valid.restore(position["valid"])
+        if self.dead_letter is not None:
+            self.dead_letter.restore(position["dead_letter"])
+        self.valid_count = position["valid_count"]
+        self.invalid_count = position["invalid_count"]
+        self.rejected_count = position["rejected_count"]
+
+    def close(self):
+        """Cierra los dos destinos (dead_letter primero), aunque falle alguno."""
+        try:
+            if self.dead_letter is not None:
+                self.dead_letter.close()
+        finally:
+            self.valid.close()
+
+    def info(self) -> dict[str, any]:
+        """
+        Devuelve las cantidades de registros válidos, inválidos y rechazados recibidos.
+
+        Returns:
+            dict[str, any]: Cantidades de registros válidos, inválidos y rechazados.
+        """
+        return {"valid_count": self.valid_count, "invalid_count": self.invalid_count, "rejected_count": self.rejected_count}
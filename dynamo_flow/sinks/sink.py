@@ -0,0 +1,69 @@
+from abc import ABC, abstractmethod
+from typing import Iterable
+
+class Sink(ABC):
+    """
+    Clase abstracta para todos los destinos de los registros procesados.
+
+    Un destino recibe valores con write y los entrega a su salida (un archivo, otro destino, etc.).
+    Se usa como gestor de contexto para asegurar que close se llame al terminar, incluso si hay errores.
+    """
+
+    @abstractmethod
+    def write(self, value: any):
+        """
+        Escribe un valor en el destino.
+
+        Args:
+            value (any): Valor a escribir, por ejemplo un registro.
+        """
+        pass
+
+    def write_many(self, values: Iterable[any]):
+        """
+        Escribe todos los valores de un iterable, en orden.
+
+        Args:
+            values (Iterable[any]): Valores a escribir.
+        """
+        write = self.write
+        for value in values:
+            write(value)
+
+    def flush(self):
+        """Entrega a la salida los valores pendientes. Por defecto no hace nada."""
+        pass
+
+    def commit(self) -> any:
+        """
+        Entrega a la salida, de forma duradera, todos los valores escritos hasta el momento, y devuelve la posición
+        confirmada. La usan los puntos de control (ver checkpoint.Checkpoint) para poder descartar con restore lo
+        escrito después, y así no perder ni duplicar valores al reanudar un procesamiento interrumpido.
+        Por defecto llama a flush y devuelve None (al reanudar se pueden repetir los valores escritos después del
+        último punto de control).
+
+        Returns:
+            any: Posición confirmada, serializable a JSON.
+        """
+        self.flush()
+        return None
+
+    def restore(self, position: any):
+        """
+        Descarta lo escrito después de una posición devuelta por commit, antes de volver a escribir. Por defecto no hace nada.
+
+        Args:
+            position (any): Posición devuelta por commit.
+        """
+        pass
+
+    @abstractmethod
+    def close(self):
+        """Entrega los valores pendientes y libera los recursos del destino."""
+        pass
+
+    def __enter__(self) -> 'Sink':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
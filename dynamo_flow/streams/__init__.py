@@ -0,0 +1,5 @@
+from .jsonl import read_jsonl, write_jsonl
+from .mmap_jsonl import read_jsonl_mmap, shard_offsets
+
+# Para poder importar las funciones facilmente desde fuera del subpaquete streams
+__all__ = ['read_jsonl', 'write_jsonl', 'read_jsonl_mmap', 'shard_offsets']
\ No newline at end of file
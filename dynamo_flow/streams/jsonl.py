@@ -0,0 +1,64 @@
+import json
+from collections.abc import Mapping
+from typing import BinaryIO, Callable, Generator, TextIO
+
+# Tamaño de los búferes de lectura y escritura (1 MiB)
+BUFFER_SIZE = 1 << 20
+
+
+def read_jsonl(stream: BinaryIO, on_error: Callable[[int, bytes, Exception], None] | None = None, line_numbers: list | None = None, offsets: list | None = None, start_line: int = 1, start_offset: int = 0) -> Generator[dict[str, any], None, None]:
+    """
+    Lee registros de un flujo JSON Lines, una línea a la vez, sin cargar el archivo completo en memoria.
+
+    Args:
+        stream (BinaryIO): Flujo binario abierto (archivo o sys.stdin.buffer), idealmente con un búfer grande.
+        on_error (Callable[[int, bytes, Exception], None] | None): Función que recibe el número de línea, la línea
+            y la excepción de cada línea que no es un objeto JSON válido. Si es None, esas líneas se ignoran.
+        line_numbers (list | None): Si se indica (por ejemplo, un deque), se agrega el número de línea de cada registro
+            entregado, para poder relacionar los resultados con la línea de origen.
+        offsets (list | None): Si se indica, se agrega la posición en bytes del final de la línea de cada registro
+            entregado (la posición desde la que se continúa leyendo después de ese registro).
+        start_line (int): Número de la primera línea del flujo, si la lectura continúa desde una posición intermedia.
+        start_offset (int): Posición en bytes del flujo al comenzar la lectura, para calcular offsets.
+
+    Returns:
+        Generator: Generador de registros (dict).
+    """
+    position = start_offset
+    for line_number, line in enumerate(stream, start=start_line):
+        position += len(line)
+        # Se ignoran las líneas vacías
+        if not line.strip():
+            continue
+        try:
+            record = json.loads(line)
+            if not isinstance(record, dict):
+                raise Exception("La línea no es un objeto JSON.")
+        except Exception as e:
+            if on_error is not None:
+                on_error(line_number, line, e)
+            continue
+        if line_numbers is not None:
+            line_numbers.append(line_number)
+        if offsets is not None:
+            offsets.append(position)
+        yield record
+
+
+def write_jsonl(stream: TextIO, value: any):
+    """
+    Escribe un valor como una línea JSON compacta.
+
+    Args:
+        stream (TextIO): Flujo de texto abierto, idealmente con un búfer grande.
+        value (any): Valor serializable a JSON. Los objetos tipo diccionario (como LogEntry) se escriben como objetos JSON.
+    """
+    stream.write(json.dumps(value, ensure_ascii=False, separators=(',', ':'), default=_json_default))
+    stream.write('\n')
+
+
+def _json_default(value: any) -> any:
+    """Serializa los objetos tipo diccionario que json no reconoce, como LogEntry."""
+    if isinstance(value, Mapping):
+        return dict(value)
+    raise TypeError(f"El objeto de tipo {type(value).__name__} no es serializable a JSON.")
@@ -0,0 +1,83 @@
+import json
+import mmap
+import os
+from typing import Callable, Generator
+
+# Tamaño mínimo de cada fragmento del archivo (4 MiB)
+SHARD_SIZE = 4 << 20
+
+
+def shard_offsets(path: str, shard_size: int = SHARD_SIZE) -> list[tuple[int, int]]:
+    """
+    Divide un archivo JSON Lines en fragmentos (start, end) de bytes que empiezan y terminan en un límite de línea.
+
+    Cada fragmento termina en el primer salto de línea a partir de start + shard_size, por lo que la división
+    depende solo del contenido del archivo y de shard_size: volver a ejecutarla produce los mismos fragmentos,
+    sin importar la cantidad de procesos que los consuman.
+
+    Args:
+        path (str): Ruta del archivo.
+        shard_size (int): Tamaño mínimo en bytes de cada fragmento (el último puede ser menor).
+
+    Returns:
+        list[tuple[int, int]]: Fragmentos como pares (start, end), con end excluido.
+    """
+    if shard_size <= 0:
+        raise Exception("El tamaño de los fragmentos debe ser mayor que cero.")
+    size = os.path.getsize(path)
+    if size == 0:
+        return list()
+    shards = list()
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        start = 0
+        while start < size:
+            newline = data.find(b'\n', min(start + shard_size, size) - 1)
+            end = size if newline == -1 else newline + 1
+            shards.append((start, end))
+            start = end
+    return shards
+
+
+def read_jsonl_mmap(path: str, start: int = 0, end: int | None = None, on_error: Callable[[int, bytes, Exception], None] | None = None, offsets: list | None = None) -> Generator[dict[str, any], None, None]:
+    """
+    Lee los registros de un fragmento de un archivo JSON Lines mapeado en memoria.
+
+    El archivo no se lee ni se copia completo: solo se copia cada línea al decodificarla.
+
+    Args:
+        path (str): Ruta del archivo.
+        start (int): Byte donde empieza el fragmento. Debe ser el inicio de una línea (ver shard_offsets).
+        end (int | None): Byte donde termina el fragmento (excluido). Si es None, hasta el final del archivo.
+        on_error (Callable[[int, bytes, Exception], None] | None): Función que recibe la posición en bytes, la línea
+            y la excepción de cada línea que no es un objeto JSON válido. Si es None, esas líneas se ignoran.
+        offsets (list | None): Si se indica (por ejemplo, un deque), se agrega la posición en bytes del inicio
+            de la línea de cada registro entregado, para poder relacionar los resultados con la línea de origen.
+
+    Returns:
+        Generator: Generador de registros (dict).
+    """
+    if os.path.getsize(path) == 0:
+        return
+    with open(path, 'rb') as file, mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        end = len(data) if end is None else min(end, len(data))
+        position = start
+        while position < end:
+            newline = data.find(b'\n', position, end)
+            line_end = end if newline == -1 else newline + 1
+            line = data[position:line_end]
+            offset = position
+            position = line_end
+            # Se ignoran las líneas vacías
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+                if not isinstance(record, dict):
+                    raise Exception("La línea no es un objeto JSON.")
+            except Exception as e:
+                if on_error is not None:
+                    on_error(offset, line, e)
+                continue
+            if offsets is not None:
+                offsets.append(offset)
+            yield record
@@ -0,0 +1,363 @@
+from typing import Iterable, Mapping
+from .logs import WARNING, INVALID_RECORD, NO_OPERATIONS
+from .operations.pipeline import check_stop_on
+
+# Largo máximo de los valores guardados en TopValues, para que la memoria no dependa de los datos
+MAX_VALUE_LENGTH = 100
+
+# Claves de los logs de los registros a los que no se les aplicaron operaciones (ver RecordContextManager._unprocessed_record)
+_INVALID_RECORD_KEY = (WARNING, INVALID_RECORD, None, None)
+_NO_OPERATIONS_KEY = (WARNING, NO_OPERATIONS, None, None)
+
+
+class NumericSummary:
+    """
+    Resumen de los valores numéricos de un campo: cantidad, suma, mínimo y máximo. Se combina con merge.
+
+    Attributes:
+        count (int): Cantidad de valores.
+        total (float): Suma de los valores.
+        minimum (float | None): Valor mínimo, o None si no hay valores.
+        maximum (float | None): Valor máximo, o None si no hay valores.
+    """
+
+    __slots__ = ('count', 'total', 'minimum', 'maximum')
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0
+        self.minimum = None
+        self.maximum = None
+
+    def observe(self, value: int | float):
+        """
+        Agrega un valor al resumen.
+
+        Args:
+            value (int | float): Valor numérico (no NaN).
+        """
+        if self.count:
+            if value < self.minimum:
+                self.minimum = value
+            elif value > self.maximum:
+                self.maximum = value
+        else:
+            self.minimum = self.maximum = value
+        self.count += 1
+        self.total += value
+
+    def merge(self, other: 'NumericSummary') -> 'NumericSummary':
+        """
+        Agrega al resumen los valores de otro resumen.
+
+        Args:
+            other (NumericSummary): Resumen a combinar.
+
+        Returns:
+            NumericSummary: Este resumen.
+        """
+        if other.count:
+            if self.count:
+                self.minimum = min(self.minimum, other.minimum)
+                self.maximum = max(self.maximum, other.maximum)
+            else:
+                self.minimum, self.maximum = other.minimum, other.maximum
+            self.count += other.count
+            self.total += other.total
+        return self
+
+    def to_dict(self) -> dict[str, any]:
+        return {
+            "count": self.count,
+            "sum": self.total,
+            "min": self.minimum,
+            "max": self.maximum,
+            "mean": self.total / self.count if self.count else None,
+        }
+
+
+class TopValues:
+    """
+    Valores más frecuentes de un flujo, en memoria acotada (algoritmo Space-Saving).
+
+    Guarda a lo sumo capacity valores con su cantidad estimada. Cuando llega un valor nuevo y no hay lugar, reemplaza al
+    valor de menor cantidad y hereda su cantidad como error máximo de la estimación: la cantidad real de cada valor está
+    entre count - error y count, y cualquier valor con más de N / capacity apariciones (N, el total) está en el resumen.
+    Dos resúmenes se combinan con merge (sumando las estimaciones), por ejemplo los de distintos fragmentos de un archivo.
+
+    Attributes:
+        capacity (int): Cantidad máxima de valores guardados.
+    """
+
+    __slots__ = ('capacity', '_counts', '_errors')
+
+    def __init__(self, capacity: int = 100):
+        if capacity <= 0:
+            raise Exception("La capacidad debe ser mayor que cero.")
+        self.capacity = capacity
+        self._counts = dict()
+        self._errors = dict()
+
+    def observe(self, value: any, count: int = 1):
+        """
+        Cuenta una aparición de un valor.
+
+        Args:
+            value (any): Valor hashable.
+            count (int): Cantidad de apariciones. Por defecto es 1.
+        """
+        counts = self._counts
+        current = counts.get(value)
+        if current is not None:
+            counts[value] = current + count
+        elif len(counts) < self.capacity:
+            counts[value] = count
+            self._errors[value] = 0
+        else:
+            # Se reemplaza al valor de menor cantidad; el nuevo hereda su cantidad como error
+            victim = min(counts, key=counts.get)
+            floor = counts.pop(victim)
+            del self._errors[victim]
+            counts[value] = floor + count
+            self._errors[value] = floor
+
+    def merge(self, other: 'TopValues') -> 'TopValues':
+        """
+        Agrega al resumen los valores de otro resumen. Un valor que no está en un resumen lleno pudo aparecer hasta la
+        menor cantidad de ese resumen, que se suma a su estimación y a su error.
+
+        Args:
+            other (TopValues): Resumen a combinar.
+
+        Returns:
+            TopValues: Este resumen.
+        """
+        floor = self._floor()
+        other_floor = other._floor()
+        merged = list()
+        for value in dict.fromkeys((*self._counts, *other._counts)):
+            count = self._counts.get(value, floor) + other._counts.get(value, other_floor)
+            error = self._errors.get(value, floor) + other._errors.get(value, other_floor)
+            merged.append((count, error, value))
+        merged.sort(key=lambda item: item[0], reverse=True)
+        merged = merged[:self.capacity]
+        self._counts = {value: count for count, _, value in merged}
+        self._errors = {value: error for _, error, value in merged}
+        return self
+
+    def most_common(self, n: int | None = None) -> list[tuple[any, int, int]]:
+        """
+        Devuelve los valores más frecuentes.
+
+        Args:
+            n (int | None): Cantidad de valores. Por defecto, todos los guardados.
+
+        Returns:
+            list[tuple[any, int, int]]: Valor, cantidad estimada y error máximo, de mayor a menor cantidad.
+        """
+        items = sorted(self._counts.items(), key=lambda item: item[1], reverse=True)[:n]
+        return [(value, count, self._errors[value]) for value, count in items]
+
+    def _floor(self) -> int:
+        """Menor cantidad guardada si el resumen está lleno (hasta ahí pudo aparecer un valor que no está), o 0."""
+        return min(self._counts.values()) if len(self._counts) >= self.capacity else 0
+
+
+class StreamSummary:
+    """
+    Resumen de un flujo de registros procesados, sin conservar los registros ni sus logs (ver
+    RecordContextManager.summarize_stream).
+
+    Cuenta los registros por tipo (válidos e inválidos), los logs por nivel, código, operación y campo, los valores más
+    frecuentes que produjeron logs en cada operación y campo (el valor que tenía el campo antes de aplicar las
+    operaciones; ver TopValues), y la cantidad, suma, mínimo y máximo de los campos numéricos después de aplicarlas.
+    La memoria usada depende de la configuración (tipos, operaciones y campos), no de la cantidad de registros.
+
+    Los resúmenes de distintas partes de un flujo (por ejemplo, fragmentos procesados en paralelo) se combinan con
+    merge y se pueden serializar con pickle.
+
+    Attributes:
+        numeric_fields (tuple[str, ...]): Campos numéricos resumidos. Por defecto 'amount' y 'price'.
+        top_n (int): Cantidad de valores más frecuentes por operación y campo que se informan. Por defecto es 10.
+    """
+
+    def __init__(self, numeric_fields: Iterable[str] = ('amount', 'price'), top_n: int = 10):
+        """Inicializa el resumen vacío"""
+        self.numeric_fields = tuple(numeric_fields)
+        self.top_n = top_n
+        # Por tipo de registro: [registros, inválidos]
+        self._types = dict()
+        # Por (nivel, código, operación, campo): cantidad de logs
+        self._logs = dict()
+        # Por (operación, campo): TopValues con los valores que produjeron logs
+        self._failure_values = dict()
+        self._numeric = {field: NumericSummary() for field in self.numeric_fields}
+
+    @property
+    def records(self) -> int:
+        """Cantidad de registros resumidos."""
+        return sum(counts[0] for counts in self._types.values())
+
+    @property
+    def invalid(self) -> int:
+        """Cantidad de registros con al menos un log."""
+        return sum(counts[1] for counts in self._types.values())
+
+    @property
+    def valid(self) -> int:
+        """Cantidad de registros sin logs."""
+        return self.records - self.invalid
+
+    def update(self, records: Iterable[dict[str, any]], operations: Mapping[str, Iterable], stop_on: str | None = None) -> 'StreamSummary':
+        """
+        Aplica a cada registro las operaciones de su tipo y agrega el resultado al resumen.
+
+        Las operaciones se compilan una sola vez y comparten una única lista de logs que se vacía después de cada
+        registro, por lo que no se crea una lista de logs ni una tupla de resultado por registro.
+
+        Args:
+            records (Iterable[dict[str, any]]): Registros a procesar.
+            operations (Mapping[str, Iterable[Operation]]): Operaciones por tipo de registro (por ejemplo, ConfigSnapshot.operations).
+            stop_on (str | None): Nivel de log que detiene la cadena de cada registro, igual que en process_stream.
+
+        Returns:
+            StreamSummary: Este resumen.
+        """
+        levels = check_stop_on(stop_on) if stop_on is not None else None
+        chains = dict()
+        for record_type, chain in operations.items():
+            chain = tuple(chain)
+            # Campos de las operaciones, para guardar su valor antes de aplicarlas
+            fields = tuple(dict.fromkeys(
+                operation.parameters.get('field_name') for operation in chain
+                if operation.parameters.get('field_name') is not None
+            ))
+            chains[record_type] = (
+                tuple(operation.compile() for operation in chain),
+                fields,
+                {field: index for index, field in enumerate(fields)},
+                self._types.setdefault(record_type, [0, 0]),
+            )
+        log_counts = self._logs
+        failure_values = self._failure_values
+        capacity = max(10 * self.top_n, 100)
+        numeric = tuple(self._numeric.items())
+        logs = list()
+        for record in records:
+            record_type = record.get('__type__')
+            chain = chains.get(record_type) if record_type else None
+            if chain is None:
+                self._observe_unprocessed(record, record_type)
+                continue
+            steps, fields, positions, type_counts = chain
+            type_counts[0] += 1
+            originals = tuple(map(record.get, fields))
+            if levels is None:
+                for step in steps:
+                    record = step(record, logs)
+            else:
+                for step in steps:
+                    produced = len(logs)
+                    record = step(record, logs)
+                    if any(logs[index].type in levels for index in range(produced, len(logs))):
+                        break
+            if logs:
+                type_counts[1] += 1
+                for entry in logs:
+                    key = (entry.type, entry.code, entry.operation, entry.field)
+                    log_counts[key] = log_counts.get(key, 0) + 1
+                    position = positions.get(entry.field)
+                    if position is not None:
+                        top_key = (entry.operation, entry.field)
+                        top = failure_values.get(top_key)
+                        if top is None:
+                            top = failure_values[top_key] = TopValues(capacity)
+                        top.observe(_value_key(originals[position]))
+                logs.clear()
+            for field, summary in numeric:
+                value = record.get(field)
+                if value.__class__ is float or value.__class__ is int:
+                    if value == value:
+                        summary.observe(value)
+        return self
+
+    def _observe_unprocessed(self, record: dict[str, any], record_type: str | None):
+        """Cuenta un registro sin operaciones (vacío, sin tipo o de un tipo sin operaciones), como process_stream."""
+        type_counts = self._types.setdefault(record_type or None, [0, 0])
+        type_counts[0] += 1
+        type_counts[1] += 1
+        key = _NO_OPERATIONS_KEY if record and record_type else _INVALID_RECORD_KEY
+        self._logs[key] = self._logs.get(key, 0) + 1
+
+    def merge(self, other: 'StreamSummary') -> 'StreamSummary':
+        """
+        Agrega al resumen los conteos de otro resumen (por ejemplo, de otro fragmento del flujo).
+
+        Args:
+            other (StreamSummary): Resumen a combinar.
+
+        Returns:
+            StreamSummary: Este resumen.
+        """
+        for record_type, (records, invalid) in other._types.items():
+            type_counts = self._types.setdefault(record_type, [0, 0])
+            type_counts[0] += records
+            type_counts[1] += invalid
+        for key, count in other._logs.items():
+            self._logs[key] = self._logs.get(key, 0) + count
+        for key, top in other._failure_values.items():
+            current = self._failure_values.get(key)
+            if current is None:
+                current = self._failure_values[key] = TopValues(top.capacity)
+            current.merge(top)
+        for field, summary in other._numeric.items():
+            self._numeric.setdefault(field, NumericSummary()).merge(summary)
+        return self
+
+    def to_dict(self) -> dict[str, any]:
+        """
+        Devuelve el resumen como diccionario serializable a JSON.
+
+        Returns:
+            dict[str, any]: Registros totales, válidos e inválidos; registros por tipo; logs por nivel, código,
+            operación y campo (de mayor a menor cantidad); valores más frecuentes que produjeron logs por operación
+            y campo; y resumen de los campos numéricos.
+        """
+        return {
+            "records": self.records,
+            "valid": self.valid,
+            "invalid": self.invalid,
+            "types": {
+                record_type: {"records": records, "valid": records - invalid, "invalid": invalid}
+                for record_type, (records, invalid) in self._types.items()
+            },
+            "logs": [
+                {"type": level, "code": code, "operation": operation, "field": field, "count": count}
+                for (level, code, operation, field), count in sorted(self._logs.items(), key=lambda item: item[1], reverse=True)
+            ],
+            "failure_values": [
+                {
+                    "operation": operation,
+                    "field": field,
+                    "values": [{"value": value, "count": count, "error": error} for value, count, error in top.most_common(self.top_n)],
+                }
+                for (operation, field), top in self._failure_values.items()
+            ],
+            "numeric": {field: summary.to_dict() for field, summary in self._numeric.items()},
+        }
+
+    def __repr__(self) -> str:
+        return f"StreamSummary(records={self.records}, valid={self.valid}, invalid={self.invalid})"
+
+
+def _value_key(value: any) -> any:
+    """Valor que se guarda en TopValues: los valores no hashables y las cadenas largas se reemplazan por un texto acotado."""
+    if value is None or value.__class__ in (int, float, bool):
+        # NaN no es igual a sí mismo: cada aparición sería un valor distinto
+        return value if value == value else 'nan'
+
+    if value.__class__ is not str:
+        value = repr(value)
+    if len(value) > MAX_VALUE_LENGTH:
+        return value[:MAX_VALUE_LENGTH] + '…'
+    return value
@@ -1,6 +1,6 @@
 import re
 from pprint import pprint
-from dynamo_flow import RecordContextManager
+from dynamo_flow import RecordContextManager, as_dict_logs
 from dynamo_flow.operations import NormalizeAmountOperation, ContextualFieldValidation
 
 records = [
@@ -51,7 +51,7 @@ records = [
 # Mostrar ejecución con las operaciones por defecto por tipo de registro
 def ejemplo_operaciones_defecto():    
     record_manager = RecordContextManager()    
-    for i, (record, logs) in enumerate(record_manager.process_stream(records)):
+    for i, (record, logs) in enumerate(as_dict_logs(record_manager.process_stream(records))):
         status = "INVÁLIDO" if len(logs) else "VALIDO"
         print(f"===================REGISTRO {i+1}: {status}===================")
         print("Registro:")
@@ -75,7 +75,7 @@ def ejemplo_operaciones_manuales():
         ContextualFieldValidation(field_name="is_active", required=True, condition=lambda x: x.lower() in ('true', 'false')),
     ])
     
-    for i, (record, logs) in enumerate(record_manager.process_stream(records, default=False)):
+    for i, (record, logs) in enumerate(as_dict_logs(record_manager.process_stream(records, default=False))):
         status = "INVÁLIDO" if len(logs) else "VALIDO"
         print(f"===================REGISTRO {i+1}: {status}===================")
         print("Registro:")
@@ -93,7 +93,7 @@ def ejemplo_operaciones_defecto_manuales():
         ContextualFieldValidation(field_name="customer_name", required=True)
     ])
     
-    for i, (record, logs) in enumerate(record_manager.process_stream(records)):
+    for i, (record, logs) in enumerate(as_dict_logs(record_manager.process_stream(records))):
         status = "INVÁLIDO" if len(logs) else "VALIDO"
         print(f"===================REGISTRO {i+1}: {status}===================")
         print("Registro:")